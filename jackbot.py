@@ -6,18 +6,40 @@
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import bisect
+import heapq
+import math
+import re
 import time
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Iterable
 import os
 from pathlib import Path
+from types import MappingProxyType
+from functools import lru_cache
+from itertools import islice
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
 import threading
 
+try:
+    import orjson
+except ImportError:  # 未安裝 orjson 時退回標準庫 json
+    orjson = None
+
+try:
+    from googletrans import Translator
+except ImportError:  # 未安裝 googletrans 時跳過翻譯
+    Translator = None
+
 # 台灣台北時區（UTC+8）
 TAIPEI_TZ = timezone(timedelta(hours=8))
+# 星期中文名稱（對應 datetime.weekday()）
+_WEEKDAYS = ('一', '二', '三', '四', '五', '六', '日')
 
 # 配置日誌
 logging.basicConfig(
@@ -42,6 +64,7 @@ TREE_API_KEY = os.getenv('TREE_API_KEY')
 # Telegram 配置
 TG_TOKEN = os.getenv('TG_TOKEN')
 CHAT_ID = os.getenv('CHAT_ID')
+_TG_SEND_URL = f"https://api.telegram.org/bot{TG_TOKEN}/sendMessage" if TG_TOKEN else None
 
 # Telegram Thread IDs (從環境變量讀取 JSON，或使用預設值)
 thread_ids_str = os.environ.get('TG_THREAD_IDS', '')
@@ -74,6 +97,8 @@ else:
         'altseason_radar': int(os.environ.get('TG_THREAD_ALTSEASON_RADAR', 254)),
         'hyperliquid': int(os.environ.get('TG_THREAD_HYPERLIQUID', 252)),
     }
+# 初始化後唯讀，多執行緒發送時無需加鎖
+TG_THREAD_IDS = MappingProxyType(TG_THREAD_IDS)
 
 # 其他配置
 EXCHANGE = "Binance"
@@ -81,16 +106,112 @@ TIME_TYPE = "h1"
 SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
 # 持倉變化篩選：改為只偵測合約幣種（使用 API 獲取）
 MAX_SYMBOLS = 904  # 將由 API 返回的合約幣種數量決定
+# 並行處理配置（BingX幣種較少，可以適當增加並發數）
+MAX_WORKERS = 20  # 同時處理20個請求（BingX幣種較少，可以更快）
+# Telegram 同一聊天室每秒最多約 1 則訊息，連續推播時以此間隔節流
+TG_SEND_INTERVAL = 1.0
 
 # 數據存儲目錄
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(exist_ok=True)
 
+# HTTP Session：CoinGlass 請求共用連線並固定帶上 API 金鑰標頭（只用於 CoinGlass，避免金鑰外洩到其他服務）
+CG_SESSION = requests.Session()
+CG_SESSION.headers.update({
+    "CG-API-KEY": CG_API_KEY,
+    "Accept": "application/json",
+})
+
+
+def _pooled_adapter() -> HTTPAdapter:
+    """建立帶連線池與自動重試的 Adapter（限流與 5xx 錯誤以指數退避重試，重試用盡後返回最後的響應）"""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False,
+    )
+    # 連線池大小需涵蓋所有並行工作執行緒，否則超出預設 10 條的連線用完即丟、下次重新握手
+    return HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS, max_retries=retry)
+
+
+CG_SESSION.mount("https://", _pooled_adapter())
+# 其他公開 API（CoinGecko、Tree of Alpha）共用的 Session
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount("https://", _pooled_adapter())
+# Telegram 專用 Session：只針對 429 限流重試（訊息確定未送出，依 Retry-After 等待），
+# 5xx 時訊息可能已送出，不重試以免重複推播
+TG_SESSION = requests.Session()
+TG_SESSION.mount("https://", HTTPAdapter(max_retries=Retry(
+    total=2,
+    backoff_factor=1,
+    status_forcelist=[429],
+    allowed_methods=frozenset(["POST"]),
+    raise_on_status=False,
+)))
+
+# API 回應中代表成功的 code 值
+_OK_CODES = frozenset(('0', 0, 200, '200'))
+# 部分端點成功時不帶 code 欄位
+_OK_CODES_OR_MISSING = _OK_CODES | {None}
+
 # ==================== 工具函數 ====================
 
+def parse_json(raw: Any) -> Any:
+    """解析 JSON（優先使用 orjson，未安裝時退回標準庫 json）"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dump_json(data: Any) -> str:
+    """序列化為 JSON 字串（保留中文不轉義）"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False)
+
+
+def json_preview(data: Any, limit: int) -> str:
+    """序列化並截斷 JSON（僅用於日誌，不做縮排）"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)[:limit].decode('utf-8', errors='replace')
+    return json.dumps(data, ensure_ascii=False)[:limit]
+
+
+def to_float(value: Any) -> Optional[float]:
+    """轉換為 float，None 或無法解析時返回 None（float/int 直接走快速路徑）"""
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is int:
+        return float(value)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def first_truthy(obj: Dict, keys: tuple, default: Any = None) -> Any:
+    """依序返回第一個為真值的欄位（等同 obj.get(k1) or obj.get(k2) or ... or default）"""
+    for key in keys:
+        val = obj.get(key)
+        if val:
+            return val
+    return default
+
+
+def body_preview(response: requests.Response, limit: int = 500) -> str:
+    """截取響應內容前 limit 位元組（僅用於日誌，不觸發整個響應的編碼偵測與解碼）"""
+    return response.content[:limit].decode('utf-8', errors='replace')
+
+
 def send_telegram_message(text: str, thread_id: int, parse_mode: str = "Markdown") -> bool:
     """發送訊息到 Telegram"""
-    url = f"https://api.telegram.org/bot{TG_TOKEN}/sendMessage"
+    if not _TG_SEND_URL:
+        logger.error("TG_TOKEN 未設定，無法發送 Telegram 訊息")
+        return False
     payload = {
         "chat_id": CHAT_ID,
         "message_thread_id": thread_id,
@@ -100,9 +221,9 @@ def send_telegram_message(text: str, thread_id: int, parse_mode: str = "Markdown
     }
     
     try:
-        response = requests.post(url, json=payload, timeout=10)
+        response = TG_SESSION.post(_TG_SEND_URL, json=payload, timeout=10)
         if response.status_code == 200:
-            result = response.json()
+            result = parse_json(response.content)
             if result.get("ok"):
                 logger.info("Telegram 訊息發送成功")
                 return True
@@ -110,7 +231,7 @@ def send_telegram_message(text: str, thread_id: int, parse_mode: str = "Markdown
                 logger.error(f"Telegram API 錯誤: {result}")
                 return False
         else:
-            logger.error(f"Telegram HTTP 錯誤: {response.status_code} - {response.text}")
+            logger.error(f"Telegram HTTP 錯誤: {response.status_code} - {body_preview(response)}")
             return False
     except Exception as e:
         logger.error(f"發送 Telegram 訊息失敗: {str(e)}")
@@ -118,46 +239,121 @@ def send_telegram_message(text: str, thread_id: int, parse_mode: str = "Markdown
 
 
 def load_json_file(filepath: Path, default: Any = None) -> Any:
-    """從文件加載 JSON 數據"""
-    if filepath.exists():
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"讀取文件失敗 {filepath}: {str(e)}")
+    """從文件加載 JSON 數據（檔案不存在時返回預設值）"""
+    try:
+        return parse_json(filepath.read_bytes())
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error(f"讀取文件失敗 {filepath}: {str(e)}")
     return default if default is not None else []
 
 
 def save_json_file(filepath: Path, data: Any) -> bool:
-    """保存數據到 JSON 文件"""
+    """保存數據到 JSON 文件（先寫暫存檔再原子替換，避免留下寫到一半的檔案）"""
+    tmp_path = filepath.with_name(f"{filepath.name}.{os.getpid()}.tmp")
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            payload = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, filepath)
         return True
     except Exception as e:
         logger.error(f"保存文件失敗 {filepath}: {str(e)}")
         return False
 
 
+# 已推送 ID 記錄：每個檔案載入一次後常駐記憶體（集合判斷是否已推送、deque 保留最近 SENT_IDS_LIMIT 筆），
+# 檔案被其他行程改寫（mtime 改變）時才重新載入
+SENT_IDS_LIMIT = 1000
+_SENT_ID_STORES: Dict[Path, Dict[str, Any]] = {}
+_SENT_ID_LOCK = threading.Lock()
+
+
+def _file_mtime(filepath: Path) -> Optional[int]:
+    """取得檔案修改時間（不存在時返回 None）"""
+    try:
+        return filepath.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _sent_id_store(filepath: Path) -> Dict[str, Any]:
+    """取得已推送 ID 記錄（呼叫端需持有 _SENT_ID_LOCK）"""
+    mtime = _file_mtime(filepath)
+    store = _SENT_ID_STORES.get(filepath)
+    if store is None or store['mtime'] != mtime:
+        ids = list(dict.fromkeys(load_json_file(filepath, [])))
+        recent = deque(ids[-SENT_IDS_LIMIT:], maxlen=SENT_IDS_LIMIT)
+        store = {'ids': set(recent), 'recent': recent, 'mtime': mtime}
+        _SENT_ID_STORES[filepath] = store
+    return store
+
+
+def sent_id_set(filepath: Path) -> Set:
+    """取得已推送 ID 集合（僅供查詢，新增請使用 record_sent_ids）"""
+    with _SENT_ID_LOCK:
+        return _sent_id_store(filepath)['ids']
+
+
+def record_sent_ids(filepath: Path, data_ids: Iterable) -> None:
+    """記錄已推送的 ID，有新增時才寫回檔案（超過 SENT_IDS_LIMIT 筆時淘汰最舊的）"""
+    with _SENT_ID_LOCK:
+        store = _sent_id_store(filepath)
+        ids, recent = store['ids'], store['recent']
+        added = False
+        for data_id in data_ids:
+            if data_id in ids:
+                continue
+            if len(recent) == SENT_IDS_LIMIT:
+                ids.discard(recent[0])
+            recent.append(data_id)
+            ids.add(data_id)
+            added = True
+        if added:
+            save_json_file(filepath, list(recent))
+            store['mtime'] = _file_mtime(filepath)
+
+
+# 共用的 googletrans 翻譯器（首次翻譯時建立，避免每次呼叫都重建 HTTP client）
+_translator = None
+_CJK_PATTERN = re.compile(r'[\u4e00-\u9fff]')
+_ASCII_LETTER_PATTERN = re.compile(r'[A-Za-z]')
+
+
 def translate_text(text: str, target_lang: str = 'zh-tw') -> str:
     """翻譯文本（使用 googletrans，如果可用）"""
-    try:
-        from googletrans import Translator
-        translator = Translator()
-        result = translator.translate(text, dest=target_lang)
-        return result.text
-    except ImportError:
+    global _translator
+    if Translator is None:
         logger.warning("googletrans 未安裝，跳過翻譯")
         return text
+    if not text or (_CJK_PATTERN.search(text) and not _ASCII_LETTER_PATTERN.search(text)):
+        # 空字串或已是純中文，不需翻譯
+        return text
+    try:
+        if _translator is None:
+            _translator = Translator()
+        return _translate_cached(text, target_lang)
     except Exception as e:
         logger.warning(f"翻譯失敗: {str(e)}，使用原文")
         return text
 
 
+@lru_cache(maxsize=4096)
+def _translate_cached(text: str, target_lang: str) -> str:
+    """實際呼叫翻譯器（只快取成功結果，失敗時拋出例外不進快取）"""
+    return _translator.translate(text, dest=target_lang).text
+
+
 def get_taipei_time(dt: Optional[datetime] = None) -> datetime:
     """獲取台灣台北時間（UTC+8）"""
     if dt is None:
         dt = datetime.now(timezone.utc)
+    elif dt.tzinfo is TAIPEI_TZ:
+        # 已經是台灣時間，無需轉換
+        return dt
     elif dt.tzinfo is None:
         # 如果沒有時區資訊，假設是 UTC
         dt = dt.replace(tzinfo=timezone.utc)
@@ -168,10 +364,20 @@ def get_taipei_time(dt: Optional[datetime] = None) -> datetime:
 def format_datetime(dt: datetime) -> str:
     """格式化日期時間（自動轉換為台灣時間）"""
     # 轉換為台灣時間
-    dt_taipei = get_taipei_time(dt)
-    weekdays = ['一', '二', '三', '四', '五', '六', '日']
-    weekday = weekdays[dt_taipei.weekday()]
-    return dt_taipei.strftime(f"%Y-%m-%d (週{weekday}) %H:%M")
+    d = get_taipei_time(dt)
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d} (週{_WEEKDAYS[d.weekday()]}) {d.hour:02d}:{d.minute:02d}"
+
+
+# 台灣時間相對 UTC 的秒數偏移（固定 UTC+8，無夏令時間）
+_TAIPEI_OFFSET = 8 * 3600
+
+
+def format_epoch_taipei(timestamp: float, fmt: str = "%Y-%m-%d %H:%M:%S") -> str:
+    """將秒或毫秒時間戳格式化為台灣時間字串（整數運算，不建立 datetime）"""
+    seconds = int(timestamp)
+    if timestamp > 1e12:  # 毫秒時間戳
+        seconds //= 1000
+    return time.strftime(fmt, time.gmtime(seconds + _TAIPEI_OFFSET))
 
 
 # ==================== 1. 主流板塊排行榜推播 ====================
@@ -189,17 +395,29 @@ MAIN_SECTORS = {
 }
 
 
+# CoinGecko 條件請求快取：URL -> ETag / 上次解析後的排行榜（304 時直接沿用）
+_ETAGS: Dict[str, str] = {}
+_LAST_RANKING: Dict[str, List[Dict]] = {}
+
+
 def fetch_sector_ranking():
     """抓取主流板塊排行榜"""
     url = f"https://api.coingecko.com/api/v3/coins/categories?x_cg_demo_api_key={CG_GECKO_API_KEY}"
     
     try:
-        response = requests.get(url, timeout=10)
+        headers = {}
+        if url in _ETAGS and url in _LAST_RANKING:
+            headers['If-None-Match'] = _ETAGS[url]
+        response = HTTP_SESSION.get(url, headers=headers, timeout=10)
+        if response.status_code == 304:
+            logger.info("CoinGecko 板塊數據未變更（304），沿用上次解析結果")
+            send_ranking_to_tg(_LAST_RANKING[url])
+            return
         if response.status_code != 200:
             logger.error(f"CoinGecko API 錯誤: {response.status_code}")
             return
         
-        categories = response.json()
+        categories = parse_json(response.content)
         
         # 過濾並中文化
         filtered_sectors = []
@@ -213,6 +431,11 @@ def fetch_sector_ranking():
         # 排序
         filtered_sectors.sort(key=lambda x: x['change'], reverse=True)
         
+        etag = response.headers.get('ETag')
+        if etag:
+            _ETAGS[url] = etag
+            _LAST_RANKING[url] = filtered_sectors
+        
         send_ranking_to_tg(filtered_sectors)
         
     except Exception as e:
@@ -248,19 +471,15 @@ def fetch_global_account_ratio(symbol: str, time_type: str) -> Optional[Dict]:
         "symbol": symbol,
         "interval": time_type
     }
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "Accept": "application/json"
-    }
     
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = CG_SESSION.get(url, params=params, timeout=10)
         if response.status_code != 200:
             logger.error(f"全局帳戶比 API 請求失敗 - {symbol}: {response.status_code}")
             return None
         
-        data = response.json()
-        if data.get('code') not in ['0', 0, 200, '200']:
+        data = parse_json(response.content)
+        if data.get('code') not in _OK_CODES:
             logger.error(f"全局帳戶比 API 返回錯誤 - {symbol}: {data.get('code')}")
             return None
         
@@ -278,18 +497,14 @@ def fetch_top_account_ratio(symbol: str, time_type: str) -> Optional[Dict]:
         "symbol": symbol,
         "interval": time_type
     }
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "Accept": "application/json"
-    }
     
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = CG_SESSION.get(url, params=params, timeout=10)
         if response.status_code != 200:
             return None
         
-        data = response.json()
-        if data.get('code') not in ['0', 0, 200, '200']:
+        data = parse_json(response.content)
+        if data.get('code') not in _OK_CODES:
             return None
         
         return data
@@ -306,18 +521,14 @@ def fetch_top_position_ratio(symbol: str, time_type: str) -> Optional[Dict]:
         "symbol": symbol,
         "interval": time_type
     }
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "Accept": "application/json"
-    }
     
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = CG_SESSION.get(url, params=params, timeout=10)
         if response.status_code != 200:
             return None
         
-        data = response.json()
-        if data.get('code') not in ['0', 0, 200, '200']:
+        data = parse_json(response.content)
+        if data.get('code') not in _OK_CODES:
             return None
         
         return data
@@ -338,6 +549,96 @@ def get_latest_data_point(data: Dict) -> Optional[Dict]:
     return data_list if isinstance(data_list, dict) else None
 
 
+# 多空比離散化邊界：lower 為「小於」判斷的邊界，upper 為「大於」判斷的邊界（皆升冪）
+_RETAIL_LOWER = (0.85, 0.9, 0.95)
+_RETAIL_UPPER = (1.1, 1.15, 1.5)
+_WHALE_LOWER = (0.9, 0.95)
+_WHALE_UPPER = (1.1, 1.15, 1.2)
+_SINGLE_LOWER = (0.8, 0.95)
+_SINGLE_UPPER = (1.1, 1.3)
+
+# 雙方數據皆有時的診斷結果：(診斷, 解讀模板, 風險等級)
+_DIAGNOSES = {
+    'euphoria': (
+        "⚠️ 散戶狂熱，巨鯨撤退",
+        "散戶多空比 {gr:.2f} 顯示極度看多，但巨鯨持倉比 {tpr:.2f} 顯示看空。這是典型的「散戶接盤，巨鯨出貨」信號，價格可能面臨大幅回調。",
+        "高",
+    ),
+    'capitulation': (
+        "✅ 散戶恐慌，巨鯨抄底",
+        "散戶多空比 {gr:.2f} 顯示極度看空，但巨鯨持倉比 {tpr:.2f} 顯示強勢看多。這是「散戶割肉，巨鯨掃貨」的底部信號，可能是抄底機會。",
+        "低",
+    ),
+    'both_bull': (
+        "📈 散戶與巨鯨同步看多",
+        "散戶多空比 {gr:.2f} 和巨鯨持倉比 {tpr:.2f} 都顯示看多。市場情緒一致，上漲動能較強，但需注意過熱風險。",
+        "中低",
+    ),
+    'both_bear': (
+        "📉 散戶與巨鯨同步看空",
+        "散戶多空比 {gr:.2f} 和巨鯨持倉比 {tpr:.2f} 都顯示看空。市場情緒一致看跌，下跌壓力較大，建議謹慎操作。",
+        "高",
+    ),
+    'retail_bull': (
+        "🔍 散戶看多，巨鯨觀望",
+        "散戶多空比 {gr:.2f} 顯示看多，但巨鯨持倉比 {tpr:.2f} 保持中性。巨鯨可能在等待更好的進場時機，需密切觀察。",
+        "中",
+    ),
+    'retail_bear': (
+        "🔍 散戶看空，巨鯨觀望",
+        "散戶多空比 {gr:.2f} 顯示看空，但巨鯨持倉比 {tpr:.2f} 保持中性。巨鯨可能在等待更好的進場時機，需密切觀察。",
+        "中",
+    ),
+    'whale_bull': (
+        "💎 散戶中性，巨鯨看多",
+        "散戶多空比 {gr:.2f} 保持中性，但巨鯨持倉比 {tpr:.2f} 顯示強勢看多。巨鯨可能提前布局，這是較好的跟隨信號。",
+        "中低",
+    ),
+    'whale_bear': (
+        "⚠️ 散戶中性，巨鯨看空",
+        "散戶多空比 {gr:.2f} 保持中性，但巨鯨持倉比 {tpr:.2f} 顯示看空。巨鯨可能提前減倉，需警惕下跌風險。",
+        "中高",
+    ),
+    'balance': (
+        "⚖️ 市場平衡",
+        "散戶多空比 {gr:.2f} 和巨鯨持倉比 {tpr:.2f} 都接近中性。市場處於平衡狀態，等待明確方向。",
+        "中等",
+    ),
+}
+
+# 診斷矩陣：列為散戶區間（_RETAIL_* 共 7 區），欄為巨鯨區間（_WHALE_* 共 6 區）
+_DIAGNOSIS_MATRIX = (
+    ('both_bear', 'both_bear', 'retail_bear', 'retail_bear', 'balance', 'capitulation'),  # < 0.85
+    ('both_bear', 'both_bear', 'retail_bear', 'retail_bear', 'balance', 'balance'),       # 0.85 ~ 0.9
+    ('both_bear', 'both_bear', 'balance', 'balance', 'balance', 'balance'),               # 0.9 ~ 0.95
+    ('whale_bear', 'balance', 'balance', 'balance', 'whale_bull', 'whale_bull'),          # 0.95 ~ 1.1
+    ('whale_bear', 'balance', 'balance', 'both_bull', 'both_bull', 'both_bull'),          # 1.1 ~ 1.15
+    ('balance', 'balance', 'retail_bull', 'both_bull', 'both_bull', 'both_bull'),         # 1.15 ~ 1.5
+    ('euphoria', 'euphoria', 'retail_bull', 'both_bull', 'both_bull', 'both_bull'),       # > 1.5
+)
+
+# 只有單方數據時的診斷（依 _SINGLE_* 區間由低到高）
+_RETAIL_ONLY_DIAGNOSES = (
+    ("👤 散戶極度看空", "散戶多空比 {gr:.2f} 顯示極度看空，市場情緒恐慌，可能是底部信號。", "中"),
+    ("👤 散戶看空", "散戶多空比 {gr:.2f} 顯示看空，市場情緒偏悲觀。", "中"),
+    ("👤 散戶中性", "散戶多空比 {gr:.2f} 接近中性，市場情緒平衡。", "中等"),
+    ("👤 散戶看多", "散戶多空比 {gr:.2f} 顯示看多，市場情緒偏樂觀。", "中"),
+    ("👤 散戶極度看多", "散戶多空比 {gr:.2f} 顯示極度看多，市場情緒過熱，需警惕回調風險。", "中高"),
+)
+_WHALE_ONLY_DIAGNOSES = (
+    ("🐳 巨鯨強勢看空", "巨鯨持倉比 {tpr:.2f} 顯示強勢看空，大戶積極減倉，需警惕下跌風險。", "高"),
+    ("🐳 巨鯨看空", "巨鯨持倉比 {tpr:.2f} 顯示看空，大戶傾向做空。", "中高"),
+    ("🐳 巨鯨中性", "巨鯨持倉比 {tpr:.2f} 接近中性，大戶保持觀望。", "中等"),
+    ("🐳 巨鯨看多", "巨鯨持倉比 {tpr:.2f} 顯示看多，大戶傾向做多。", "中低"),
+    ("🐳 巨鯨強勢看多", "巨鯨持倉比 {tpr:.2f} 顯示強勢看多，大戶積極建倉，可能是上漲信號。", "低"),
+)
+
+
+def _bucket(value: float, lower: tuple, upper: tuple) -> int:
+    """將比值離散化為區間索引（小於 lower 邊界往下、大於 upper 邊界往上）"""
+    return bisect.bisect_right(lower, value) + bisect.bisect_left(upper, value)
+
+
 def analyze_data(all_data: Dict) -> Optional[Dict]:
     """分析數據並判斷市場狀況（改進版：更合理的閾值和白話描述）"""
     global_point = get_latest_data_point(all_data.get('global'))
@@ -353,112 +654,17 @@ def analyze_data(all_data: Dict) -> Optional[Dict]:
         logger.warning("無法提取必要的數據指標")
         return None
     
-    # 改進的診斷邏輯：使用更合理的閾值，並提供更白話的描述
-    diagnosis = ""
-    diagnosis_detail = ""
-    risk_level = "中等"
-    
-    # 計算散戶和巨鯨的傾向
-    retail_bullish = global_ratio > 1.2 if global_ratio else False
-    retail_bearish = global_ratio < 0.9 if global_ratio else False
-    whale_bullish = top_position_ratio > 1.15 if top_position_ratio else False
-    whale_bearish = top_position_ratio < 0.9 if top_position_ratio else False
-    
-    # 判斷市場狀況
+    # 依散戶與巨鯨所在區間查表判斷市場狀況
     if global_ratio is not None and top_position_ratio is not None:
-        # 情況1：散戶極度看多，巨鯨看空（危險信號）
-        if global_ratio > 1.5 and top_position_ratio < 0.95:
-            diagnosis = "⚠️ 散戶狂熱，巨鯨撤退"
-            diagnosis_detail = f"散戶多空比 {global_ratio:.2f} 顯示極度看多，但巨鯨持倉比 {top_position_ratio:.2f} 顯示看空。這是典型的「散戶接盤，巨鯨出貨」信號，價格可能面臨大幅回調。"
-            risk_level = "高"
-        # 情況2：散戶恐慌，巨鯨抄底（機會信號）
-        elif global_ratio < 0.85 and top_position_ratio > 1.2:
-            diagnosis = "✅ 散戶恐慌，巨鯨抄底"
-            diagnosis_detail = f"散戶多空比 {global_ratio:.2f} 顯示極度看空，但巨鯨持倉比 {top_position_ratio:.2f} 顯示強勢看多。這是「散戶割肉，巨鯨掃貨」的底部信號，可能是抄底機會。"
-            risk_level = "低"
-        # 情況3：散戶看多，巨鯨也看多（健康上漲）
-        elif global_ratio > 1.1 and top_position_ratio > 1.1:
-            diagnosis = "📈 散戶與巨鯨同步看多"
-            diagnosis_detail = f"散戶多空比 {global_ratio:.2f} 和巨鯨持倉比 {top_position_ratio:.2f} 都顯示看多。市場情緒一致，上漲動能較強，但需注意過熱風險。"
-            risk_level = "中低"
-        # 情況4：散戶看空，巨鯨也看空（下跌趨勢）
-        elif global_ratio < 0.95 and top_position_ratio < 0.95:
-            diagnosis = "📉 散戶與巨鯨同步看空"
-            diagnosis_detail = f"散戶多空比 {global_ratio:.2f} 和巨鯨持倉比 {top_position_ratio:.2f} 都顯示看空。市場情緒一致看跌，下跌壓力較大，建議謹慎操作。"
-            risk_level = "高"
-        # 情況5：散戶看多，巨鯨中性（需觀察）
-        elif global_ratio > 1.15 and 0.95 <= top_position_ratio <= 1.15:
-            diagnosis = "🔍 散戶看多，巨鯨觀望"
-            diagnosis_detail = f"散戶多空比 {global_ratio:.2f} 顯示看多，但巨鯨持倉比 {top_position_ratio:.2f} 保持中性。巨鯨可能在等待更好的進場時機，需密切觀察。"
-            risk_level = "中"
-        # 情況6：散戶看空，巨鯨中性（需觀察）
-        elif global_ratio < 0.9 and 0.95 <= top_position_ratio <= 1.15:
-            diagnosis = "🔍 散戶看空，巨鯨觀望"
-            diagnosis_detail = f"散戶多空比 {global_ratio:.2f} 顯示看空，但巨鯨持倉比 {top_position_ratio:.2f} 保持中性。巨鯨可能在等待更好的進場時機，需密切觀察。"
-            risk_level = "中"
-        # 情況7：散戶中性，巨鯨看多（機會信號）
-        elif 0.95 <= global_ratio <= 1.15 and top_position_ratio > 1.15:
-            diagnosis = "💎 散戶中性，巨鯨看多"
-            diagnosis_detail = f"散戶多空比 {global_ratio:.2f} 保持中性，但巨鯨持倉比 {top_position_ratio:.2f} 顯示強勢看多。巨鯨可能提前布局，這是較好的跟隨信號。"
-            risk_level = "中低"
-        # 情況8：散戶中性，巨鯨看空（警告信號）
-        elif 0.95 <= global_ratio <= 1.15 and top_position_ratio < 0.9:
-            diagnosis = "⚠️ 散戶中性，巨鯨看空"
-            diagnosis_detail = f"散戶多空比 {global_ratio:.2f} 保持中性，但巨鯨持倉比 {top_position_ratio:.2f} 顯示看空。巨鯨可能提前減倉，需警惕下跌風險。"
-            risk_level = "中高"
-        # 情況9：雙方都接近中性（平衡狀態）
-        else:
-            diagnosis = "⚖️ 市場平衡"
-            diagnosis_detail = f"散戶多空比 {global_ratio:.2f} 和巨鯨持倉比 {top_position_ratio:.2f} 都接近中性。市場處於平衡狀態，等待明確方向。"
-            risk_level = "中等"
+        row = _DIAGNOSIS_MATRIX[_bucket(global_ratio, _RETAIL_LOWER, _RETAIL_UPPER)]
+        diagnosis, template, risk_level = _DIAGNOSES[row[_bucket(top_position_ratio, _WHALE_LOWER, _WHALE_UPPER)]]
     elif global_ratio is not None:
         # 只有散戶數據
-        if global_ratio > 1.3:
-            diagnosis = "👤 散戶極度看多"
-            diagnosis_detail = f"散戶多空比 {global_ratio:.2f} 顯示極度看多，市場情緒過熱，需警惕回調風險。"
-            risk_level = "中高"
-        elif global_ratio > 1.1:
-            diagnosis = "👤 散戶看多"
-            diagnosis_detail = f"散戶多空比 {global_ratio:.2f} 顯示看多，市場情緒偏樂觀。"
-            risk_level = "中"
-        elif global_ratio < 0.8:
-            diagnosis = "👤 散戶極度看空"
-            diagnosis_detail = f"散戶多空比 {global_ratio:.2f} 顯示極度看空，市場情緒恐慌，可能是底部信號。"
-            risk_level = "中"
-        elif global_ratio < 0.95:
-            diagnosis = "👤 散戶看空"
-            diagnosis_detail = f"散戶多空比 {global_ratio:.2f} 顯示看空，市場情緒偏悲觀。"
-            risk_level = "中"
-        else:
-            diagnosis = "👤 散戶中性"
-            diagnosis_detail = f"散戶多空比 {global_ratio:.2f} 接近中性，市場情緒平衡。"
-            risk_level = "中等"
-    elif top_position_ratio is not None:
-        # 只有巨鯨數據
-        if top_position_ratio > 1.3:
-            diagnosis = "🐳 巨鯨強勢看多"
-            diagnosis_detail = f"巨鯨持倉比 {top_position_ratio:.2f} 顯示強勢看多，大戶積極建倉，可能是上漲信號。"
-            risk_level = "低"
-        elif top_position_ratio > 1.1:
-            diagnosis = "🐳 巨鯨看多"
-            diagnosis_detail = f"巨鯨持倉比 {top_position_ratio:.2f} 顯示看多，大戶傾向做多。"
-            risk_level = "中低"
-        elif top_position_ratio < 0.8:
-            diagnosis = "🐳 巨鯨強勢看空"
-            diagnosis_detail = f"巨鯨持倉比 {top_position_ratio:.2f} 顯示強勢看空，大戶積極減倉，需警惕下跌風險。"
-            risk_level = "高"
-        elif top_position_ratio < 0.95:
-            diagnosis = "🐳 巨鯨看空"
-            diagnosis_detail = f"巨鯨持倉比 {top_position_ratio:.2f} 顯示看空，大戶傾向做空。"
-            risk_level = "中高"
-        else:
-            diagnosis = "🐳 巨鯨中性"
-            diagnosis_detail = f"巨鯨持倉比 {top_position_ratio:.2f} 接近中性，大戶保持觀望。"
-            risk_level = "中等"
+        diagnosis, template, risk_level = _RETAIL_ONLY_DIAGNOSES[_bucket(global_ratio, _SINGLE_LOWER, _SINGLE_UPPER)]
     else:
-        diagnosis = "❓ 數據不足"
-        diagnosis_detail = "無法獲取足夠的數據進行分析。"
-        risk_level = "未知"
+        # 只有巨鯨數據
+        diagnosis, template, risk_level = _WHALE_ONLY_DIAGNOSES[_bucket(top_position_ratio, _SINGLE_LOWER, _SINGLE_UPPER)]
+    diagnosis_detail = template.format(gr=global_ratio, tpr=top_position_ratio)
     
     return {
         'globalRatio': global_ratio,
@@ -470,105 +676,91 @@ def analyze_data(all_data: Dict) -> Optional[Dict]:
     }
 
 
+# 訊息情緒區間：< 0.85、0.85 ~ 0.95、中性、1.05 ~ 1.2、> 1.2
+_SENTIMENT_LOWER = (0.85, 0.95)
+_SENTIMENT_UPPER = (1.05, 1.2)
+_RETAIL_SENTIMENT = (("❄️", "極度看空"), ("📉", "看空"), ("➡️", "中性"), ("📈", "看多"), ("🔥", "極度看多"))
+_WHALE_SENTIMENT = (("🔴", "強勢看空"), ("🟠", "看空"), ("⚪", "中性"), ("🟡", "看多"), ("🟢", "強勢看多"))
+_RISK_EMOJI = {
+    '低': '🟢',
+    '中低': '🟡',
+    '中等': '🟠',
+    '中高': '🟠',
+    '高': '🔴',
+    '未知': '⚪'
+}
+
+_SYMBOL_TEMPLATE = (
+    "\n🐋 【{coin}】\n"
+    "━━━━━━━━━━━━━━━━━━━\n"
+    "{retail_line}{account_line}{whale_line}"
+    "\n🚩 市場診斷：\n"
+    "   {diagnosis}\n"
+    "{detail_block}"
+    "\n⚠️ 風險等級：{risk_emoji} {risk_level}\n"
+)
+
+
 def format_symbol_message(symbol: str, analysis: Dict) -> str:
     """格式化單個幣種的訊息片段（改進版：更白話、更直觀）"""
-    coin_symbol = symbol.replace("USDT", "")
-    message = f"\n🐋 【{coin_symbol}】\n"
-    message += "━━━━━━━━━━━━━━━━━━━\n"
+    retail_line = account_line = whale_line = detail_block = ""
     
-    # 顯示數據指標（簡化顯示）
-    if analysis.get('globalRatio') is not None:
-        gr = analysis['globalRatio']
-        # 用更直觀的方式顯示
-        if gr > 1.2:
-            emoji = "🔥"
-            status = "極度看多"
-        elif gr > 1.05:
-            emoji = "📈"
-            status = "看多"
-        elif gr < 0.85:
-            emoji = "❄️"
-            status = "極度看空"
-        elif gr < 0.95:
-            emoji = "📉"
-            status = "看空"
-        else:
-            emoji = "➡️"
-            status = "中性"
-        message += f"👤 散戶情緒：{emoji} {status} (多空比 {gr:.2f})\n"
-    
-    if analysis.get('topAccountRatio') is not None:
-        tar = analysis['topAccountRatio']
-        message += f"📊 大戶帳戶比：{tar:.2f}\n"
-    
-    if analysis.get('topPositionRatio') is not None:
-        tpr = analysis['topPositionRatio']
-        # 用更直觀的方式顯示
-        if tpr > 1.2:
-            emoji = "🟢"
-            status = "強勢看多"
-        elif tpr > 1.05:
-            emoji = "🟡"
-            status = "看多"
-        elif tpr < 0.85:
-            emoji = "🔴"
-            status = "強勢看空"
-        elif tpr < 0.95:
-            emoji = "🟠"
-            status = "看空"
-        else:
-            emoji = "⚪"
-            status = "中性"
-        message += f"🐳 巨鯨部位：{emoji} {status} (持倉比 {tpr:.2f})\n"
+    gr = analysis.get('globalRatio')
+    if gr is not None:
+        emoji, status = _RETAIL_SENTIMENT[_bucket(gr, _SENTIMENT_LOWER, _SENTIMENT_UPPER)]
+        retail_line = f"👤 散戶情緒：{emoji} {status} (多空比 {gr:.2f})\n"
     
-    # 顯示診斷結果（更突出）
-    message += f"\n🚩 市場診斷：\n"
-    message += f"   {analysis.get('diagnosis', '無法判斷')}\n"
+    tar = analysis.get('topAccountRatio')
+    if tar is not None:
+        account_line = f"📊 大戶帳戶比：{tar:.2f}\n"
+    
+    tpr = analysis.get('topPositionRatio')
+    if tpr is not None:
+        emoji, status = _WHALE_SENTIMENT[_bucket(tpr, _SENTIMENT_LOWER, _SENTIMENT_UPPER)]
+        whale_line = f"🐳 巨鯨部位：{emoji} {status} (持倉比 {tpr:.2f})\n"
     
     if analysis.get('diagnosisDetail'):
-        message += f"\n💡 解讀：\n"
-        message += f"   {analysis['diagnosisDetail']}\n"
+        detail_block = f"\n💡 解讀：\n   {analysis['diagnosisDetail']}\n"
     
-    # 顯示風險等級
     risk_level = analysis.get('riskLevel', '未知')
-    risk_emoji = {
-        '低': '🟢',
-        '中低': '🟡',
-        '中等': '🟠',
-        '中高': '🟠',
-        '高': '🔴',
-        '未知': '⚪'
-    }
-    message += f"\n⚠️ 風險等級：{risk_emoji.get(risk_level, '⚪')} {risk_level}\n"
-    
-    return message
+    return _SYMBOL_TEMPLATE.format_map({
+        'coin': symbol.replace("USDT", ""),
+        'retail_line': retail_line,
+        'account_line': account_line,
+        'whale_line': whale_line,
+        'diagnosis': analysis.get('diagnosis', '無法判斷'),
+        'detail_block': detail_block,
+        'risk_emoji': _RISK_EMOJI.get(risk_level, '⚪'),
+        'risk_level': risk_level,
+    })
+
+
+# 穩定幣市值每小時一個點，計算 24 小時變化最多需要最後 25 個點
+_MCAP_WINDOW = 25
 
 
 def fetch_stablecoin_marketcap_history() -> Optional[List[Dict]]:
     """獲取穩定幣市值歷史數據"""
     url = "https://open-api-v4.coinglass.com/api/index/stableCoin-marketCap-history"
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "accept": "application/json"
-    }
     
     try:
         logger.info(f"正在調用穩定幣市值 API: {url}")
-        response = requests.get(url, headers=headers, timeout=10)
+        response = CG_SESSION.get(url, timeout=10)
         logger.info(f"穩定幣市值 API 響應狀態碼: {response.status_code}")
         
         if response.status_code != 200:
             logger.error(f"穩定幣市值 API 返回狀態碼: {response.status_code}")
-            logger.error(f"響應內容: {response.text[:500]}")
+            logger.error(f"響應內容: {body_preview(response)}")
             return None
         
-        data = response.json()
+        data = parse_json(response.content)
         logger.info(f"穩定幣市值 API 返回數據結構: code={data.get('code')}, msg={data.get('msg')}")
-        # 輸出完整的數據結構以便調試
-        logger.info(f"完整響應結構（前2000字符）: {json.dumps(data, ensure_ascii=False, indent=2)[:2000]}")
+        # 輸出完整的數據結構以便調試（僅在 DEBUG 等級才序列化，避免每次都產生大字串）
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("完整響應結構（前2000字符）: %s", json_preview(data, 2000))
         
         # 檢查返回碼
-        if data.get('code') not in ['0', 0, 200, '200', None]:
+        if data.get('code') not in _OK_CODES_OR_MISSING:
             error_msg = data.get('msg') or data.get('message') or '未知錯誤'
             logger.error(f"穩定幣市值 API 返回錯誤: {error_msg} (code: {data.get('code')})")
             return None
@@ -582,9 +774,11 @@ def fetch_stablecoin_marketcap_history() -> Optional[List[Dict]]:
             data_list = data_content.get('data_list')
             if isinstance(data_list, list) and len(data_list) > 0:
                 logger.info(f"成功獲取穩定幣市值數據: {len(data_list)} 條記錄")
+                # 下游只用到最新、1小時前與24小時前（倒數第25個）的數據點，只格式化最後這一段
+                start = max(len(data_list) - _MCAP_WINDOW, 0)
                 # 轉換數據格式：將每個 { "USDT": value } 轉換為標準格式
                 formatted_list = []
-                for idx, item in enumerate(data_list):
+                for idx, item in enumerate(data_list[start:], start):
                     if isinstance(item, dict):
                         # 計算總市值（加總所有穩定幣）
                         total_mcap = sum(float(v) for v in item.values() if isinstance(v, (int, float)))
@@ -627,14 +821,14 @@ def fetch_stablecoin_marketcap_history() -> Optional[List[Dict]]:
         logger.info(f"數據類型: {type(data_content)}")
         if isinstance(data_content, dict):
             logger.info(f"data 字典的鍵: {list(data_content.keys())}")
-        logger.info(f"數據結構（前1000字符）: {json.dumps(data, ensure_ascii=False, indent=2)[:1000]}")
+        logger.info(f"數據結構（前1000字符）: {json_preview(data, 1000)}")
         return None
     except requests.exceptions.RequestException as e:
         logger.error(f"穩定幣市值 API 請求失敗: {str(e)}")
         return None
     except json.JSONDecodeError as e:
         logger.error(f"穩定幣市值 API 響應 JSON 解析失敗: {str(e)}")
-        logger.error(f"響應內容: {response.text[:500] if 'response' in locals() else 'N/A'}")
+        logger.error(f"響應內容: {body_preview(response) if 'response' in locals() else 'N/A'}")
         return None
     except Exception as e:
         logger.error(f"獲取穩定幣市值歷史失敗: {str(e)}")
@@ -651,19 +845,15 @@ def fetch_aggregated_stablecoin_oi_history(symbol: str = "BTC", interval: str =
         "symbol": symbol,
         "interval": interval
     }
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "accept": "application/json"
-    }
     
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = CG_SESSION.get(url, params=params, timeout=10)
         if response.status_code != 200:
             logger.error(f"穩定幣 OI API 返回狀態碼: {response.status_code}")
             return None
         
-        data = response.json()
-        if data.get('code') not in ['0', 0, 200, '200']:
+        data = parse_json(response.content)
+        if data.get('code') not in _OK_CODES:
             logger.error(f"穩定幣 OI API 返回錯誤: {data.get('msg')}")
             return None
         
@@ -677,16 +867,55 @@ def fetch_aggregated_stablecoin_oi_history(symbol: str = "BTC", interval: str =
         return None
 
 
+# 歷史數據欄位候選（依優先順序），每次計算只探測一次實際使用的欄位
+_MCAP_KEYS = ('marketCap', 'market_cap', 'value')
+_OI_KEYS = ('close', 'value', 'openInterest')
+_TS_KEYS = ('time', 'timestamp')
+
+
+def _detect_key(sample: Dict, candidates: tuple) -> Optional[str]:
+    """從樣本數據點中找出第一個有值的欄位名稱"""
+    for key in candidates:
+        if sample.get(key) is not None:
+            return key
+    return None
+
+
+def _sorted_by(data_list: List[Dict], key) -> List[Dict]:
+    """按 key 升冪排序；API 數據通常已按時間排列，已排序時直接返回原列表"""
+    prev = None
+    for item in data_list:
+        value = key(item)
+        if prev is not None and value < prev:
+            return sorted(data_list, key=key)
+        prev = value
+    return data_list
+
+
+def _last_at_or_before(sorted_data: List[Dict], times: List[int], cutoff: int) -> Optional[Dict]:
+    """二分搜尋時間戳 <= cutoff 的最後一個數據點（times 需與 sorted_data 對齊且已升冪排列）"""
+    idx = bisect.bisect_right(times, cutoff)
+    return sorted_data[idx - 1] if idx else None
+
+
 def calculate_marketcap_change(data_list: List[Dict]) -> Optional[Dict]:
     """計算穩定幣市值變化率（1小時和24小時）"""
     if not data_list or len(data_list) < 2:
         return None
     
+    # 以最新一筆探測實際欄位名稱，後續直接取值
+    sample = data_list[-1]
+    mcap_key = _detect_key(sample, _MCAP_KEYS)
+    ts_key = _detect_key(sample, _TS_KEYS)
+    if mcap_key is None:
+        return None
+    
     # 按時間戳或索引排序（最新的在最後）
     def get_sort_key(item):
-        time_val = item.get('time') or item.get('timestamp')
-        if time_val is not None:
-            return time_val
+        if ts_key is not None:
+            time_val = item.get(ts_key)
+            if time_val is not None:
+                return time_val
         # 如果沒有時間戳，使用索引
         index_val = item.get('index')
         if index_val is not None:
@@ -694,11 +923,11 @@ def calculate_marketcap_change(data_list: List[Dict]) -> Optional[Dict]:
         # 如果都沒有，返回 0（保持原順序）
         return 0
     
-    sorted_data = sorted(data_list, key=get_sort_key)
+    sorted_data = _sorted_by(data_list, get_sort_key)
     
     # 獲取最新值
     latest = sorted_data[-1]
-    latest_mcap = latest.get('marketCap') or latest.get('market_cap') or latest.get('value')
+    latest_mcap = latest.get(mcap_key)
     
     if latest_mcap is None:
         return None
@@ -711,7 +940,7 @@ def calculate_marketcap_change(data_list: List[Dict]) -> Optional[Dict]:
     
     if len(sorted_data) >= 2:
         # 如果數據有時間戳，使用時間戳
-        if sorted_data[0].get('time') or sorted_data[0].get('timestamp'):
+        if ts_key is not None and sorted_data[0].get(ts_key):
             now = get_taipei_time()
             one_hour_ago = now - timedelta(hours=1)
             one_hour_ago_ts = int(one_hour_ago.timestamp() * 1000)
@@ -720,7 +949,7 @@ def calculate_marketcap_change(data_list: List[Dict]) -> Optional[Dict]:
             twenty_four_hours_ago_ts = int(twenty_four_hours_ago.timestamp() * 1000)
             
             for item in sorted_data:
-                item_time = item.get('time') or item.get('timestamp', 0)
+                item_time = item.get(ts_key) or 0
                 if item_time <= one_hour_ago_ts:
                     one_hour_data = item
                 if item_time <= twenty_four_hours_ago_ts:
@@ -747,13 +976,13 @@ def calculate_marketcap_change(data_list: List[Dict]) -> Optional[Dict]:
     
     # 計算1小時變化率
     if one_hour_data:
-        one_hour_mcap = one_hour_data.get('marketCap') or one_hour_data.get('market_cap') or one_hour_data.get('value')
+        one_hour_mcap = one_hour_data.get(mcap_key)
         if one_hour_mcap and one_hour_mcap > 0:
             result['change_1h'] = ((latest_mcap - one_hour_mcap) / one_hour_mcap) * 100
     
     # 計算24小時變化率
     if twenty_four_hours_data:
-        twenty_four_hours_mcap = twenty_four_hours_data.get('marketCap') or twenty_four_hours_data.get('market_cap') or twenty_four_hours_data.get('value')
+        twenty_four_hours_mcap = twenty_four_hours_data.get(mcap_key)
         if twenty_four_hours_mcap and twenty_four_hours_mcap > 0:
             result['change_24h'] = ((latest_mcap - twenty_four_hours_mcap) / twenty_four_hours_mcap) * 100
     
@@ -765,12 +994,19 @@ def calculate_oi_change(data_list: List[Dict]) -> Optional[Dict]:
     if not data_list or len(data_list) < 2:
         return None
     
+    # 以最新一筆探測實際欄位名稱，後續直接取值
+    sample = data_list[-1]
+    oi_key = _detect_key(sample, _OI_KEYS)
+    ts_key = _detect_key(sample, _TS_KEYS) or 'time'
+    if oi_key is None:
+        return None
+    
     # 按時間戳排序
-    sorted_data = sorted(data_list, key=lambda x: x.get('time', 0) or x.get('timestamp', 0))
+    sorted_data = _sorted_by(data_list, lambda x: x.get(ts_key) or 0)
     
     # 獲取最新值（使用 close 或 value）
     latest = sorted_data[-1]
-    latest_oi = latest.get('close') or latest.get('value') or latest.get('openInterest')
+    latest_oi = latest.get(oi_key)
     
     if latest_oi is None:
         return None
@@ -780,25 +1016,15 @@ def calculate_oi_change(data_list: List[Dict]) -> Optional[Dict]:
     one_hour_ago = now - timedelta(hours=1)
     one_hour_ago_ts = int(one_hour_ago.timestamp() * 1000)
     
-    one_hour_data = None
-    for item in sorted_data:
-        item_time = item.get('time') or item.get('timestamp', 0)
-        if item_time <= one_hour_ago_ts:
-            one_hour_data = item
-        else:
-            break
+    # 時間戳只取一次，之後以二分搜尋定位
+    times = [item.get(ts_key) or 0 for item in sorted_data]
+    one_hour_data = _last_at_or_before(sorted_data, times, one_hour_ago_ts)
     
     # 計算24小時變化
     twenty_four_hours_ago = now - timedelta(hours=24)
     twenty_four_hours_ago_ts = int(twenty_four_hours_ago.timestamp() * 1000)
     
-    twenty_four_hours_data = None
-    for item in sorted_data:
-        item_time = item.get('time') or item.get('timestamp', 0)
-        if item_time <= twenty_four_hours_ago_ts:
-            twenty_four_hours_data = item
-        else:
-            break
+    twenty_four_hours_data = _last_at_or_before(sorted_data, times, twenty_four_hours_ago_ts)
     
     result = {
         'latest_oi': float(latest_oi),
@@ -808,19 +1034,43 @@ def calculate_oi_change(data_list: List[Dict]) -> Optional[Dict]:
     
     # 計算1小時變化率
     if one_hour_data:
-        one_hour_oi = one_hour_data.get('close') or one_hour_data.get('value') or one_hour_data.get('openInterest')
+        one_hour_oi = one_hour_data.get(oi_key)
         if one_hour_oi and one_hour_oi > 0:
             result['change_1h'] = ((latest_oi - one_hour_oi) / one_hour_oi) * 100
     
     # 計算24小時變化率
     if twenty_four_hours_data:
-        twenty_four_hours_oi = twenty_four_hours_data.get('close') or twenty_four_hours_data.get('value') or twenty_four_hours_data.get('openInterest')
+        twenty_four_hours_oi = twenty_four_hours_data.get(oi_key)
         if twenty_four_hours_oi and twenty_four_hours_oi > 0:
             result['change_24h'] = ((latest_oi - twenty_four_hours_oi) / twenty_four_hours_oi) * 100
     
     return result
 
 
+# 購買力監控訊息的固定段落
+_BUYING_POWER_HEADER = "💰 *【購買力監控】*\n━━━━━━━━━━━━━━━━━━━━\n"
+_BUYING_POWER_NORMAL = (
+    "目前購買力變化在正常範圍內（市值變化 <= 0.05%，OI 變化 <= 1%）。\n"
+    "持續監控中，如有異常變化將及時通知。"
+)
+# 以 (value > 0) 索引：下跌／上升
+_TREND_EMOJI = ("📉", "📈")
+_ALERT_DESCRIPTIONS = {
+    "資金進場": "✅ 資金進場：場外資金（Fiat）兌換成穩定幣準備買入",
+    "槓桿堆積": "⚠️ 槓桿堆積：場內資金正在使用穩定幣作為保證金開多單",
+}
+
+
+def _change_lines(change: Dict) -> List[str]:
+    """產生 1 小時／24 小時變化率的訊息行"""
+    lines = []
+    for key, label in (('change_1h', '1小時'), ('change_24h', '24小時')):
+        value = change.get(key)
+        if value is not None:
+            lines.append(f"{_TREND_EMOJI[value > 0]} {label}變化：*{value:+.2f}%*")
+    return lines
+
+
 def buying_power_monitor():
     """購買力監控：監控穩定幣市值和聚合穩定幣保證金持倉"""
     logger.info("開始執行購買力監控...")
@@ -881,27 +1131,14 @@ def buying_power_monitor():
     now = get_taipei_time()
     time_str = format_datetime(now)
     
-    lines = []
-    lines.append("💰 *【購買力監控】*")
-    lines.append("━━━━━━━━━━━━━━━━━━━━")
-    lines.append("")
+    lines = [_BUYING_POWER_HEADER]
     
     # 穩定幣市值
     lines.append("📊 *穩定幣市值*：")
     if mcap_change.get('latest_mcap'):
         mcap_b = mcap_change['latest_mcap'] / 1_000_000_000  # 轉換為十億
         lines.append(f"當前市值：*{mcap_b:.2f}B USD*")
-    
-    if mcap_change.get('change_1h') is not None:
-        change_1h = mcap_change['change_1h']
-        emoji = "📈" if change_1h > 0 else "📉"
-        lines.append(f"{emoji} 1小時變化：*{change_1h:+.2f}%*")
-    
-    if mcap_change.get('change_24h') is not None:
-        change_24h = mcap_change['change_24h']
-        emoji = "📈" if change_24h > 0 else "📉"
-        lines.append(f"{emoji} 24小時變化：*{change_24h:+.2f}%*")
-    
+    lines.extend(_change_lines(mcap_change))
     lines.append("")
     
     # 穩定幣 OI
@@ -909,27 +1146,13 @@ def buying_power_monitor():
     if oi_change.get('latest_oi'):
         oi_b = oi_change['latest_oi'] / 1_000_000_000  # 轉換為十億
         lines.append(f"當前持倉：*{oi_b:.2f}B USD*")
-    
-    if oi_change.get('change_1h') is not None:
-        change_1h = oi_change['change_1h']
-        emoji = "📈" if change_1h > 0 else "📉"
-        lines.append(f"{emoji} 1小時變化：*{change_1h:+.2f}%*")
-    
-    if oi_change.get('change_24h') is not None:
-        change_24h = oi_change['change_24h']
-        emoji = "📈" if change_24h > 0 else "📉"
-        lines.append(f"{emoji} 24小時變化：*{change_24h:+.2f}%*")
-    
+    lines.extend(_change_lines(oi_change))
     lines.append("")
     
     # 警報提示（如果有觸發）
     if alert_type:
         lines.append("🚨 *警報類型*：")
-        for alert in alert_type:
-            if alert == "資金進場":
-                lines.append("✅ 資金進場：場外資金（Fiat）兌換成穩定幣準備買入")
-            elif alert == "槓桿堆積":
-                lines.append("⚠️ 槓桿堆積：場內資金正在使用穩定幣作為保證金開多單")
+        lines.extend(_ALERT_DESCRIPTIONS[alert] for alert in alert_type if alert in _ALERT_DESCRIPTIONS)
         lines.append("")
     
     # 船長解讀
@@ -943,12 +1166,9 @@ def buying_power_monitor():
             lines.append("OI 暴增預示波動將至，需注意槓桿風險，可能出現劇烈波動。")
     else:
         # 沒有觸發警報時的提示
-        lines.append("目前購買力變化在正常範圍內（市值變化 <= 0.05%，OI 變化 <= 1%）。")
-        lines.append("持續監控中，如有異常變化將及時通知。")
+        lines.append(_BUYING_POWER_NORMAL)
     
-    lines.append("")
-    lines.append("━━━━━━━━━━━━━━━━━━━━")
-    lines.append(f"⏰ 更新時間：{time_str}")
+    lines.append(f"\n━━━━━━━━━━━━━━━━━━━━\n⏰ 更新時間：{time_str}")
     
     message = "\n".join(lines)
     send_telegram_message(message, TG_THREAD_IDS.get('buying_power_monitor', 246), parse_mode="Markdown")
@@ -1022,33 +1242,13 @@ def fetch_whale_position_old():
             
             # 散戶情緒（簡化）
             if analysis.get('globalRatio') is not None:
-                gr = analysis['globalRatio']
-                if gr > 1.2:
-                    retail_status = "🔥 極度看多"
-                elif gr > 1.05:
-                    retail_status = "📈 看多"
-                elif gr < 0.85:
-                    retail_status = "❄️ 極度看空"
-                elif gr < 0.95:
-                    retail_status = "📉 看空"
-                else:
-                    retail_status = "➡️ 中性"
-                message += f"散戶：{retail_status}\n"
+                emoji, status = _RETAIL_SENTIMENT[_bucket(analysis['globalRatio'], _SENTIMENT_LOWER, _SENTIMENT_UPPER)]
+                message += f"散戶：{emoji} {status}\n"
             
             # 巨鯨部位（簡化）
             if analysis.get('topPositionRatio') is not None:
-                tpr = analysis['topPositionRatio']
-                if tpr > 1.2:
-                    whale_status = "🟢 強勢看多"
-                elif tpr > 1.05:
-                    whale_status = "🟡 看多"
-                elif tpr < 0.85:
-                    whale_status = "🔴 強勢看空"
-                elif tpr < 0.95:
-                    whale_status = "🟠 看空"
-                else:
-                    whale_status = "⚪ 中性"
-                message += f"巨鯨：{whale_status}\n"
+                emoji, status = _WHALE_SENTIMENT[_bucket(analysis['topPositionRatio'], _SENTIMENT_LOWER, _SENTIMENT_UPPER)]
+                message += f"巨鯨：{emoji} {status}\n"
             
             # 市場診斷（簡化）
             diagnosis = analysis.get('diagnosis', '無法判斷')
@@ -1069,21 +1269,36 @@ def fetch_whale_position_old():
 
 # ==================== 3. 持倉變化篩選器 ====================
 
+# BingX 合約名單以小時／天為單位變動，快取 12 小時
+SUPPORTED_COINS_TTL = 12 * 60 * 60
+_SUPPORTED_COINS_CACHE: Dict[str, Any] = {'expires_at': 0.0, 'coins': []}
+_SUPPORTED_COINS_LOCK = threading.Lock()
+
+
 def fetch_supported_futures_coins() -> List[str]:
+    """獲取 BingX 合約幣種列表（帶 TTL 快取；持鎖查詢，並行呼叫時只發出一次請求）"""
+    with _SUPPORTED_COINS_LOCK:
+        if time.time() < _SUPPORTED_COINS_CACHE['expires_at']:
+            return list(_SUPPORTED_COINS_CACHE['coins'])
+        coins = _fetch_supported_futures_coins()
+        # 失敗（空列表）不快取，下次呼叫重新請求
+        if coins:
+            _SUPPORTED_COINS_CACHE['coins'] = coins
+            _SUPPORTED_COINS_CACHE['expires_at'] = time.time() + SUPPORTED_COINS_TTL
+        return list(coins)
+
+
+def _fetch_supported_futures_coins() -> List[str]:
     """獲取 BingX 交易所支援的合約幣種列表（應該有 600+ 個）"""
     url = "https://open-api-v4.coinglass.com/api/futures/supported-exchange-pairs"
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "accept": "application/json"
-    }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = CG_SESSION.get(url, timeout=10)
         if response.status_code != 200:
             logger.error(f"supported-exchange-pairs API error: {response.status_code}")
             return []
         
-        result = response.json()
+        result = parse_json(response.content)
         data = result.get('data', result)
         
         # API 返回的是字典結構：{"BingX": [{"instrument_id": "BTCUSDT", "base_asset": "BTC", ...}, ...]}
@@ -1095,13 +1310,14 @@ def fetch_supported_futures_coins() -> List[str]:
         exchanges = list(data.keys())
         logger.info(f"API 返回的交易所: {exchanges[:10]}... (共 {len(exchanges)} 個)")
         
-        # 查找 BingX（嘗試多種可能的鍵名）
-        bingx_data = None
-        for key in data.keys():
-            if 'bingx' in str(key).lower() or 'bing' in str(key).lower():
-                bingx_data = data[key]
-                logger.info(f"找到 BingX 數據，鍵名: {key}")
-                break
+        # 查找 BingX：先以不分大小寫的鍵名直接查找，找不到再嘗試包含 bing 的鍵名
+        lower_keys = {str(key).lower(): key for key in data}
+        bingx_key = lower_keys.get('bingx')
+        if bingx_key is None:
+            bingx_key = next((key for lower, key in lower_keys.items() if 'bing' in lower), None)
+        bingx_data = data[bingx_key] if bingx_key is not None else None
+        if bingx_data:
+            logger.info(f"找到 BingX 數據，鍵名: {bingx_key}")
         
         if not bingx_data:
             logger.error(f"未找到 BingX 數據，可用交易所: {exchanges}")
@@ -1111,8 +1327,9 @@ def fetch_supported_futures_coins() -> List[str]:
             logger.error(f"BingX 數據格式錯誤，預期列表但得到: {type(bingx_data)}")
             return []
         
-        # 提取幣種符號
+        # 提取幣種符號（以集合去重，保留原始順序）
         symbols = []
+        seen = set()
         for item in bingx_data:
             if not isinstance(item, dict):
                 continue
@@ -1127,7 +1344,8 @@ def fetch_supported_futures_coins() -> List[str]:
                     # 處理多種格式：BTCUSDT, BTC-USDT, BTC_USDT 等
                     symbol = instrument_id.replace('USDT', '').replace('USDT-PERP', '').replace('-PERP', '').replace('_USDT', '').replace('-USDT', '').replace('_', '').upper()
             
-            if symbol and symbol not in symbols:
+            if symbol and symbol not in seen:
+                seen.add(symbol)
                 symbols.append(symbol)
         
         logger.info(f"從 BingX API 獲取到 {len(symbols)} 個合約幣種")
@@ -1139,51 +1357,42 @@ def fetch_supported_futures_coins() -> List[str]:
         return []
 
 
-def fetch_coins_price_change() -> List[Dict]:
-    """獲取幣種漲跌幅列表（改為只返回合約幣種）"""
+def fetch_coins_price_change(supported_coins: Optional[List[str]] = None) -> List[Dict]:
+    """獲取幣種漲跌幅列表（改為只返回合約幣種；可傳入已取得的合約幣種列表）"""
     # 先獲取合約幣種列表
-    supported_coins = fetch_supported_futures_coins()
+    if supported_coins is None:
+        supported_coins = fetch_supported_futures_coins()
     if not supported_coins:
         logger.warning("無法獲取合約幣種列表，使用備用方法")
         # 備用：使用原API，但會包含現貨
         url = f"{CG_API_BASE}/api/futures/coins-price-change"
-        headers = {
-            "CG-API-KEY": CG_API_KEY,
-            "accept": "application/json"
-        }
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = CG_SESSION.get(url, timeout=10)
             if response.status_code != 200:
                 return []
-            result = response.json()
+            result = parse_json(response.content)
             return result.get('data', result if isinstance(result, list) else [])
         except:
             return []
     
     # 獲取價格變化數據
     url = f"{CG_API_BASE}/api/futures/coins-price-change"
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "accept": "application/json"
-    }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = CG_SESSION.get(url, timeout=10)
         if response.status_code != 200:
             logger.error(f"coins-price-change error: {response.status_code}")
             return []
         
-        result = response.json()
+        result = parse_json(response.content)
         all_data = result.get('data', result if isinstance(result, list) else [])
         
-        # 過濾：只保留合約幣種
-        filtered_data = []
-        for item in all_data:
-            symbol = item.get('symbol') or item.get('coin') or ''
-            # 移除USDT後綴進行比對
-            symbol_clean = symbol.replace('USDT', '').replace('USDT-PERP', '').upper()
-            if symbol_clean in supported_coins:
-                filtered_data.append(item)
+        # 過濾：只保留合約幣種（移除USDT後綴進行比對）
+        supported_set = frozenset(supported_coins)
+        filtered_data = [
+            item for item in all_data
+            if (item.get('symbol') or item.get('coin') or '').replace('USDT', '').replace('USDT-PERP', '').upper() in supported_set
+        ]
         
         logger.info(f"過濾後剩餘 {len(filtered_data)} 個合約幣種（原始 {len(all_data)} 個）")
         return filtered_data
@@ -1192,28 +1401,62 @@ def fetch_coins_price_change() -> List[Dict]:
         return []
 
 
+# OI 變化快取：同一區間內重跑（重試、手動觸發）時直接沿用結果；寫入 DATA_DIR，重啟後仍有效
+OI_CACHE_FILE = DATA_DIR / "oi_change_cache.json"
+OI_CACHE_TTL = 300  # 秒
+# (連線, 讀取) 逾時秒數：單一緩慢的幣種不應佔住工作執行緒 10 秒；逾時會由 Session 的 Retry 自動重試
+OI_REQUEST_TIMEOUT = (2, 5)
+_OI_CACHE: Optional[Dict[str, List[float]]] = None
+_OI_CACHE_LOCK = threading.Lock()
+
+
+def _get_oi_cache() -> Dict[str, List[float]]:
+    """取得 OI 快取 {symbol: [到期時間, 變化%]}（首次使用時從檔案載入並丟棄已過期項目）"""
+    global _OI_CACHE
+    with _OI_CACHE_LOCK:
+        if _OI_CACHE is None:
+            raw = load_json_file(OI_CACHE_FILE, {})
+            now = time.time()
+            _OI_CACHE = {
+                sym: entry for sym, entry in raw.items()
+                if isinstance(entry, list) and len(entry) == 2 and entry[0] > now
+            } if isinstance(raw, dict) else {}
+        return _OI_CACHE
+
+
+def save_oi_cache() -> None:
+    """將未過期的 OI 快取寫回檔案"""
+    cache = _get_oi_cache()
+    now = time.time()
+    with _OI_CACHE_LOCK:
+        live = {sym: entry for sym, entry in cache.items() if entry[0] > now}
+    save_json_file(OI_CACHE_FILE, live)
+
+
 def fetch_oi_change_15m(symbol: str) -> Optional[float]:
     """計算單一 symbol 15 分鐘 OI 變化%（數據源：CoinGlass Binance，與 Google Apps Script 版本一致）"""
     # 直接使用 symbol+USDT 格式，使用 m15 區間
     # 使用 exchange 參數指定 Binance（確保數據源與 Google Apps Script 版本一致）
     sym = symbol + "USDT"
+    cache = _get_oi_cache()
+    cached = cache.get(sym)
+    if cached and cached[0] > time.time():
+        return cached[1]
+    
     url = f"{CG_API_BASE}/api/futures/open-interest/history"
     params = {
         "exchange": EXCHANGE,  # 使用 Binance（確保數據源與 Google Apps Script 版本一致）
         "symbol": sym,
-        "interval": "m15"  # 使用 15 分鐘區間
-    }
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "accept": "application/json"
+        "interval": "m15",  # 使用 15 分鐘區間
+        "limit": 2  # 只需最後兩根 K 線計算變化，避免每次下載整段歷史
     }
     
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = CG_SESSION.get(url, params=params, timeout=OI_REQUEST_TIMEOUT)
         if response.status_code != 200:
             return None
         
-        result = response.json()
+        result = parse_json(response.content)
         data_list = result.get('data', result.get('list', []))
         
         if not isinstance(data_list, list) or len(data_list) < 2:
@@ -1237,6 +1480,7 @@ def fetch_oi_change_15m(symbol: str) -> Optional[float]:
             return None
         
         change = ((last_oi - prev_oi) / prev_oi) * 100
+        cache[sym] = [time.time() + OI_CACHE_TTL, change]
         return change
     except Exception as e:
         return None
@@ -1247,115 +1491,69 @@ def normalize_symbol(coin: Dict) -> Optional[str]:
     return coin.get('symbol') or coin.get('pair') or coin.get('name') or coin.get('coin') or coin.get('symbolName')
 
 
+# 價格變化欄位優先順序：優先使用 15 分鐘，其次為 1 小時、24 小時
+_PRICE_CHANGE_KEYS = ('price_change_percent_15m', 'price_change_percent_1h', 'price_change_percent_24h')
+
+
 def extract_price_change_15m(coin: Dict) -> float:
-    """提取 15 分鐘價格變化%"""
-    # 優先使用 15 分鐘價格變化
-    change = coin.get('price_change_percent_15m')
-    if isinstance(change, (int, float)):
-        return float(change)
-    if isinstance(change, str) and change:
-        try:
-            parsed = float(change)
-            if not (parsed != parsed):  # 檢查 NaN
-                return parsed
-        except ValueError:
-            pass
-    
-    # 備用：其他時間區間
-    change = coin.get('price_change_percent_1h')
-    if isinstance(change, (int, float)):
-        return float(change)
-    
-    change = coin.get('price_change_percent_24h')
-    if isinstance(change, (int, float)):
-        return float(change)
-    
+    """提取 15 分鐘價格變化%（缺值或無法解析時依序退回 1 小時、24 小時）"""
+    get = coin.get
+    for key in _PRICE_CHANGE_KEYS:
+        parsed = to_float(get(key))
+        if parsed is not None and not math.isnan(parsed):
+            return parsed
     return 0.0
 
 
+# 持倉異動排行榜的固定段落
+_REPORT_HEADER = "💰 *【傑克短線持倉異動排行榜】*\n━━━━━━━━━━━━━━━━━━━━━━━━\n"
+_REPORT_FOOTER = "\n".join([
+    "━━━━━━━━━━━━━━━━━━━━━━━━",
+    "💡 *【換位思考主力動機】*",
+    "",
+    "請先判斷 *15分K價格走勢趨勢* 去換位思考主力動機",
+    "",
+    "📈 *開倉動機*：為什麼在這個位置開倉？",
+    "",
+    "📉 *平倉動機*：停利還是停損？",
+])
+
+
+def _fmt_pct(num) -> str:
+    """格式化百分比（帶正負號，NaN 或 None 顯示為 0.00%）"""
+    # NaN 是唯一不等於自身的值
+    return f"{num:+.2f}%" if num is not None and num == num else "0.00%"
+
+
+def _render_movers_block(title: str, empty_text: str, items: List) -> str:
+    """產生單一分類的 TOP 3 區塊（以空行結尾）"""
+    if not items:
+        rows = [f"    {empty_text}"]
+    else:
+        rows = [
+            f"    {idx}) *{item['symbol']}*｜價格 {_fmt_pct(item.get('priceChange15m', 0))}｜持倉 {_fmt_pct(item['oiChange15m'])}"
+            for idx, item in enumerate(items, 1)
+        ]
+    return "\n".join([f"  *{title}*", *rows, ""])
+
+
 def build_report_message(top_long_open: List, top_long_close: List, top_short_open: List, top_short_close: List, processed_count: int = 0, oi_success_count: int = 0) -> str:
     """組合推播文字（優化版：簡潔標題，加入主力思維教學）"""
-    lines = []
-    lines.append("💰 *【傑克短線持倉異動排行榜】*")
-    lines.append("━━━━━━━━━━━━━━━━━━━━━━━━")
-    lines.append("")
-    
-    def fmt(num):
-        if num is None or (isinstance(num, float) and (num != num)):  # NaN check
-            return "0.00%"
-        return f"{'+' if num >= 0 else ''}{num:.2f}%"
-    
-    # 開倉（包含多方開倉和空方開倉）
-    lines.append("📈 *開倉*")
-    lines.append("")
-    
-    # 多方開倉 TOP 3
-    lines.append("  *多方開倉 TOP 3*")
-    if not top_long_open:
-        lines.append("    無明顯多方開倉標的")
-    else:
-        for idx, item in enumerate(top_long_open):
-            price_change = fmt(item.get('priceChange15m', 0))
-            oi_change = fmt(item['oiChange15m'])
-            lines.append(
-                f"    {idx + 1}) *{item['symbol']}*｜價格 {price_change}｜持倉 {oi_change}"
-            )
-    lines.append("")
-    
-    # 空方開倉 TOP 3
-    lines.append("  *空方開倉 TOP 3*")
-    if not top_short_open:
-        lines.append("    無明顯空方開倉標的")
-    else:
-        for idx, item in enumerate(top_short_open):
-            price_change = fmt(item.get('priceChange15m', 0))
-            oi_change = fmt(item['oiChange15m'])
-            lines.append(
-                f"    {idx + 1}) *{item['symbol']}*｜價格 {price_change}｜持倉 {oi_change}"
-            )
-    lines.append("")
-    
-    # 平倉（包含多方平倉和空方平倉）
-    lines.append("📉 *平倉*")
-    lines.append("")
-    
-    # 多方平倉 TOP 3
-    lines.append("  *多方平倉 TOP 3*")
-    if not top_long_close:
-        lines.append("    無明顯多方平倉標的")
-    else:
-        for idx, item in enumerate(top_long_close):
-            price_change = fmt(item.get('priceChange15m', 0))
-            oi_change = fmt(item['oiChange15m'])
-            lines.append(
-                f"    {idx + 1}) *{item['symbol']}*｜價格 {price_change}｜持倉 {oi_change}"
-            )
-    lines.append("")
-    
-    # 空方平倉 TOP 3
-    lines.append("  *空方平倉 TOP 3*")
-    if not top_short_close:
-        lines.append("    無明顯空方平倉標的")
-    else:
-        for idx, item in enumerate(top_short_close):
-            price_change = fmt(item.get('priceChange15m', 0))
-            oi_change = fmt(item['oiChange15m'])
-            lines.append(
-                f"    {idx + 1}) *{item['symbol']}*｜價格 {price_change}｜持倉 {oi_change}"
-            )
-    lines.append("")
-    
-    # 主力思維教學（換位思考）
-    lines.append("━━━━━━━━━━━━━━━━━━━━━━━━")
-    lines.append("💡 *【換位思考主力動機】*")
-    lines.append("")
-    lines.append("請先判斷 *15分K價格走勢趨勢* 去換位思考主力動機")
-    lines.append("")
-    lines.append("📈 *開倉動機*：為什麼在這個位置開倉？")
-    lines.append("")
-    lines.append("📉 *平倉動機*：停利還是停損？")
-    
-    return "\n".join(lines)
+    return "\n".join([
+        _REPORT_HEADER,
+        # 開倉（包含多方開倉和空方開倉）
+        "📈 *開倉*",
+        "",
+        _render_movers_block("多方開倉 TOP 3", "無明顯多方開倉標的", top_long_open),
+        _render_movers_block("空方開倉 TOP 3", "無明顯空方開倉標的", top_short_open),
+        # 平倉（包含多方平倉和空方平倉）
+        "📉 *平倉*",
+        "",
+        _render_movers_block("多方平倉 TOP 3", "無明顯多方平倉標的", top_long_close),
+        _render_movers_block("空方平倉 TOP 3", "無明顯空方平倉標的", top_short_close),
+        # 主力思維教學（換位思考）
+        _REPORT_FOOTER,
+    ])
 
 
 def process_single_symbol(coin: Dict) -> Optional[Dict]:
@@ -1402,6 +1600,33 @@ def process_single_symbol(coin: Dict) -> Optional[Dict]:
         return {'status': 'error', 'symbol': symbol, 'error': str(e)}
 
 
+# 各分類排名方向：1 = OI 增加越多越好，-1 = OI 減少越多越好（越負越好）
+_CATEGORY_SIGN = {
+    'long_open': 1,
+    'long_close': -1,
+    'short_open': 1,
+    'short_close': -1,
+}
+TOP_MOVERS_LIMIT = 3
+
+
+def _push_top_mover(heap: List[tuple], sign: int, seq: int, symbol: str, price_change: float, oi_change: float) -> None:
+    """維護大小為 TOP_MOVERS_LIMIT 的最小堆（堆頂為目前入榜中最弱者；同分時先到者優先）"""
+    entry = (sign * oi_change, -seq, symbol, price_change, oi_change)
+    if len(heap) < TOP_MOVERS_LIMIT:
+        heapq.heappush(heap, entry)
+    else:
+        heapq.heappushpop(heap, entry)
+
+
+def _top_movers(heap: List[tuple]) -> List[Dict]:
+    """將堆中的入榜幣種由強到弱排列，並建立報告用字典"""
+    return [
+        {'symbol': symbol, 'priceChange15m': price_change, 'oiChange15m': oi_change}
+        for _, _, symbol, price_change, oi_change in sorted(heap, reverse=True)
+    ]
+
+
 def fetch_position_change():
     """主流程：持倉變化篩選（原本的邏輯，只是改成只偵測 BingX 的 554 個交易對）"""
     logger.info("開始執行持倉變化篩選，只偵測 BingX 合約幣種...")
@@ -1415,7 +1640,7 @@ def fetch_position_change():
     logger.info(f"獲取到 {len(bingx_symbols)} 個 BingX 合約幣種")
     
     # 步驟2：獲取 CoinGlass 所有幣種的價格變化數據（原本的邏輯）
-    all_symbols_data = fetch_coins_price_change()
+    all_symbols_data = fetch_coins_price_change(bingx_symbols)
     if not all_symbols_data:
         send_telegram_message("⚠️ 無法從 Coinglass 取得幣種漲跌資料，請稍後再試。", TG_THREAD_IDS['position_change'])
         return
@@ -1423,30 +1648,25 @@ def fetch_position_change():
     logger.info(f"從 Coinglass API 取得 {len(all_symbols_data)} 個幣種的價格數據")
     
     # 步驟3：只保留 BingX 名單中的幣種（原本的邏輯，只是過濾範圍改為 BingX）
-    bingx_symbols_upper = {s.upper() for s in bingx_symbols}
-    target_symbols_data = []
-    for coin in all_symbols_data:
-        symbol = normalize_symbol(coin)
-        if symbol and symbol.upper() in bingx_symbols_upper:
-            target_symbols_data.append(coin)
+    bingx_symbols_upper = frozenset(s.upper() for s in bingx_symbols)
+    target_symbols_data = [
+        coin for coin in all_symbols_data
+        if (normalize_symbol(coin) or '').upper() in bingx_symbols_upper
+    ]
     
     logger.info(f"過濾後剩餘 {len(target_symbols_data)} 個 BingX 幣種（將處理前 {MAX_SYMBOLS} 個）")
     
     # 處理合約幣種（限制數量避免超時）
     target_symbols = target_symbols_data[:MAX_SYMBOLS] if len(target_symbols_data) > MAX_SYMBOLS else target_symbols_data
     
-    long_open = []
-    long_close = []
-    short_open = []
-    short_close = []
+    # 各分類邊收結果邊維護前 3 名的小堆，另外只計數，最後只為入榜的幣種建立字典
+    top_heaps: Dict[str, List[tuple]] = {category: [] for category in _CATEGORY_SIGN}
+    category_counts = dict.fromkeys(_CATEGORY_SIGN, 0)
     
     processed_count = 0
     oi_success_count = 0
     oi_fail_count = 0
     
-    # 並行處理配置（BingX幣種較少，可以適當增加並發數）
-    MAX_WORKERS = 20  # 同時處理20個請求（BingX幣種較少，可以更快）
-    
     # 記錄開始時間
     start_time = time.time()
     MAX_EXECUTION_TIME = 25 * 60  # 25 分鐘（留 5 分鐘緩衝）
@@ -1489,35 +1709,24 @@ def fetch_position_change():
             elif status == 'success':
                 oi_success_count += 1
                 category = result.get('category')
-                symbol = result.get('symbol')
-                price_change = result.get('priceChange15m')
-                oi_change = result.get('oiChange15m')
-                
-                item = {'symbol': symbol, 'priceChange15m': price_change, 'oiChange15m': oi_change}
-                
-                if category == 'long_open':
-                    long_open.append(item)
-                elif category == 'long_close':
-                    long_close.append(item)
-                elif category == 'short_open':
-                    short_open.append(item)
-                elif category == 'short_close':
-                    short_close.append(item)
+                if category in _CATEGORY_SIGN:
+                    category_counts[category] += 1
+                    _push_top_mover(
+                        top_heaps[category], _CATEGORY_SIGN[category], oi_success_count,
+                        result.get('symbol'), result.get('priceChange15m'), result.get('oiChange15m'),
+                    )
+    
+    save_oi_cache()
     
     total_time = time.time() - start_time
     logger.info(f"處理統計: 總共 {processed_count} 個幣種, OI 成功 {oi_success_count} 個, OI 失敗 {oi_fail_count} 個 | 總用時: {total_time/60:.1f} 分鐘")
-    logger.info(f"分類結果: 多方開倉 {len(long_open)}, 多方平倉 {len(long_close)}, 空方開倉 {len(short_open)}, 空方平倉 {len(short_close)}")
-    
-    # 排序與取前 3 名
-    long_open.sort(key=lambda x: x['oiChange15m'], reverse=True)      # OI 增加越多越好
-    long_close.sort(key=lambda x: x['oiChange15m'])                   # OI 減少越多越好（越負越好）
-    short_open.sort(key=lambda x: x['oiChange15m'], reverse=True)     # OI 增加越多越好
-    short_close.sort(key=lambda x: x['oiChange15m'])                  # OI 減少越多越好（越負越好）
+    logger.info(f"分類結果: 多方開倉 {category_counts['long_open']}, 多方平倉 {category_counts['long_close']}, 空方開倉 {category_counts['short_open']}, 空方平倉 {category_counts['short_close']}")
     
-    top_long_open = long_open[:3]
-    top_long_close = long_close[:3]
-    top_short_open = short_open[:3]
-    top_short_close = short_close[:3]
+    # 取前 3 名（已在收集時篩選，這裡只需排列）
+    top_long_open = _top_movers(top_heaps['long_open'])
+    top_long_close = _top_movers(top_heaps['long_close'])
+    top_short_open = _top_movers(top_heaps['short_open'])
+    top_short_close = _top_movers(top_heaps['short_close'])
     
     # 確保每次都會推播（即使沒有異常，也要推播報告）
     msg = build_report_message(top_long_open, top_long_close, top_short_open, top_short_close, processed_count, oi_success_count)
@@ -1535,20 +1744,16 @@ def fetch_economic_data() -> List[Dict]:
     """從 CoinGlass API 抓取經濟數據"""
     url = "https://open-api-v4.coinglass.com/api/calendar/economic-data"
     params = {"language": "zh"}
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "Accept": "application/json"
-    }
     
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        result = response.json()
+        response = CG_SESSION.get(url, params=params, timeout=10)
+        result = parse_json(response.content)
         
-        if result.get('code') in ['0', 0, 200, '200']:
+        if result.get('code') in _OK_CODES:
             data_list = result.get('data', [])
-            # 標記數據來源
+            # 標記數據來源並整理常用欄位
             for item in data_list:
-                item['_source'] = 'economic_data'
+                normalize_event(item, 'economic_data')
             return data_list
         else:
             logger.error(f"Economic Data API 返回錯誤: {result.get('msg')} (錯誤碼: {result.get('code')})")
@@ -1561,20 +1766,16 @@ def fetch_economic_data() -> List[Dict]:
 def fetch_financial_events() -> List[Dict]:
     """從 CoinGlass API 抓取財經事件"""
     url = "https://open-api-v4.coinglass.com/api/calendar/financial-events"
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "Accept": "application/json"
-    }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        result = response.json()
+        response = CG_SESSION.get(url, timeout=10)
+        result = parse_json(response.content)
         
-        if result.get('code') in ['0', 0, 200, '200']:
+        if result.get('code') in _OK_CODES:
             data_list = result.get('data', [])
-            # 標記數據來源
+            # 標記數據來源並整理常用欄位
             for item in data_list:
-                item['_source'] = 'financial_events'
+                normalize_event(item, 'financial_events')
             return data_list
         else:
             logger.warning(f"Financial Events API 返回錯誤: {result.get('msg')} (錯誤碼: {result.get('code')})")
@@ -1587,20 +1788,16 @@ def fetch_financial_events() -> List[Dict]:
 def fetch_central_bank_activities() -> List[Dict]:
     """從 CoinGlass API 抓取央行活動"""
     url = "https://open-api-v4.coinglass.com/api/calendar/central-bank-activities"
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "Accept": "application/json"
-    }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        result = response.json()
+        response = CG_SESSION.get(url, timeout=10)
+        result = parse_json(response.content)
         
-        if result.get('code') in ['0', 0, 200, '200']:
+        if result.get('code') in _OK_CODES:
             data_list = result.get('data', [])
-            # 標記數據來源
+            # 標記數據來源並整理常用欄位
             for item in data_list:
-                item['_source'] = 'central_bank'
+                normalize_event(item, 'central_bank')
             return data_list
         else:
             logger.warning(f"Central Bank API 返回錯誤: {result.get('msg')} (錯誤碼: {result.get('code')})")
@@ -1610,12 +1807,61 @@ def fetch_central_bank_activities() -> List[Dict]:
         return []
 
 
+# 日曆數據短時間快取：預告與推播在同一時段觸發時共用同一次抓取結果
+CALENDAR_CACHE_TTL = 60
+_CALENDAR_CACHE: Dict[str, Any] = {'expires_at': 0.0, 'data': ([], [], [])}
+_CALENDAR_LOCK = threading.Lock()
+
+
+def fetch_all_calendar() -> tuple:
+    """抓取經濟數據、財經事件與央行活動，返回 (經濟數據, 財經事件, 央行活動)（帶 TTL 快取）"""
+    with _CALENDAR_LOCK:
+        if time.time() < _CALENDAR_CACHE['expires_at']:
+            return tuple(list(items) for items in _CALENDAR_CACHE['data'])
+        data = _fetch_all_calendar()
+        # 三個來源全空（多半是請求失敗）時不快取
+        if any(data):
+            _CALENDAR_CACHE['data'] = data
+            _CALENDAR_CACHE['expires_at'] = time.time() + CALENDAR_CACHE_TTL
+        return tuple(list(items) for items in data)
+
+
+def _fetch_all_calendar() -> tuple:
+    """並行抓取經濟數據、財經事件與央行活動（三個端點互相獨立）"""
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        economic_future = executor.submit(fetch_economic_data)
+        financial_future = executor.submit(fetch_financial_events)
+        central_bank_future = executor.submit(fetch_central_bank_activities)
+        return economic_future.result(), financial_future.result(), central_bank_future.result()
+
+
+def normalize_event(item: Dict, source: str) -> Dict:
+    """抓取後整理一次事件欄位：各 API 欄位名稱不一，統一寫入底線開頭的標準欄位供後續直接讀取"""
+    item['_source'] = source
+    item['_name'] = item.get('calendar_name') or item.get('name') or item.get('title') or ''
+    item['_country'] = item.get('country_name') or item.get('country') or ''
+    item['_importance'] = item.get('importance_level') or item.get('importance') or 0
+    item['_effect'] = item.get('data_effect') or item.get('effect') or ''
+    item['_published'] = item.get('published_value') or item.get('actual')
+    item['_publish_time'] = parse_publish_time(item)
+    item['_id'] = generate_data_id(item)
+    return item
+
+
 def parse_publish_time(item: Dict) -> Optional[datetime]:
     """解析發布時間（返回 UTC datetime，後續會轉換為台灣時間）"""
     publish_timestamp = item.get('publish_timestamp') or item.get('publish_time') or item.get('time')
     if not publish_timestamp:
         return None
-    
+    # 同一筆數據在過濾、排序、去重時會被重複解析，可雜湊的純量走快取
+    if isinstance(publish_timestamp, (int, float, str)):
+        return _parse_publish_timestamp(publish_timestamp)
+    return _parse_publish_timestamp.__wrapped__(publish_timestamp)
+
+
+@lru_cache(maxsize=4096)
+def _parse_publish_timestamp(publish_timestamp: Any) -> Optional[datetime]:
+    """將時間戳（秒／毫秒）或 ISO 字串解析為 UTC datetime"""
     try:
         if isinstance(publish_timestamp, (int, float)):
             if publish_timestamp > 1e12:  # 毫秒時間戳
@@ -1635,18 +1881,20 @@ def parse_publish_time(item: Dict) -> Optional[datetime]:
         return None
 
 
-def filter_important_data(data_array: List[Dict], min_importance: int = 2) -> List[Dict]:
+def filter_important_data(data_array: List[Dict], min_importance: int = 2,
+                          now: Optional[datetime] = None) -> List[Dict]:
     """過濾重要經濟數據（可指定最低重要性）"""
-    now = get_taipei_time()
+    if now is None:
+        now = get_taipei_time()
     one_week_later = now + timedelta(days=7)
     two_hours_ago = now - timedelta(hours=2)  # 允許已發布2小時內的數據
     
     filtered = []
     for item in data_array:
-        importance = item.get('importance_level') or item.get('importance') or 0
+        importance = item['_importance']
         
-        # 解析發布時間
-        publish_time = parse_publish_time(item)
+        # 發布時間（抓取時已解析）
+        publish_time = item['_publish_time']
         if not publish_time:
             continue
         
@@ -1663,18 +1911,20 @@ def filter_important_data(data_array: List[Dict], min_importance: int = 2) -> Li
     return filtered
 
 
-def filter_today_events(data_array: List[Dict], min_importance: int = 4) -> List[Dict]:
+def filter_today_events(data_array: List[Dict], min_importance: int = 4,
+                        now: Optional[datetime] = None) -> List[Dict]:
     """過濾今日事件（用於早上8點預告）"""
-    now = get_taipei_time()
+    if now is None:
+        now = get_taipei_time()
     today_start = datetime(now.year, now.month, now.day, 0, 0, 0, tzinfo=TAIPEI_TZ)
     today_end = datetime(now.year, now.month, now.day, 23, 59, 59, tzinfo=TAIPEI_TZ)
     
     filtered = []
     for item in data_array:
-        importance = item.get('importance_level') or item.get('importance') or 0
+        importance = item['_importance']
         
-        # 解析發布時間
-        publish_time = parse_publish_time(item)
+        # 發布時間（抓取時已解析）
+        publish_time = item['_publish_time']
         if not publish_time:
             continue
         
@@ -1698,131 +1948,138 @@ def generate_data_id(item: Dict) -> str:
     
     # 如果沒有唯一 ID，使用組合鍵（來源 + 名稱 + 時間戳）
     source = item.get('_source', 'unknown')
-    name = item.get('calendar_name') or item.get('name') or item.get('title') or 'unknown'
+    name = item['_name'] or 'unknown'
     timestamp = item.get('publish_timestamp') or item.get('publish_time') or item.get('time') or '0'
     
     return f"{source}_{name}_{timestamp}"
 
 
-def get_unsent_data(data_array: List[Dict]) -> List[Dict]:
+def get_unsent_data(data_array: List[Dict], now: Optional[datetime] = None) -> List[Dict]:
     """獲取尚未推送的數據（改進版：考慮發布時間和實際值）"""
-    sent_ids = load_json_file(SENT_DATA_FILE, [])
+    sent_ids = sent_id_set(SENT_DATA_FILE)
     unsent = []
-    now = get_taipei_time()
+    stale_ids = []
+    if now is None:
+        now = get_taipei_time()
     
     for item in data_array:
-        data_id = generate_data_id(item)
+        data_id = item['_id']
         
-        # 檢查是否在已推送列表中
+        # 先檢查是否在已推送列表中，命中時不必解析時間
         if data_id in sent_ids:
             continue
         
         # 額外檢查：如果數據已發布超過 2 小時，且已有實際值，則跳過
         # 這可以防止在 GitHub Actions 環境中重複推送
-        publish_time = parse_publish_time(item)
+        publish_time = item['_publish_time']
         if publish_time:
             time_diff = (now - publish_time).total_seconds()
-            published_value = item.get('published_value') or item.get('actual')
+            published_value = item['_published']
             
             # 如果已發布超過 2 小時且有實際值，視為已處理過（避免重複）
             if time_diff > 7200 and published_value:  # 2小時 = 7200秒
                 logger.debug(f"跳過已發布超過2小時的數據: {data_id}")
-                # 標記為已推送，避免下次再檢查
-                mark_as_sent(data_id)
+                # 標記為已推送，避免下次再檢查（迴圈結束後一次寫入）
+                stale_ids.append(data_id)
                 continue
         
         unsent.append(item)
     
+    if stale_ids:
+        record_sent_ids(SENT_DATA_FILE, stale_ids)
+    
     return unsent
 
 
 def mark_as_sent(data_id: str):
     """標記數據為已推送"""
-    sent_ids = load_json_file(SENT_DATA_FILE, [])
-    if data_id not in sent_ids:
-        sent_ids.append(data_id)
-        # 只保留最近 1000 條記錄
-        if len(sent_ids) > 1000:
-            sent_ids = sent_ids[-1000:]
-        save_json_file(SENT_DATA_FILE, sent_ids)
+    record_sent_ids(SENT_DATA_FILE, [data_id])
 
 
-def get_time_status(publish_time: datetime) -> tuple:
+def get_time_status(publish_time: datetime, now: Optional[datetime] = None) -> tuple:
     """計算時間狀態，返回 (狀態文字, 是否已發布, 時間差秒數)"""
-    # 確保兩個時間都在同一時區（台灣時間）
-    now = get_taipei_time()
-    publish_time_taipei = get_taipei_time(publish_time)
-    diff_seconds = (publish_time_taipei - now).total_seconds()
+    # 帶時區的 datetime 相減與時區無關，不必先轉成台灣時間；沒有時區資訊時視為 UTC
+    if publish_time.tzinfo is None:
+        publish_time = publish_time.replace(tzinfo=timezone.utc)
+    diff_seconds = (publish_time - (now or get_taipei_time())).total_seconds()
     
-    is_past = diff_seconds < 0
-    abs_diff = abs(diff_seconds)
+    # 以整數秒一次拆出天／小時／分鐘
+    days, remainder = divmod(int(abs(diff_seconds)), 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes = remainder // 60
     
-    if is_past:
+    if diff_seconds < 0:
         # 已發布時間
-        if abs_diff < 3600:  # 1小時內
-            minutes = int(abs_diff // 60)
+        if days == 0 and hours == 0:  # 1小時內
             return (f"已發布 {minutes} 分鐘前", True, diff_seconds)
-        elif abs_diff < 86400:  # 24小時內
-            hours = int(abs_diff // 3600)
+        elif days == 0:  # 24小時內
             return (f"已發布 {hours} 小時前", True, diff_seconds)
         else:
-            days = int(abs_diff // 86400)
             return (f"已發布 {days} 天前", True, diff_seconds)
     else:
         # 未發布時間
-        if abs_diff < 3600:  # 1小時內
-            minutes = int(abs_diff // 60)
+        if days == 0 and hours == 0:  # 1小時內
             return (f"{minutes} 分鐘後發布", False, diff_seconds)
-        elif abs_diff < 86400:  # 24小時內
-            hours = int(abs_diff // 3600)
-            minutes = int((abs_diff % 3600) // 60)
+        elif days == 0:  # 24小時內
             if minutes > 0:
                 return (f"{hours} 小時 {minutes} 分鐘後", False, diff_seconds)
             else:
                 return (f"{hours} 小時後", False, diff_seconds)
         else:
-            days = int(abs_diff // 86400)
-            hours = int((abs_diff % 86400) // 3600)
             if hours > 0:
                 return (f"{days} 天 {hours} 小時後", False, diff_seconds)
             else:
                 return (f"{days} 天後", False, diff_seconds)
 
 
+# 對照表在模組載入時建立一次，以唯讀視圖公開避免被意外修改
+_COUNTRY_FLAGS = MappingProxyType({
+    '美國': '🇺🇸', '美利堅': '🇺🇸', 'US': '🇺🇸', 'United States': '🇺🇸', 'USA': '🇺🇸',
+    '中國': '🇨🇳', '中華人民共和國': '🇨🇳', 'CN': '🇨🇳', 'China': '🇨🇳',
+    '歐元區': '🇪🇺', '歐盟': '🇪🇺', 'EU': '🇪🇺', 'Eurozone': '🇪🇺', 'Euro Area': '🇪🇺',
+    '英國': '🇬🇧', '大不列顛': '🇬🇧', 'UK': '🇬🇧', 'United Kingdom': '🇬🇧', 'GB': '🇬🇧',
+    '日本': '🇯🇵', 'JP': '🇯🇵', 'Japan': '🇯🇵',
+    '台灣': '🇹🇼', '臺灣': '🇹🇼', 'TW': '🇹🇼', 'Taiwan': '🇹🇼',
+})
+
+_EFFECT_TEXTS = MappingProxyType({
+    'Minor Impact': '輕微影響',
+    'Moderate Impact': '中等影響',
+    'High Impact': '重大影響',
+    'Major Impact': '極大影響',
+    '利多': '偏向利多', 'Bullish': '偏向利多',
+    '利空': '偏向利空', 'Bearish': '偏向利空',
+    '中性': '中性影響', 'Neutral': '中性影響'
+})
+
+_EFFECT_EMOJIS = MappingProxyType({
+    '利多': '📈', 'Bullish': '📈',
+    '利空': '📉', 'Bearish': '📉',
+    '中性': '➡️', 'Neutral': '➡️'
+})
+
+
+# 國家／影響名稱只有少數幾種，模糊比對結果以 LRU 快取，每種名稱只掃描一次對照表
+@lru_cache(maxsize=256)
 def get_country_flag(country_name: str) -> str:
     """獲取國家旗幟 emoji"""
-    flag_map = {
-        '美國': '🇺🇸', '美利堅': '🇺🇸', 'US': '🇺🇸', 'United States': '🇺🇸', 'USA': '🇺🇸',
-        '中國': '🇨🇳', '中華人民共和國': '🇨🇳', 'CN': '🇨🇳', 'China': '🇨🇳',
-        '歐元區': '🇪🇺', '歐盟': '🇪🇺', 'EU': '🇪🇺', 'Eurozone': '🇪🇺', 'Euro Area': '🇪🇺',
-        '英國': '🇬🇧', '大不列顛': '🇬🇧', 'UK': '🇬🇧', 'United Kingdom': '🇬🇧', 'GB': '🇬🇧',
-        '日本': '🇯🇵', 'JP': '🇯🇵', 'Japan': '🇯🇵',
-        '台灣': '🇹🇼', '臺灣': '🇹🇼', 'TW': '🇹🇼', 'Taiwan': '🇹🇼',
-    }
+    if country_name in _COUNTRY_FLAGS:
+        return _COUNTRY_FLAGS[country_name]
     
-    if country_name in flag_map:
-        return flag_map[country_name]
-    
-    for key, flag in flag_map.items():
+    for key, flag in _COUNTRY_FLAGS.items():
         if key in country_name or country_name in key:
             return flag
     
     return '🌍'
 
 
+@lru_cache(maxsize=256)
 def get_effect_text(effect: str) -> str:
     """獲取市場影響的中文描述"""
-    effect_map = {
-        'Minor Impact': '輕微影響',
-        'Moderate Impact': '中等影響',
-        'High Impact': '重大影響',
-        'Major Impact': '極大影響',
-        '利多': '偏向利多', 'Bullish': '偏向利多',
-        '利空': '偏向利空', 'Bearish': '偏向利空',
-        '中性': '中性影響', 'Neutral': '中性影響'
-    }
-    
-    for key, value in effect_map.items():
+    # 各鍵互不包含，完全相符時與模糊比對的結果相同，可直接查表
+    if effect in _EFFECT_TEXTS:
+        return _EFFECT_TEXTS[effect]
+    for key, value in _EFFECT_TEXTS.items():
         if key in effect or effect in key:
             return value
     
@@ -1831,190 +2088,190 @@ def get_effect_text(effect: str) -> str:
 
 def get_effect_emoji(effect: str) -> str:
     """獲取市場影響 emoji"""
-    effect_map = {
-        '利多': '📈', 'Bullish': '📈',
-        '利空': '📉', 'Bearish': '📉',
-        '中性': '➡️', 'Neutral': '➡️'
-    }
-    return effect_map.get(effect, '📊')
+    return _EFFECT_EMOJIS.get(effect, '📊')
+
+
+# 數據來源 -> (類別名稱, 類別emoji)
+_CATEGORY_INFO = MappingProxyType({
+    'economic_data': ('經濟數據', '📊'),
+    'financial_events': ('財經事件', '💼'),
+    'central_bank': ('央行活動', '🏦')
+})
 
 
 def get_category_info(data: Dict) -> tuple:
     """獲取數據類別資訊，返回 (類別名稱, 類別emoji)"""
-    source = data.get('_source', 'economic_data')
-    category_map = {
-        'economic_data': ('經濟數據', '📊'),
-        'financial_events': ('財經事件', '💼'),
-        'central_bank': ('央行活動', '🏦')
-    }
-    return category_map.get(source, ('經濟事件', '📈'))
+    return _CATEGORY_INFO.get(data.get('_source', 'economic_data'), ('經濟事件', '📈'))
+
+
+# 經濟數據訊息的固定段落
+_ECON_DIVIDER = "━━━━━━━━━━━━━━━━━━━━━━━━"
+# 依重要性分級（中 < 2 <= 高 < 3 <= 極高）：(emoji, 標籤)
+_IMPORTANCE_STYLES = (
+    ('🟢', '📌 中重要性'),
+    ('🟡', '⚡ 高重要性'),
+    ('🔴', '⚠️ 極高重要性'),
+)
+# 依是否已發布：(時間 emoji, 狀態 emoji)
+_TIME_STATUS_EMOJI = (('📅', '⏳'), ('✅', '⏰'))
+_ECON_MESSAGE_TEMPLATE = (
+    "{category_emoji} *【{category_name}推播】*\n"
+    + _ECON_DIVIDER + "\n"
+    "\n"
+    "{importance_emoji} *{event_name}*\n"
+    "{country_flag} {country_name}\n"
+    "\n"
+    "🕐 *發布時間*\n"
+    "{time_emoji} {time_str}\n"
+    "{status_emoji} {time_status}\n"
+    "\n"
+    "{data_block}"
+    "{importance_badge}\n"
+    "{effect_line}"
+    "\n"
+    "{remark_block}"
+    + _ECON_DIVIDER + "\n"
+    "🤖 區塊鏈船長｜{footer_time}"
+)
 
 
-def format_economic_data_message(data: Dict) -> str:
+def format_economic_data_message(data: Dict, now: Optional[datetime] = None) -> str:
     """格式化經濟數據訊息（全新設計）"""
-    publish_time = parse_publish_time(data)
-    if not publish_time:
-        publish_time = get_taipei_time()
+    if now is None:
+        now = get_taipei_time()
+    publish_time = data['_publish_time'] or now
     
     time_str = format_datetime(publish_time)
-    time_status, is_published, _ = get_time_status(publish_time)
+    time_status, is_published, _ = get_time_status(publish_time, now)
+    time_emoji, status_emoji = _TIME_STATUS_EMOJI[bool(is_published)]
     
     # 重要性
-    importance_level = data.get('importance_level') or data.get('importance') or 0
-    if importance_level >= 3:
-        importance_emoji = '🔴'
-        importance_text = '極高'
-        importance_badge = '⚠️ 極高重要性'
-    elif importance_level >= 2:
-        importance_emoji = '🟡'
-        importance_text = '高'
-        importance_badge = '⚡ 高重要性'
-    else:
-        importance_emoji = '🟢'
-        importance_text = '中'
-        importance_badge = '📌 中重要性'
+    importance_level = data['_importance']
+    importance_emoji, importance_badge = _IMPORTANCE_STYLES[(importance_level >= 2) + (importance_level >= 3)]
     
     # 類別資訊
     category_name, category_emoji = get_category_info(data)
     
     # 國家資訊
-    country_flag = get_country_flag(data.get('country_name') or data.get('country') or '')
-    country_name = data.get('country_name') or data.get('country') or '未知地區'
-    
-    # 事件名稱
-    event_name = data.get('calendar_name') or data.get('name') or data.get('title') or '經濟指標'
+    country = data['_country']
+    country_flag = get_country_flag(country)
     
     # 市場影響
-    effect_emoji = get_effect_emoji(data.get('data_effect') or data.get('effect') or '')
-    effect_text = get_effect_text(data.get('data_effect') or data.get('effect') or '')
+    effect = data['_effect']
+    effect_text = get_effect_text(effect)
+    effect_line = ""
+    if effect_text and effect_text != '待觀察':
+        effect_line = f"{get_effect_emoji(effect)} 市場影響：{effect_text}\n"
     
     # 預測值與前值
     forecast_value = data.get('forecast_value') or data.get('forecast')
     previous_value = data.get('previous_value') or data.get('previous')
-    published_value = data.get('published_value') or data.get('actual')
-    
-    # 構建訊息
-    lines = []
-    
-    # 標題區域
-    lines.append(f"{category_emoji} *【{category_name}推播】*")
-    lines.append("━━━━━━━━━━━━━━━━━━━━━━━━")
-    lines.append("")
-    
-    # 事件標題
-    lines.append(f"{importance_emoji} *{event_name}*")
-    lines.append(f"{country_flag} {country_name}")
-    lines.append("")
-    
-    # 時間資訊
-    lines.append("🕐 *發布時間*")
-    if is_published:
-        lines.append(f"✅ {time_str}")
-        lines.append(f"⏰ {time_status}")
-    else:
-        lines.append(f"📅 {time_str}")
-        lines.append(f"⏳ {time_status}")
-    lines.append("")
+    published_value = data['_published']
     
     # 數據對比（如果已發布，顯示實際值；未發布顯示預測值）
-    has_data = False
+    data_lines = []
     if published_value:
-        lines.append("📈 *實際發布值*")
-        lines.append(f"`{published_value}`")
-        has_data = True
-        if forecast_value:
-            lines.append(f"預測值：`{forecast_value}`")
-        if previous_value:
-            lines.append(f"前值：`{previous_value}`")
+        data_lines.append("📈 *實際發布值*")
+        data_lines.append(f"`{published_value}`")
     elif forecast_value or previous_value:
-        lines.append("📊 *市場預期*")
+        data_lines.append("📊 *市場預期*")
+    if data_lines:
         if forecast_value:
-            lines.append(f"預測值：`{forecast_value}`")
+            data_lines.append(f"預測值：`{forecast_value}`")
         if previous_value:
-            lines.append(f"前值：`{previous_value}`")
-        has_data = True
-    
-    if has_data:
-        lines.append("")
-    
-    # 重要性與影響
-    lines.append(f"{importance_badge}")
-    if effect_text and effect_text != '待觀察':
-        lines.append(f"{effect_emoji} 市場影響：{effect_text}")
-    lines.append("")
+            data_lines.append(f"前值：`{previous_value}`")
+    data_block = "".join(f"{line}\n" for line in data_lines) + "\n" if data_lines else ""
     
-    # 補充說明
+    # 補充說明（限制說明長度）
     remark = data.get('remark') or data.get('note') or data.get('description')
+    remark_block = ""
     if remark:
-        lines.append(f"💡 *船長解讀*")
-        # 限制說明長度
         if len(remark) > 200:
             remark = remark[:200] + "..."
-        lines.append(f"{remark}")
-        lines.append("")
-    
-    # 底部資訊
-    lines.append("━━━━━━━━━━━━━━━━━━━━━━━━")
-    lines.append(f"🤖 區塊鏈船長｜{format_datetime(get_taipei_time())}")
-    
-    return "\n".join(lines)
+        remark_block = f"💡 *船長解讀*\n{remark}\n\n"
+    
+    return _ECON_MESSAGE_TEMPLATE.format_map({
+        'category_emoji': category_emoji,
+        'category_name': category_name,
+        'importance_emoji': importance_emoji,
+        'event_name': data['_name'] or '經濟指標',
+        'country_flag': country_flag,
+        'country_name': country or '未知地區',
+        'time_emoji': time_emoji,
+        'time_str': time_str,
+        'status_emoji': status_emoji,
+        'time_status': time_status,
+        'data_block': data_block,
+        'importance_badge': importance_badge,
+        'effect_line': effect_line,
+        'remark_block': remark_block,
+        'footer_time': format_datetime(now),
+    })
+
+
+# 今日預告訊息的固定段落
+_PREVIEW_TEMPLATE = (
+    "📅 *【今日重要經濟數據預告】*\n"
+    + _ECON_DIVIDER + "\n"
+    "\n"
+    "{sections}"
+    + _ECON_DIVIDER + "\n"
+    "⏰ 預告時間：{time_str}"
+)
+_PREVIEW_SECTION_TEMPLATE = "{heading}\n\n{rows}\n"
+_PREVIEW_ROW_TEMPLATE = "  • {time_display} | {country_flag} {event_name}\n"
+_PREVIEW_EMPTY_SECTION = "今日無重要經濟數據事件\n\n"
+
+
+def _preview_event_rows(timed_events: List[tuple]) -> str:
+    """將 (發布時間, 事件) 列表格式化為預告清單（每行以換行結尾，略過沒有時間的事件）"""
+    return "".join(
+        _PREVIEW_ROW_TEMPLATE.format(
+            # 轉換為台灣時間並格式化
+            time_display=_format_hhmm(get_taipei_time(publish_time)),
+            country_flag=get_country_flag(event['_country']),
+            event_name=event['_name'] or '經濟指標',
+        )
+        for publish_time, event in timed_events
+        if publish_time
+    )
 
 
-def format_today_preview_message(events: List[Dict]) -> str:
+def _format_hhmm(dt: datetime) -> str:
+    """格式化為 HH:MM（直接讀取欄位，不經 strftime）"""
+    return f"{dt.hour:02d}:{dt.minute:02d}"
+
+
+def format_today_preview_message(events: List[Dict], now: Optional[datetime] = None) -> str:
     """格式化今日預告訊息（改進版：取消星級，改為高重要性和極高重要性）"""
-    now = get_taipei_time()
-    time_str = format_datetime(now)
-    
-    lines = []
-    lines.append("📅 *【今日重要經濟數據預告】*")
-    lines.append("━━━━━━━━━━━━━━━━━━━━━━━━")
-    lines.append("")
+    time_str = format_datetime(now or get_taipei_time())
     
     # 分組：極高重要性（>= 3）和高重要性（>= 2 且 < 3）
-    very_high = [e for e in events if (e.get('importance_level') or e.get('importance') or 0) >= 3]
-    high = [e for e in events if 2 <= (e.get('importance_level') or e.get('importance') or 0) < 3]
+    very_high = []
+    high = []
+    for event in events:
+        importance = event['_importance']
+        if importance >= 3:
+            very_high.append((event['_publish_time'], event))
+        elif importance >= 2:
+            high.append((event['_publish_time'], event))
     
     # 按時間排序（使用未來時間作為 fallback）
     future_time = datetime(2099, 12, 31, 23, 59, 59, tzinfo=TAIPEI_TZ)
-    very_high.sort(key=lambda x: parse_publish_time(x) or future_time)
-    high.sort(key=lambda x: parse_publish_time(x) or future_time)
+    very_high.sort(key=lambda pair: pair[0] or future_time)
+    high.sort(key=lambda pair: pair[0] or future_time)
     
+    sections = []
     if very_high:
-        lines.append("🔴 *極高重要性（將準時推播）*：")
-        lines.append("")
-        for event in very_high:
-            publish_time = parse_publish_time(event)
-            if publish_time:
-                # 轉換為台灣時間並格式化
-                publish_time_taipei = get_taipei_time(publish_time)
-                time_display = publish_time_taipei.strftime("%H:%M")
-                event_name = event.get('calendar_name') or event.get('name') or event.get('title') or '經濟指標'
-                country_flag = get_country_flag(event.get('country_name') or event.get('country') or '')
-                lines.append(f"  • {time_display} | {country_flag} {event_name}")
-        lines.append("")
-    
+        sections.append(_PREVIEW_SECTION_TEMPLATE.format(
+            heading="🔴 *極高重要性（將準時推播）*：", rows=_preview_event_rows(very_high)))
     if high:
-        lines.append("🟡 *高重要性（僅列出清單）*：")
-        lines.append("")
-        for event in high:
-            publish_time = parse_publish_time(event)
-            if publish_time:
-                # 轉換為台灣時間並格式化
-                publish_time_taipei = get_taipei_time(publish_time)
-                time_display = publish_time_taipei.strftime("%H:%M")
-                event_name = event.get('calendar_name') or event.get('name') or event.get('title') or '經濟指標'
-                country_flag = get_country_flag(event.get('country_name') or event.get('country') or '')
-                lines.append(f"  • {time_display} | {country_flag} {event_name}")
-        lines.append("")
+        sections.append(_PREVIEW_SECTION_TEMPLATE.format(
+            heading="🟡 *高重要性（僅列出清單）*：", rows=_preview_event_rows(high)))
+    if not sections:
+        sections.append(_PREVIEW_EMPTY_SECTION)
     
-    if not very_high and not high:
-        lines.append("今日無重要經濟數據事件")
-        lines.append("")
-    
-    lines.append("━━━━━━━━━━━━━━━━━━━━━━━━")
-    lines.append(f"⏰ 預告時間：{time_str}")
-    
-    return "\n".join(lines)
+    return _PREVIEW_TEMPLATE.format(sections="".join(sections), time_str=time_str)
 
 
 def send_today_preview():
@@ -2022,15 +2279,11 @@ def send_today_preview():
     try:
         all_data = []
         
-        # 抓取所有數據
+        # 抓取所有數據（三個來源並行）
         logger.info("正在抓取經濟數據（預告模式）...")
-        economic_data = fetch_economic_data()
+        economic_data, financial_events, central_bank = fetch_all_calendar()
         all_data.extend(economic_data)
-        
-        financial_events = fetch_financial_events()
         all_data.extend(financial_events)
-        
-        central_bank = fetch_central_bank_activities()
         all_data.extend(central_bank)
         
         if not all_data:
@@ -2038,7 +2291,8 @@ def send_today_preview():
             return
         
         # 過濾今日高重要性以上的事件（>= 2）
-        today_events = filter_today_events(all_data, min_importance=2)
+        now = get_taipei_time()
+        today_events = filter_today_events(all_data, min_importance=2, now=now)
         logger.info(f"今日高重要性以上事件: {len(today_events)} 條")
         
         if not today_events:
@@ -2046,7 +2300,7 @@ def send_today_preview():
             return
         
         # 發送預告
-        message = format_today_preview_message(today_events)
+        message = format_today_preview_message(today_events, now)
         send_telegram_message(message, TG_THREAD_IDS['economic_data'], parse_mode="Markdown")
         logger.info("今日預告發送完成")
         
@@ -2059,21 +2313,13 @@ def fetch_and_push_economic_data():
     try:
         all_data = []
         
-        # 1. 抓取經濟數據
-        logger.info("正在抓取經濟數據...")
-        economic_data = fetch_economic_data()
+        # 1~3. 並行抓取經濟數據、財經事件、央行活動
+        logger.info("正在抓取經濟數據、財經事件、央行活動...")
+        economic_data, financial_events, central_bank = fetch_all_calendar()
         all_data.extend(economic_data)
         logger.info(f"經濟數據：{len(economic_data)} 條")
-        
-        # 2. 抓取財經事件
-        logger.info("正在抓取財經事件...")
-        financial_events = fetch_financial_events()
         all_data.extend(financial_events)
         logger.info(f"財經事件：{len(financial_events)} 條")
-        
-        # 3. 抓取央行活動
-        logger.info("正在抓取央行活動...")
-        central_bank = fetch_central_bank_activities()
         all_data.extend(central_bank)
         logger.info(f"央行活動：{len(central_bank)} 條")
         
@@ -2084,7 +2330,8 @@ def fetch_and_push_economic_data():
         logger.info(f"總共獲取 {len(all_data)} 條數據（經濟數據: {len(economic_data)}, 財經事件: {len(financial_events)}, 央行活動: {len(central_bank)}）")
         
         # 只過濾極高重要性數據（>= 3），高重要性（>= 2 且 < 3）不推播
-        important_data = filter_important_data(all_data, min_importance=3)
+        now = get_taipei_time()
+        important_data = filter_important_data(all_data, min_importance=3, now=now)
         logger.info(f"過濾後的極高重要性數據: {len(important_data)} 條")
         
         if not important_data:
@@ -2093,33 +2340,39 @@ def fetch_and_push_economic_data():
         
         # 按發布時間排序（優先推送即將發布的）
         future_time = datetime(2099, 12, 31, 23, 59, 59, tzinfo=TAIPEI_TZ)
-        important_data.sort(key=lambda x: parse_publish_time(x) or future_time)
+        important_data.sort(key=lambda x: x['_publish_time'] or future_time)
         
         # 檢查哪些尚未推送
-        new_data = get_unsent_data(important_data)
+        new_data = get_unsent_data(important_data, now)
         logger.info(f"尚未推送的極高重要性數據: {len(new_data)} 條")
         
         if not new_data:
             logger.info("所有極高重要性數據均已推送過")
             return
         
-        # 批量推送（避免過於頻繁）
+        # 批量推送（避免過於頻繁）；已推送 ID 在整批結束後一次寫入檔案
         success_count = 0
-        for idx, data in enumerate(new_data):
-            try:
-                message = format_economic_data_message(data)
-                send_telegram_message(message, TG_THREAD_IDS['economic_data'], parse_mode="Markdown")
-                
-                data_id = generate_data_id(data)
-                mark_as_sent(data_id)
-                success_count += 1
+        last_sent = None
+        pushed_ids = []
+        try:
+            for data in new_data:
+                try:
+                    message = format_economic_data_message(data, now)
+                    # 兩則訊息間隔至少 TG_SEND_INTERVAL 秒，發送本身的耗時計入間隔，只補睡剩餘時間
+                    if last_sent is not None:
+                        wait = TG_SEND_INTERVAL - (time.monotonic() - last_sent)
+                        if wait > 0:
+                            time.sleep(wait)
+                    last_sent = time.monotonic()
+                    send_telegram_message(message, TG_THREAD_IDS['economic_data'], parse_mode="Markdown")
                 
-                # 每條訊息間隔 1 秒，避免觸發速率限制
-                if idx < len(new_data) - 1:
-                    time.sleep(1)
+                    pushed_ids.append(data['_id'])
+                    success_count += 1
                     
-            except Exception as e:
-                logger.error(f"推送單條數據失敗: {str(e)}")
+                except Exception as e:
+                    logger.error(f"推送單條數據失敗: {str(e)}")
+        finally:
+            record_sent_ids(SENT_DATA_FILE, pushed_ids)
         
         logger.info(f"成功推送 {success_count}/{len(new_data)} 條極高重要性經濟數據")
         
@@ -2145,8 +2398,8 @@ def fetch_tree_news():
     headers = {"Authorization": TREE_API_KEY}
     
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        news_list = response.json()
+        response = HTTP_SESSION.get(url, params=params, headers=headers, timeout=10)
+        news_list = parse_json(response.content)
         
         # 取得前一次發送的最晚時間，避免重複
         last_time = load_json_file(LAST_NEWS_TIME_FILE, 0)
@@ -2173,14 +2426,10 @@ def fetch_coinglass_articles():
         return
     
     url = "https://open-api-v4.coinglass.com/api/article/list"
-    headers = {
-        "accept": "application/json",
-        "CG-API-KEY": CG_API_KEY
-    }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        result = response.json()
+        response = CG_SESSION.get(url, timeout=10)
+        result = parse_json(response.content)
         
         if result.get('code') != '0':
             error_msg = result.get('msg', '')
@@ -2194,8 +2443,8 @@ def fetch_coinglass_articles():
         article_list = result.get('data', [])
         
         # 取得已發送的新聞 ID 列表
-        sent_ids = load_json_file(COINGLASS_ARTICLE_IDS_FILE, [])
-        new_sent_ids = sent_ids.copy()
+        sent_ids = sent_id_set(COINGLASS_ARTICLE_IDS_FILE)
+        new_sent_ids = []
         
         # 處理新聞列表（由舊到新）
         for article in reversed(article_list):
@@ -2204,13 +2453,9 @@ def fetch_coinglass_articles():
             if article_id and article_id not in sent_ids:
                 process_and_send_coinglass(article, "article")
                 new_sent_ids.append(article_id)
-                
-                # 只保留最近 1000 條 ID，避免儲存過多
-                if len(new_sent_ids) > 1000:
-                    new_sent_ids = new_sent_ids[-1000:]
         
-        # 更新已發送 ID 列表
-        save_json_file(COINGLASS_ARTICLE_IDS_FILE, new_sent_ids)
+        # 更新已發送 ID 列表（只保留最近 1000 條 ID，避免儲存過多）
+        record_sent_ids(COINGLASS_ARTICLE_IDS_FILE, new_sent_ids)
         
     except Exception as e:
         logger.warning(f"CoinGlass 新聞抓取失敗: {str(e)}")
@@ -2223,20 +2468,16 @@ def fetch_coinglass_newsflash():
         return
     
     url = "https://open-api-v4.coinglass.com/api/newsflash/list"
-    headers = {
-        "accept": "application/json",
-        "CG-API-KEY": CG_API_KEY
-    }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = CG_SESSION.get(url, timeout=10)
         
         # 檢查 HTTP 狀態碼
         if response.status_code != 200:
-            logger.warning(f"CoinGlass 快訊 API HTTP 錯誤: {response.status_code} - {response.text[:200]}")
+            logger.warning(f"CoinGlass 快訊 API HTTP 錯誤: {response.status_code} - {body_preview(response, 200)}")
             return
         
-        result = response.json()
+        result = parse_json(response.content)
         
         if result.get('code') != '0':
             error_msg = result.get('msg', '')
@@ -2250,8 +2491,8 @@ def fetch_coinglass_newsflash():
         newsflash_list = result.get('data', [])
         
         # 取得已發送的快訊 ID 列表
-        sent_ids = load_json_file(COINGLASS_NEWSFLASH_IDS_FILE, [])
-        new_sent_ids = sent_ids.copy()
+        sent_ids = sent_id_set(COINGLASS_NEWSFLASH_IDS_FILE)
+        new_sent_ids = []
         
         # 處理快訊列表（由舊到新）
         for newsflash in reversed(newsflash_list):
@@ -2260,13 +2501,9 @@ def fetch_coinglass_newsflash():
             if newsflash_id and newsflash_id not in sent_ids:
                 process_and_send_coinglass(newsflash, "newsflash")
                 new_sent_ids.append(newsflash_id)
-                
-                # 只保留最近 1000 條 ID，避免儲存過多
-                if len(new_sent_ids) > 1000:
-                    new_sent_ids = new_sent_ids[-1000:]
         
-        # 更新已發送 ID 列表
-        save_json_file(COINGLASS_NEWSFLASH_IDS_FILE, new_sent_ids)
+        # 更新已發送 ID 列表（只保留最近 1000 條 ID，避免儲存過多）
+        record_sent_ids(COINGLASS_NEWSFLASH_IDS_FILE, new_sent_ids)
         
     except Exception as e:
         logger.warning(f"CoinGlass 快訊抓取失敗: {str(e)}")
@@ -2307,15 +2544,10 @@ def process_and_send_coinglass(item: Dict, type_str: str):
     time_val = item.get('time') or item.get('timestamp') or item.get('publishTime')
     if time_val:
         if isinstance(time_val, (int, float)):
-            if time_val > 1e12:
-                date = datetime.fromtimestamp(time_val / 1000, tz=timezone.utc)
-            else:
-                date = datetime.fromtimestamp(time_val, tz=timezone.utc)
+            date_str = format_epoch_taipei(time_val)
         else:
-            date = get_taipei_time()
-        # 轉換為台灣時間
-        date_taipei = get_taipei_time(date)
-        message += f"🕐 時間：{date_taipei.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            date_str = get_taipei_time().strftime('%Y-%m-%d %H:%M:%S')
+        message += f"🕐 時間：{date_str}\n"
     
     if item.get('source'):
         message += f"🔍 來源：{item.get('source')}\n"
@@ -2326,95 +2558,127 @@ def process_and_send_coinglass(item: Dict, type_str: str):
     send_telegram_message(message, TG_THREAD_IDS['news'])
 
 
-def fetch_all_news():
-    """整合執行函數：抓取所有新聞並濃縮成一個簡短訊息（每4小時推播一次）"""
-    all_news_items = []
-    
-    # 抓取 Tree of Alpha 新聞
+def _fetch_tree_news_items() -> List[Dict]:
+    """抓取 Tree of Alpha 最新5條新聞（已翻譯標題）"""
+    items = []
     try:
         url = "https://news.treeofalpha.com/api/news"
         params = {"limit": 5}  # 只取最新5條
         headers = {"Authorization": TREE_API_KEY}
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        news_list = response.json()
+        response = HTTP_SESSION.get(url, params=params, headers=headers, timeout=10)
+        news_list = parse_json(response.content)
         for news in news_list[:5]:  # 只取前5條
             title = translate_text(news.get('title', ''))
             if title:
-                all_news_items.append({
+                items.append({
                     'title': title,
                     'source': 'Tree of Alpha',
                     'url': news.get('url', '')
                 })
     except Exception as e:
         logger.warning(f"Tree of Alpha 新聞抓取失敗: {str(e)}")
-    
-    # 抓取 CoinGlass 新聞（只取最新3條）
-    if CG_API_KEY:
-        try:
-            url = "https://open-api-v4.coinglass.com/api/article/list"
-            headers = {
-                "accept": "application/json",
-                "CG-API-KEY": CG_API_KEY
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            result = response.json()
-            if result.get('code') == '0':
-                article_list = result.get('data', [])[:3]  # 只取前3條
-                for article in article_list:
-                    title = translate_text(article.get('title') or article.get('headline') or "")
-                    if title:
-                        all_news_items.append({
-                            'title': title,
-                            'source': 'CoinGlass',
-                            'url': article.get('url') or article.get('link') or ''
-                        })
-        except Exception as e:
-            logger.warning(f"CoinGlass 新聞抓取失敗: {str(e)}")
+    return items
+
+
+def _fetch_coinglass_news_items() -> List[Dict]:
+    """抓取 CoinGlass 最新3條文章（已翻譯標題）"""
+    items = []
+    if not CG_API_KEY:
+        return items
+    try:
+        url = "https://open-api-v4.coinglass.com/api/article/list"
+        response = CG_SESSION.get(url, timeout=10)
+        result = parse_json(response.content)
+        if result.get('code') == '0':
+            article_list = result.get('data', [])[:3]  # 只取前3條
+            for article in article_list:
+                title = translate_text(article.get('title') or article.get('headline') or "")
+                if title:
+                    items.append({
+                        'title': title,
+                        'source': 'CoinGlass',
+                        'url': article.get('url') or article.get('link') or ''
+                    })
+    except Exception as e:
+        logger.warning(f"CoinGlass 新聞抓取失敗: {str(e)}")
+    return items
+
+
+# 新聞快訊摘要的固定段落
+_NEWS_DIGEST_TEMPLATE = (
+    "📰 *【全球幣圈即時快訊】*\n"
+    "━━━━━━━━━━━━━━━━━━━━\n"
+    "\n"
+    "{news_block}"
+    "━━━━━━━━━━━━━━━━━━━━\n"
+    "⏰ 更新時間：{time_str}"
+)
+
+
+def fetch_all_news():
+    """整合執行函數：抓取所有新聞並濃縮成一個簡短訊息（每4小時推播一次）"""
+    # 兩個來源互相獨立，並行抓取與翻譯；仍依 Tree of Alpha、CoinGlass 的順序合併
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        tree_future = executor.submit(_fetch_tree_news_items)
+        coinglass_future = executor.submit(_fetch_coinglass_news_items)
+        news_items = tree_future.result() + coinglass_future.result()
+    
+    # 不同來源常轉載同一則標題，只保留第一次出現的
+    seen_titles = set()
+    all_news_items = []
+    for item in news_items:
+        if item['title'] not in seen_titles:
+            seen_titles.add(item['title'])
+            all_news_items.append(item)
     
     # 如果沒有新聞，不推播
     if not all_news_items:
         logger.info("本次監控無新新聞，跳過推播")
         return
     
-    # 濃縮成一個簡短訊息
-    now = get_taipei_time()
-    time_str = format_datetime(now)
-    
-    lines = []
-    lines.append("📰 *【全球幣圈即時快訊】*")
-    lines.append("━━━━━━━━━━━━━━━━━━━━")
-    lines.append("")
-    
-    # 只顯示標題，簡短格式
-    for idx, item in enumerate(all_news_items[:8], 1):  # 最多8條
-        lines.append(f"{idx}. {item['title']}")
-        if item.get('url'):
-            lines.append(f"   🔗 [查看詳情]({item['url']})")
-        lines.append("")
-    
-    lines.append("━━━━━━━━━━━━━━━━━━━━")
-    lines.append(f"⏰ 更新時間：{time_str}")
-    
-    message = "\n".join(lines)
+    # 濃縮成一個簡短訊息：只顯示標題，簡短格式，最多8條
+    news_block = "".join(
+        f"{idx}. {item['title']}\n"
+        + (f"   🔗 [查看詳情]({item['url']})\n" if item.get('url') else "")
+        + "\n"
+        for idx, item in enumerate(all_news_items[:8], 1)
+    )
+    message = _NEWS_DIGEST_TEMPLATE.format(news_block=news_block, time_str=format_datetime(get_taipei_time()))
     send_telegram_message(message, TG_THREAD_IDS['news'], parse_mode="Markdown")
     logger.info(f"新聞快訊推播完成，共 {len(all_news_items)} 條新聞")
 
 
 # ==================== 6. 資金費率 ====================
 
+# 資金費率排行榜的固定段落
+_FUNDING_HEADER = (
+    "🏦 *【U本位資金費率排行榜】*\n"
+    "━━━━━━━━━━━━━━━━━━━━\n"
+    "*以持倉 10,000 USDT 為例，每 4 小時結算一次：*\n\n"
+)
+_FUNDING_ROW_TEMPLATE = (
+    "{index}. 💰 *{symbol}USDT 永續*\n"
+    "   📊 資金費率：`{sign}{rate_percent}%`\n"
+    "   💵 單次領取：`${single_pay}` USDT\n"
+    "━━━━━━━━━━━━━━━━━━━━\n"
+)
+_FUNDING_FOOTER = (
+    "\n💡 *套利策略*：\n"
+    "*正費率（+）*：做空永續 + 持有現貨，每 4 小時領取資金費率。\n"
+    "*負費率（-）*：做多永續 + 賣出現貨，但需注意軋空風險。\n\n"
+    "📊 數據來源：[幣安U本位](https://www.binance.com/zh-TC/futures/funding-history/perpetual/real-time-funding-rate)\n"
+)
+
+
 def fetch_funding_fortune_list():
     """抓取資金費率排行榜"""
     url = "https://open-api-v4.coinglass.com/api/futures/funding-rate/exchange-list"
-    headers = {
-        "accept": "application/json",
-        "CG-API-KEY": CG_API_KEY
-    }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = CG_SESSION.get(url, timeout=10)
         logger.info(f"API 回應狀態碼: {response.status_code}")
         
-        result = response.json()
+        result = parse_json(response.content)
         if result.get('code') not in ['0', 0]:
             logger.error(f"API 回應錯誤: {result}")
             return
@@ -2425,75 +2689,71 @@ def fetch_funding_fortune_list():
             return
         
         binance_funding_rates = []
+        seen_usdt = set()  # 已有 USDT 永續數據的幣種
         for coin_data in data_list:
             symbol = coin_data.get('symbol')
             
             # 優先處理 USDT 永續合約
             stablecoin_list = coin_data.get('stablecoin_margin_list', [])
             for item in stablecoin_list:
-                if item.get('exchange') == 'Binance' and item.get('funding_rate') is not None:
-                    binance_funding_rates.append({
-                        'symbol': symbol,
-                        'exchange': item.get('exchange'),
-                        'fundingRate': float(item.get('funding_rate', 0)),
-                        'marginType': 'USDT永續',
-                        'fundingRateInterval': item.get('funding_rate_interval', 8)
-                    })
+                funding_rate = item.get('funding_rate')
+                if funding_rate is None or item.get('exchange') != 'Binance':
+                    continue
+                binance_funding_rates.append({
+                    'symbol': symbol,
+                    'exchange': 'Binance',
+                    'fundingRate': float(funding_rate),
+                    'marginType': 'USDT永續',
+                    'fundingRateInterval': item.get('funding_rate_interval', 8)
+                })
+                seen_usdt.add(symbol)
             
             # 如果 USDT 永續沒有幣安的數據，再檢查幣本位永續
             token_list = coin_data.get('token_margin_list', [])
             for item in token_list:
-                if item.get('exchange') == 'Binance' and item.get('funding_rate') is not None:
-                    has_usdt = any(r['symbol'] == symbol and r['marginType'] == 'USDT永續' 
-                                   for r in binance_funding_rates)
-                    if not has_usdt:
-                        binance_funding_rates.append({
-                            'symbol': symbol,
-                            'exchange': item.get('exchange'),
-                            'fundingRate': float(item.get('funding_rate', 0)),
-                            'marginType': '幣本位永續',
-                            'fundingRateInterval': item.get('funding_rate_interval', 8)
-                        })
+                funding_rate = item.get('funding_rate')
+                if funding_rate is None or item.get('exchange') != 'Binance':
+                    continue
+                if symbol not in seen_usdt:
+                    binance_funding_rates.append({
+                        'symbol': symbol,
+                        'exchange': 'Binance',
+                        'fundingRate': float(funding_rate),
+                        'marginType': '幣本位永續',
+                        'fundingRateInterval': item.get('funding_rate_interval', 8)
+                    })
         
         logger.info(f"幣安永續合約數據條數: {len(binance_funding_rates)}")
         
         # 根據費率絕對值排序，取前 5 名
-        sorted_data = sorted(
-            [item for item in binance_funding_rates if item['fundingRate'] != 0],
-            key=lambda x: abs(x['fundingRate']),
-            reverse=True
-        )[:5]
+        sorted_data = heapq.nlargest(
+            5,
+            (item for item in binance_funding_rates if item['fundingRate'] != 0),
+            key=lambda x: abs(x['fundingRate'])
+        )
         
         if not sorted_data:
             logger.warning("未找到幣安永續合約的有效資金費率數據")
             return
         
         # 構建訊息
-        message = "🏦 *【U本位資金費率排行榜】*\n"
-        message += "━━━━━━━━━━━━━━━━━━━━\n"
-        message += "*以持倉 10,000 USDT 為例，每 4 小時結算一次：*\n\n"
-        
-        for index, item in enumerate(sorted_data):
-            symbol = item['symbol']
+        rows = []
+        for index, item in enumerate(sorted_data, 1):
             rate = item['fundingRate']
-            
-            rate_percent = f"{abs(rate):.6f}"
-            rate_display = f"+{rate_percent}%" if rate >= 0 else f"-{rate_percent}%"
-            
-            rate_for_calculation = abs(rate) / 100
-            single_pay = f"{10000 * 0.4 * rate_for_calculation:.2f}"
-            
-            message += f"{index + 1}. 💰 *{symbol}USDT 永續*\n"
-            message += f"   📊 資金費率：`{rate_display}`\n"
-            message += f"   💵 單次領取：`${single_pay}` USDT\n"
-            message += "━━━━━━━━━━━━━━━━━━━━\n"
-        
-        message += "\n💡 *套利策略*：\n"
-        message += "*正費率（+）*：做空永續 + 持有現貨，每 4 小時領取資金費率。\n"
-        message += "*負費率（-）*：做多永續 + 賣出現貨，但需注意軋空風險。\n\n"
-        message += "📊 數據來源：[幣安U本位](https://www.binance.com/zh-TC/futures/funding-history/perpetual/real-time-funding-rate)\n"
-        now_taipei = get_taipei_time()
-        message += f"⏰ 更新時間：{now_taipei.strftime('%Y-%m-%d %H:%M:%S')}"
+            abs_rate = abs(rate)
+            rows.append(_FUNDING_ROW_TEMPLATE.format(
+                index=index,
+                symbol=item['symbol'],
+                sign="+" if rate >= 0 else "-",
+                rate_percent=f"{abs_rate:.6f}",
+                single_pay=f"{10000 * 0.4 * (abs_rate / 100):.2f}",
+            ))
+        message = (
+            _FUNDING_HEADER
+            + "".join(rows)
+            + _FUNDING_FOOTER
+            + f"⏰ 更新時間：{get_taipei_time().strftime('%Y-%m-%d %H:%M:%S')}"
+        )
         
         send_telegram_message(message, TG_THREAD_IDS['funding_rate'])
         
@@ -2503,27 +2763,63 @@ def fetch_funding_fortune_list():
 
 # ==================== 7. 長線指標：牛熊導航儀 ====================
 
+# 日級／小時級更新的指數端點快取秒數（未列出的端點不快取）
+CG_CACHE_TTL = {
+    "/api/index/ahr999": 3600,
+    "/api/index/bitcoin/rainbow-chart": 3600,
+    "/api/index/pi-cycle-indicator": 3600,
+    "/api/index/fear-greed-history": 1800,
+    "/api/index/altcoin-season": 3600,
+}
+_CG_CACHE: Dict[tuple, tuple] = {}  # (path, 參數) -> (到期時間, 回應)
+_CG_CACHE_LOCK = threading.Lock()
+
+
+def _cg_cache_key(path: str, params: Optional[Dict]) -> tuple:
+    """快取鍵：路徑 + 排序後的參數"""
+    return (path, tuple(sorted((params or {}).items())))
+
+
+def _cg_cache_get(path: str, params: Optional[Dict]) -> Optional[Dict]:
+    """取得未過期的快取回應（沒有時返回 None）"""
+    if path not in CG_CACHE_TTL:
+        return None
+    with _CG_CACHE_LOCK:
+        entry = _CG_CACHE.get(_cg_cache_key(path, params))
+    if entry and time.monotonic() < entry[0]:
+        return entry[1]
+    return None
+
+
+def _cg_cache_put(path: str, params: Optional[Dict], data: Dict) -> None:
+    """保存成功的回應（只快取 CG_CACHE_TTL 中列出的端點）"""
+    ttl = CG_CACHE_TTL.get(path)
+    if ttl:
+        with _CG_CACHE_LOCK:
+            _CG_CACHE[_cg_cache_key(path, params)] = (time.monotonic() + ttl, data)
+
+
 def _coinglass_get(path: str, params: Optional[Dict] = None) -> Optional[Dict]:
-    """通用的 CoinGlass GET 請求工具"""
+    """通用的 CoinGlass GET 請求工具（指數類端點帶 TTL 快取）"""
     if not CG_API_KEY:
         logger.error("CG_API_KEY 未設定，無法呼叫 CoinGlass API")
         return None
+    cached = _cg_cache_get(path, params)
+    if cached is not None:
+        return cached
     url = f"{CG_API_BASE}{path}"
-    headers = {
-        "accept": "application/json",
-        "CG-API-KEY": CG_API_KEY,
-    }
     try:
-        resp = requests.get(url, headers=headers, params=params or {}, timeout=10)
+        resp = CG_SESSION.get(url, params=params or {}, timeout=10)
         if resp.status_code != 200:
-            logger.error(f"CoinGlass API HTTP 錯誤 {path}: {resp.status_code} - {resp.text[:200]}")
+            logger.error(f"CoinGlass API HTTP 錯誤 {path}: {resp.status_code} - {body_preview(resp, 200)}")
             return None
-        data = resp.json()
+        data = parse_json(resp.content)
         # 多數 CoinGlass 介面 code 為 '0' 代表成功
         code = data.get("code", 0)
-        if code not in [0, "0", 200, "200"]:
+        if code not in _OK_CODES:
             logger.error(f"CoinGlass API 返回錯誤 {path}: {data}")
             return None
+        _cg_cache_put(path, params, data)
         return data
     except Exception as e:
         logger.error(f"CoinGlass API 請求失敗 {path}: {str(e)}")
@@ -2566,16 +2862,21 @@ def fetch_ahr999_index() -> Optional[float]:
         return None
     # 嘗試多個常見欄位名稱（包含實際 API 回傳的 ahr999_value）
     for key in ("ahr999_value", "ahr999", "ahr999_index", "ahrIndex", "ahr_value"):
-        val = point.get(key)
+        val = to_float(point.get(key))
         if val is not None:
-            try:
-                return float(val)
-            except (TypeError, ValueError):
-                continue
+            return val
     logger.warning(f"Ahr999 結構未知，原始資料: {point}")
     return None
 
 
+# 彩虹圖區段描述：低位 / 中位 / 高位
+_RAINBOW_STAGES = (
+    "價格位於彩虹圖低位區，適合長線累積/分批加倉",
+    "價格位於彩虹圖中間區，屬於合理區間，偏向持有/觀望",
+    "價格位於彩虹圖高位區，市場偏 FOMO/泡沫，需謹慎控管風險",
+)
+
+
 def get_rainbow_stage(price: Optional[float], levels: Optional[List[float]]) -> str:
     """
     根據當前價格與彩虹圖價格閾值，回傳文字描述。
@@ -2595,24 +2896,14 @@ def get_rainbow_stage(price: Optional[float], levels: Optional[List[float]]) ->
     if price > levels[-1]:
         return "最大泡沫區，建議分批逃頂、降低槓桿"
 
-    # 落在區間中，找到對應區段
-    idx = 0
-    for i in range(len(levels) - 1):
-        if levels[i] <= price < levels[i + 1]:
-            idx = i
-            break
+    # 落在區間中，二分搜尋找到對應區段（價格等於最高閾值時歸入最後一段）
+    n = len(levels) - 1  # 有 n 個區間
+    idx = min(bisect.bisect_right(levels, price) - 1, n - 1)
 
     # 依照所在區段粗分為「低位 / 中位 / 高位」
-    n = len(levels) - 1  # 有 n 個區間
     low_border = n // 3
     high_border = (2 * n) // 3
-
-    if idx <= low_border:
-        return "價格位於彩虹圖低位區，適合長線累積/分批加倉"
-    elif idx <= high_border:
-        return "價格位於彩虹圖中間區，屬於合理區間，偏向持有/觀望"
-    else:
-        return "價格位於彩虹圖高位區，市場偏 FOMO/泡沫，需謹慎控管風險"
+    return _RAINBOW_STAGES[(idx > low_border) + (idx > high_border)]
 
 
 def fetch_rainbow_zone() -> Optional[str]:
@@ -2639,12 +2930,12 @@ def fetch_rainbow_zone() -> Optional[str]:
             # 嘗試視最後一個元素為時間戳，其餘為價格閾值
             numeric_parts = [x for x in last_row if isinstance(x, (int, float))]
             if len(numeric_parts) >= 4:
+                max_val = max(numeric_parts)
                 # 若尚未取得價格，使用最大值當前價格作為近似
                 if price is None:
-                    price = max(numeric_parts)
+                    price = max_val
                 # 取除當前價格外較小的那些作為「層級」，避免把極端最大值當作區間
                 # 這裡簡化為去掉數列中的最大值，其餘視為彩虹層級
-                max_val = max(numeric_parts)
                 levels = [v for v in numeric_parts if v != max_val] or numeric_parts
 
     return get_rainbow_stage(price, levels)
@@ -2687,14 +2978,11 @@ def fetch_pi_cycle_signal() -> bool:
         or point.get("slow_ma")
         or point.get("ma_350_mu_2")
     )
+    short_ma = to_float(short_ma)
+    long_ma = to_float(long_ma)
     if short_ma is not None and long_ma is not None:
-        try:
-            short_ma = float(short_ma)
-            long_ma = float(long_ma)
-            # 只要短均線高於長均線，視為有頂部風險
-            return short_ma >= long_ma
-        except (TypeError, ValueError):
-            pass
+        # 只要短均線高於長均線，視為有頂部風險
+        return short_ma >= long_ma
 
     logger.warning(f"Pi 循環指標結構未知，原始資料: {point}")
     return False
@@ -2711,38 +2999,33 @@ def fetch_latest_fear_greed() -> Optional[int]:
     if isinstance(point, dict) and "data_list" in point:
         data_list = point.get("data_list")
         if isinstance(data_list, list) and data_list:
-            try:
-                return int(float(data_list[-1]))
-            except (TypeError, ValueError):
+            val = to_float(data_list[-1])
+            if val is None or not math.isfinite(val):
                 logger.warning(f"無法解析恐懼與貪婪 data_list 最後一筆數值: {data_list[-1]}")
                 return None
+            return int(val)
 
     # 2) 傳統結構：每筆是一個 dict，含 value / score 等欄位
     if isinstance(point, dict):
         for key in ("value", "fear_greed", "score", "index"):
-            val = point.get(key)
-            if val is not None:
-                try:
-                    return int(float(val))
-                except (TypeError, ValueError):
-                    continue
+            val = to_float(point.get(key))
+            if val is not None and math.isfinite(val):
+                return int(val)
 
     logger.warning(f"恐懼與貪婪指數結構未知，原始資料: {point}")
     return None
 
 
+# 恐懼貪婪分級：<=20 極度恐懼、<=40 恐懼、<60 中性、<=80 貪婪、其餘極度貪婪
+_FG_LOWER = (60,)
+_FG_UPPER = (20, 40, 80)
+_FG_LABELS = ("極度恐懼", "恐懼", "中性", "貪婪", "極度貪婪")
+
+
 def _classify_fear_greed(value: Optional[int]) -> str:
     if value is None:
         return "未知"
-    if value <= 20:
-        return "極度恐懼"
-    if value <= 40:
-        return "恐懼"
-    if value < 60:
-        return "中性"
-    if value <= 80:
-        return "貪婪"
-    return "極度貪婪"
+    return _FG_LABELS[_bucket(value, _FG_LOWER, _FG_UPPER)]
 
 
 def _describe_fear_greed(value: Optional[int]) -> str:
@@ -2758,26 +3041,74 @@ def _describe_fear_greed(value: Optional[int]) -> str:
     return "情緒尚未到極端區間，建議搭配 Ahr999 與彩虹圖一起綜合判斷。"
 
 
+# 彩虹圖英文區間關鍵字 -> 中文說明（依序比對，先命中者優先）
+_RAINBOW_ZONE_RULES = (
+    (re.compile(r"buy|cheap|accumulate|bargain|btfd"), "（還在加倉區，長線偏便宜）"),
+    (re.compile(r"hodl|hold"), "（長線持有區，耐心抱緊）"),
+    (re.compile(r"fomo|sell|bubble|maximum|overvalued"), "（偏泡沫/高估區，適合減倉風險控管）"),
+)
+
+
 def _interpret_rainbow_zone(zone: Optional[str]) -> str:
     """把彩虹圖的英文區間翻成小白友善描述"""
     if not zone:
         return "資料不足，暫無法判斷"
     z = zone.lower()
-    if any(k in z for k in ["buy", "cheap", "accumulate", "bargain", "btfd"]):
-        return f"{zone}（還在加倉區，長線偏便宜）"
-    if any(k in z for k in ["hodl", "hold"]):
-        return f"{zone}（長線持有區，耐心抱緊）"
-    if any(k in z for k in ["fomo", "sell", "bubble", "maximum", "overvalued"]):
-        return f"{zone}（偏泡沫/高估區，適合減倉風險控管）"
+    for pattern, note in _RAINBOW_ZONE_RULES:
+        if pattern.search(z):
+            return f"{zone}{note}"
     return zone
 
 
+# Ahr999 分級：< 0.45 特價抄底期、<= 1.2 定投區、其餘高估區
+_AHR999_LOWER = (0.45,)
+_AHR999_UPPER = (1.2,)
+# (狀態, 操作狀態, 風險提示, 船長建議)
+_AHR999_TIERS = (
+    ("特價抄底期", "抄底中",
+     "目前長線風險偏低，屬於「特價抄底期」，但仍需分批布局、嚴守風險。",
+     "這裡屬於長線黃金區間，可以考慮分批逢低佈局，比特幣為主、山寨為輔。"),
+    ("定投區", "定投中",
+     "目前估值合理偏便宜，「適合定投」區間，風險與報酬相對均衡。",
+     "建議啟動/維持固定週期定投策略，不為短期波動情緒化。"),
+    ("高估區", "謹慎觀望",
+     "目前估值偏貴，屬於高估區，若再疊加情緒過熱，需謹慎面對回撤風險。",
+     "不建議重倉追高，可考慮只小額試單，或等待更友善的估值再進場。"),
+)
+
+
+# 牛熊導航儀訊息的固定段落
+_LONG_TERM_TEMPLATE = (
+    "📊 *【牛熊導航儀】*\n"
+    "━━━━━━━━━━━━━━━━━━━━\n"
+    "\n"
+    "🌡️ *市場情緒*：{mood}\n"
+    "💰 *Ahr999*：{ahr_status}\n"
+    "🌈 *彩虹圖*：{rainbow_desc}\n"
+    "\n"
+    "🎯 *今天操作方向建議*：\n"
+    "{direction}\n"
+    "\n"
+    "🚨 *風險提示*：{risk_text}\n"
+    "\n"
+    "💡 *操作建議*：{advice_text}\n"
+    "\n"
+    "⏰ 更新時間：{now_str}"
+)
+
+
 def build_long_term_message() -> Optional[str]:
     """抓取並分析長線指標，組成 Telegram Markdown 推播內容"""
-    ahr = fetch_ahr999_index()
-    rainbow_zone = fetch_rainbow_zone()
-    pi_trigger = fetch_pi_cycle_signal()
-    fg = fetch_latest_fear_greed()
+    # 四個指標互相獨立，並行抓取
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        ahr_future = executor.submit(fetch_ahr999_index)
+        rainbow_future = executor.submit(fetch_rainbow_zone)
+        pi_future = executor.submit(fetch_pi_cycle_signal)
+        fg_future = executor.submit(fetch_latest_fear_greed)
+        ahr = ahr_future.result()
+        rainbow_zone = rainbow_future.result()
+        pi_trigger = pi_future.result()
+        fg = fg_future.result()
 
     if ahr is None and fg is None and not rainbow_zone:
         logger.error("長線指標資料皆取得失敗，放棄推播")
@@ -2786,16 +3117,10 @@ def build_long_term_message() -> Optional[str]:
     # Ahr999 區間判斷
     ahr_status = "未知"
     ahr_state = "資料不足"
+    ahr_tier = None
     if ahr is not None:
-        if ahr < 0.45:
-            ahr_status = "特價抄底期"
-            ahr_state = "抄底中"
-        elif ahr <= 1.2:
-            ahr_status = "定投區"
-            ahr_state = "定投中"
-        else:
-            ahr_status = "高估區"
-            ahr_state = "謹慎觀望"
+        ahr_tier = _AHR999_TIERS[_bucket(ahr, _AHR999_LOWER, _AHR999_UPPER)]
+        ahr_status, ahr_state = ahr_tier[0], ahr_tier[1]
 
     # 恐懼貪婪
     fg_mood = _classify_fear_greed(fg)
@@ -2810,16 +3135,8 @@ def build_long_term_message() -> Optional[str]:
     risk_text = "資料不足，暫無法評估風險。"
     advice_text = "請先確認指標資料是否正常取得，再做決策。"
 
-    if ahr is not None:
-        if ahr < 0.45:
-            risk_text = "目前長線風險偏低，屬於「特價抄底期」，但仍需分批布局、嚴守風險。"
-            advice_text = "這裡屬於長線黃金區間，可以考慮分批逢低佈局，比特幣為主、山寨為輔。"
-        elif ahr <= 1.2:
-            risk_text = "目前估值合理偏便宜，「適合定投」區間，風險與報酬相對均衡。"
-            advice_text = "建議啟動/維持固定週期定投策略，不為短期波動情緒化。"
-        else:
-            risk_text = "目前估值偏貴，屬於高估區，若再疊加情緒過熱，需謹慎面對回撤風險。"
-            advice_text = "不建議重倉追高，可考慮只小額試單，或等待更友善的估值再進場。"
+    if ahr_tier is not None:
+        risk_text, advice_text = ahr_tier[2], ahr_tier[3]
 
     # 疊加情緒與 Pi 頂部信號調整建議
     if fg is not None:
@@ -2837,70 +3154,52 @@ def build_long_term_message() -> Optional[str]:
 
     now_str = format_datetime(get_taipei_time())
 
-    msg_lines = []
-    msg_lines.append("📊 *【牛熊導航儀】*")
-    msg_lines.append("━━━━━━━━━━━━━━━━━━━━")
-    msg_lines.append("")
-
-    # 市場情緒（白話）
-    if fg is not None:
-        msg_lines.append(f"🌡️ *市場情緒*：{fg_mood}（{fg}分）")
-    else:
-        msg_lines.append("🌡️ *市場情緒*：資料暫缺")
-
-    # Ahr999（白話）
-    if ahr is not None:
-        msg_lines.append(f"💰 *Ahr999*：{ahr_status}")
-    else:
-        msg_lines.append("💰 *Ahr999*：資料暫缺")
-
-    # 彩虹圖（白話）
-    msg_lines.append(f"🌈 *彩虹圖*：{rainbow_desc}")
-
-    # 今天操作方向建議（新增）
-    msg_lines.append("")
-    msg_lines.append("🎯 *今天操作方向建議*：")
-    
-    # 根據指標綜合判斷操作方向
+    # 根據指標綜合判斷今天操作方向
     if ahr is not None and fg is not None:
         if ahr < 0.45 and fg < 30:
-            msg_lines.append("✅ 建議：分批做多，適合抄底")
+            direction = "✅ 建議：分批做多，適合抄底"
         elif ahr < 1.2 and fg < 60:
-            msg_lines.append("✅ 建議：可以考慮做多，但需謹慎")
+            direction = "✅ 建議：可以考慮做多，但需謹慎"
         elif ahr > 1.2 and fg > 70:
-            msg_lines.append("⚠️ 建議：謹慎做空，注意風險")
+            direction = "⚠️ 建議：謹慎做空，注意風險"
         elif pi_trigger and fg > 75:
-            msg_lines.append("⚠️ 建議：減倉觀望，等待回調")
+            direction = "⚠️ 建議：減倉觀望，等待回調"
         else:
-            msg_lines.append("➡️ 建議：保持觀望，等待明確信號")
+            direction = "➡️ 建議：保持觀望，等待明確信號"
     elif ahr is not None:
         if ahr < 0.45:
-            msg_lines.append("✅ 建議：可以考慮做多")
+            direction = "✅ 建議：可以考慮做多"
         elif ahr > 1.2:
-            msg_lines.append("⚠️ 建議：謹慎做空")
+            direction = "⚠️ 建議：謹慎做空"
         else:
-            msg_lines.append("➡️ 建議：保持觀望")
+            direction = "➡️ 建議：保持觀望"
     else:
-        msg_lines.append("➡️ 建議：資料不足，保持觀望")
+        direction = "➡️ 建議：資料不足，保持觀望"
 
-    # 簡化的風險提示
-    msg_lines.append("")
-    msg_lines.append(f"🚨 *風險提示*：{risk_text}")
+    return _LONG_TERM_TEMPLATE.format_map({
+        # 市場情緒、Ahr999、彩虹圖（白話）
+        'mood': f"{fg_mood}（{fg}分）" if fg is not None else "資料暫缺",
+        'ahr_status': ahr_status if ahr is not None else "資料暫缺",
+        'rainbow_desc': rainbow_desc,
+        'direction': direction,
+        'risk_text': risk_text,
+        'advice_text': advice_text,
+        'now_str': now_str,
+    })
 
-    # 簡化的船長建議
-    msg_lines.append("")
-    msg_lines.append(f"💡 *操作建議*：{advice_text}")
-    msg_lines.append("")
-    msg_lines.append(f"⏰ 更新時間：{now_str}")
 
-    return "\n".join(msg_lines)
+# 長線指標抓取失敗時的重試間隔（秒）
+LONG_TERM_RETRY_SEC = 60
 
 
 def run_long_term_monitor(interval_hours: int = 4):
     """24 小時常駐，每 interval_hours 小時抓取並推播一次"""
     logger.info(f"啟動長線指標監控，每 {interval_hours} 小時更新一次...")
     interval_sec = max(1, int(interval_hours * 3600))
+    next_tick = time.monotonic()
     while True:
+        # 以固定節拍排程：下一輪時間從本輪開始起算，抓取耗時不會累積成漂移
+        next_tick += interval_sec
         try:
             message = build_long_term_message()
             if message:
@@ -2908,10 +3207,14 @@ def run_long_term_monitor(interval_hours: int = 4):
                 send_telegram_message(message, thread_id, parse_mode="Markdown")
             else:
                 logger.warning("本輪長線指標分析失敗，未發送推播")
+                next_tick = min(next_tick, time.monotonic() + LONG_TERM_RETRY_SEC)
         except Exception as e:
             logger.error(f"長線指標監控執行錯誤: {str(e)}")
-        # 休息 interval
-        time.sleep(interval_sec)
+            # 暫時性錯誤不必等滿整個週期，稍後重試
+            next_tick = min(next_tick, time.monotonic() + LONG_TERM_RETRY_SEC)
+        time.sleep(max(0.0, next_tick - time.monotonic()))
+        # 落後超過一個週期（例如系統休眠）時從現在重新起算，避免連續補跑
+        next_tick = max(next_tick, time.monotonic())
 
 
 def run_long_term_once():
@@ -2931,7 +3234,8 @@ LIQ_SYMBOLS = [
     "BTC", "ETH", "SOL",  # 只偵測這三個主流幣種
 ]
 LIQ_EXCHANGE_LIST = "Binance"
-LIQ_REQUEST_DELAY = 1.2  # 秒
+# 只統計最近 24 小時：1h K 線最多 25 根落在視窗內（含當前未收盤的一根）
+LIQ_HISTORY_LIMIT = 25
 
 
 def get_liquidation_threshold(symbol: str, time_window: str = "1h") -> tuple:
@@ -2957,19 +3261,16 @@ def fetch_liquidation_data(symbol: str) -> Optional[List[Dict]]:
         "symbol": symbol,
         "interval": "1h",
         "exchange_list": LIQ_EXCHANGE_LIST,
-    }
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "accept": "application/json",
+        "limit": LIQ_HISTORY_LIMIT,
     }
 
     try:
-        resp = requests.get(url, params=params, headers=headers, timeout=10)
+        resp = CG_SESSION.get(url, params=params, timeout=10)
         if resp.status_code != 200:
             logger.warning(f"{symbol} 清算 API 請求失敗，狀態碼: {resp.status_code}")
             return None
 
-        data = resp.json()
+        data = parse_json(resp.content)
         if not (data.get("success") is True or data.get("code") in (0, "0")):
             logger.warning(
                 f"{symbol} 清算 API 返回失敗 - code: {data.get('code')}, msg: {data.get('msg')}"
@@ -2982,9 +3283,10 @@ def fetch_liquidation_data(symbol: str) -> Optional[List[Dict]]:
             return None
         
         # 調試：檢查數據結構（只對前幾個幣種）
-        if symbol in ["BTC", "ETH", "SOL"] and data_array:
-            sample = data_array[-1] if data_array else {}
-            logger.debug(f"{symbol} API返回 - 數據筆數: {len(data_array)}, 最新一筆時間戳: {sample.get('time')}, 欄位: {list(sample.keys())[:8]}")
+        if symbol in ["BTC", "ETH", "SOL"] and data_array and logger.isEnabledFor(logging.DEBUG):
+            sample = data_array[-1]
+            logger.debug("%s API返回 - 數據筆數: %d, 最新一筆時間戳: %s, 欄位: %s",
+                         symbol, len(data_array), sample.get('time'), list(sample.keys())[:8])
         
         return data_array
     except Exception as e:
@@ -2992,11 +3294,16 @@ def fetch_liquidation_data(symbol: str) -> Optional[List[Dict]]:
         return None
 
 
+# 清算金額欄位（依優先順序）
+_LIQ_LONG_KEYS = ("aggregated_long_liquidation_usd", "long_liquidation_usd", "long")
+_LIQ_SHORT_KEYS = ("aggregated_short_liquidation_usd", "short_liquidation_usd", "short")
+
+
 def process_liquidation_data(symbol: str, data_array: List[Dict]) -> Optional[Dict]:
     """處理清算數據，判斷是否達到極端爆倉門檻，返回事件描述（改進版：修復時間戳處理）"""
     try:
         if not data_array:
-            logger.debug(f"{symbol} 清算數據為空")
+            logger.debug("%s 清算數據為空", symbol)
             return None
 
         now_ms = int(time.time() * 1000)
@@ -3009,9 +3316,10 @@ def process_liquidation_data(symbol: str, data_array: List[Dict]) -> Optional[Di
         sell_vol_usd_1h = 0.0
 
         # 調試：檢查數據結構（只對前幾個幣種）
-        if symbol in ["BTC", "ETH", "SOL"] and data_array:
-            sample_item = data_array[-1] if data_array else {}
-            logger.debug(f"{symbol} 數據樣本 - 時間戳: {sample_item.get('time')}, 欄位: {list(sample_item.keys())[:5]}")
+        if symbol in ["BTC", "ETH", "SOL"] and logger.isEnabledFor(logging.DEBUG):
+            sample_item = data_array[-1]
+            logger.debug("%s 數據樣本 - 時間戳: %s, 欄位: %s",
+                         symbol, sample_item.get('time'), list(sample_item.keys())[:5])
 
         # 從後往前遍歷，累加最近 24 小時與 1 小時的清算
         items_in_24h = 0
@@ -3032,37 +3340,39 @@ def process_liquidation_data(symbol: str, data_array: List[Dict]) -> Optional[Di
                     item_time = item_time * 1000
                 
             except (TypeError, ValueError) as e:
-                logger.debug(f"{symbol} 時間戳解析失敗: {item_time_raw}, 錯誤: {str(e)}")
+                logger.debug("%s 時間戳解析失敗: %s, 錯誤: %s", symbol, item_time_raw, e)
                 continue
 
-            long_liq = float(item.get("aggregated_long_liquidation_usd") or item.get("long_liquidation_usd") or item.get("long") or 0)
-            short_liq = float(item.get("aggregated_short_liquidation_usd") or item.get("short_liquidation_usd") or item.get("short") or 0)
+            # 數據按時間排序，一旦早於 24 小時窗口即可停止，不必再解析金額
+            if item_time < twenty_four_hours_ago:
+                break
 
-            if item_time >= twenty_four_hours_ago:
-                items_in_24h += 1
-                buy_vol_usd_24h += long_liq
-                sell_vol_usd_24h += short_liq
+            long_liq = float(first_truthy(item, _LIQ_LONG_KEYS, 0))
+            short_liq = float(first_truthy(item, _LIQ_SHORT_KEYS, 0))
 
-                if item_time >= one_hour_ago:
-                    items_in_1h += 1
-                    buy_vol_usd_1h += long_liq
-                    sell_vol_usd_1h += short_liq
-            else:
-                break
+            items_in_24h += 1
+            buy_vol_usd_24h += long_liq
+            sell_vol_usd_24h += short_liq
+
+            if item_time >= one_hour_ago:
+                items_in_1h += 1
+                buy_vol_usd_1h += long_liq
+                sell_vol_usd_1h += short_liq
 
         # 調試日誌（只對前幾個幣種或當數據異常時）
         if symbol in ["BTC", "ETH", "SOL"] or (items_in_1h == 0 and items_in_24h > 0):
-            logger.debug(f"{symbol} 時間範圍統計 - 24h內: {items_in_24h} 筆, 1h內: {items_in_1h} 筆, 總數據: {len(data_array)} 筆")
+            logger.debug("%s 時間範圍統計 - 24h內: %d 筆, 1h內: %d 筆, 總數據: %d 筆",
+                         symbol, items_in_24h, items_in_1h, len(data_array))
 
         # 如果 24h 沒數據，用最新一筆頂上（備用邏輯）
         if buy_vol_usd_24h == 0 and sell_vol_usd_24h == 0 and data_array:
             latest = data_array[-1]
-            buy_vol_usd_24h = float(latest.get("aggregated_long_liquidation_usd") or latest.get("long_liquidation_usd") or latest.get("long") or 0)
-            sell_vol_usd_24h = float(latest.get("aggregated_short_liquidation_usd") or latest.get("short_liquidation_usd") or latest.get("short") or 0)
+            buy_vol_usd_24h = float(first_truthy(latest, _LIQ_LONG_KEYS, 0))
+            sell_vol_usd_24h = float(first_truthy(latest, _LIQ_SHORT_KEYS, 0))
             buy_vol_usd_1h = buy_vol_usd_24h
             sell_vol_usd_1h = sell_vol_usd_24h
 
-            logger.debug(f"{symbol} 未找到 24 小時內數據，改用最新一筆清算資料")
+            logger.debug("%s 未找到 24 小時內數據，改用最新一筆清算資料", symbol)
 
         total_vol_usd_24h = buy_vol_usd_24h + sell_vol_usd_24h
         total_vol_usd_1h = buy_vol_usd_1h + sell_vol_usd_1h
@@ -3079,7 +3389,8 @@ def process_liquidation_data(symbol: str, data_array: List[Dict]) -> Optional[Di
         
         if not triggered_by_1h:
             logger.debug(
-                f"{symbol} 未達1小時門檻 - 1h: {total_vol_usd_1h/10000:.2f}萬 < {threshold_1h/10000:.2f}萬"
+                "%s 未達1小時門檻 - 1h: %.2f萬 < %.2f萬",
+                symbol, total_vol_usd_1h / 10000, threshold_1h / 10000,
             )
             return None
 
@@ -3108,6 +3419,21 @@ def process_liquidation_data(symbol: str, data_array: List[Dict]) -> Optional[Di
 # 移除 generate_liq_symbol_analysis 函數（不再需要診斷文字）
 
 
+# 清算雷達操作建議（多單／空單被爆倉），結尾空行分隔下一個幣種
+_LIQ_ADVICE_LONG = (
+    "💡 *操作建議*：大量多單被爆倉，代表價格下跌壓力大。",
+    "   • 如果價格還在跌，可以考慮「摸頭」做空，但要設好止損",
+    "   • 如果價格已經跌很多，可以考慮「摸底」做多，但要分批進場",
+    "",
+)
+_LIQ_ADVICE_SHORT = (
+    "💡 *操作建議*：大量空單被爆倉，代表價格上漲動能強。",
+    "   • 如果價格還在漲，可以考慮「摸頭」做空，但要設好止損",
+    "   • 如果價格已經漲很多，可以考慮「摸底」做多，但要分批進場",
+    "",
+)
+
+
 def format_liquidity_consolidated_message(events: List[Dict]) -> str:
     """將多個清算事件整理成一則 Telegram 推播文字（只顯示過去1小時數據，白話+操作建議）"""
     now = get_taipei_time()
@@ -3122,23 +3448,13 @@ def format_liquidity_consolidated_message(events: List[Dict]) -> str:
     events_sorted = sorted(events, key=lambda e: e.get("totalVolUsd1h", 0), reverse=True)
 
     for ev in events_sorted:
-        total_1h = ev.get("totalVolUsd1h", 0.0) / 10_000
         amount_1h = ev["dominantAmount1h"] / 10_000
         dominant_side = ev['dominantSide']
 
         lines.append(f"🥊 *【{ev['symbol']}】*")
         lines.append(f"⚠️ 過去1小時內約有 *${amount_1h:.2f} 萬* 美元的 *{dominant_side}* 被強制平倉。\n")
-        
         # 操作建議（白話）
-        if dominant_side == "多單":
-            lines.append("💡 *操作建議*：大量多單被爆倉，代表價格下跌壓力大。")
-            lines.append("   • 如果價格還在跌，可以考慮「摸頭」做空，但要設好止損")
-            lines.append("   • 如果價格已經跌很多，可以考慮「摸底」做多，但要分批進場")
-        else:  # 空單
-            lines.append("💡 *操作建議*：大量空單被爆倉，代表價格上漲動能強。")
-            lines.append("   • 如果價格還在漲，可以考慮「摸頭」做空，但要設好止損")
-            lines.append("   • 如果價格已經漲很多，可以考慮「摸底」做多，但要分批進場")
-        lines.append("")
+        lines.extend(_LIQ_ADVICE_LONG if dominant_side == "多單" else _LIQ_ADVICE_SHORT)
 
     lines.append("━━━━━━━━━━━━━━━━━━━━")
     lines.append(f"⏰ 更新時間：{time_str}")
@@ -3152,17 +3468,18 @@ def run_liquidity_radar_once():
 
     events: List[Dict] = []
 
-    for idx, symbol in enumerate(LIQ_SYMBOLS):
+    # 幣種只有少數幾個，並行抓取（限流由 CG_SESSION 的重試退避處理），結果依 LIQ_SYMBOLS 順序處理
+    with ThreadPoolExecutor(max_workers=len(LIQ_SYMBOLS)) as executor:
+        futures = [executor.submit(fetch_liquidation_data, symbol) for symbol in LIQ_SYMBOLS]
+
+    for symbol, future in zip(LIQ_SYMBOLS, futures):
         try:
-            data_array = fetch_liquidation_data(symbol)
+            data_array = future.result()
             if data_array is None:
                 continue
             event = process_liquidation_data(symbol, data_array)
             if event:
                 events.append(event)
-            # 控制請求節奏，避免觸發頻率限制
-            if idx < len(LIQ_SYMBOLS) - 1:
-                time.sleep(LIQ_REQUEST_DELAY)
         except Exception as e:
             logger.error(f"處理 {symbol} 流動性數據時發生錯誤: {str(e)}")
 
@@ -3180,30 +3497,69 @@ def run_liquidity_radar_once():
 # ==================== 9. 山寨爆發雷達（Altcoin Season + RSI + Buy Ratio） ====================
 
 def _coinglass_simple_get(path: str, params: Optional[Dict] = None) -> Optional[Dict]:
-    """簡化版 GET，主要給 Altseason / RSI 這類單次查詢用"""
+    """簡化版 GET，主要給 Altseason / RSI 這類單次查詢用（指數類端點帶 TTL 快取）"""
     if not CG_API_KEY:
         logger.error("CG_API_KEY 未設定，無法呼叫 CoinGlass API")
         return None
+    cached = _cg_cache_get(path, params)
+    if cached is not None:
+        return cached
     url = f"{CG_API_BASE}{path}"
-    headers = {
-        "accept": "application/json",
-        "CG-API-KEY": CG_API_KEY,
-    }
     try:
-        resp = requests.get(url, headers=headers, params=params or {}, timeout=10)
+        resp = CG_SESSION.get(url, params=params or {}, timeout=10)
         if resp.status_code != 200:
-            logger.error(f"CoinGlass API HTTP 錯誤 {path}: {resp.status_code} - {resp.text[:200]}")
+            logger.error(f"CoinGlass API HTTP 錯誤 {path}: {resp.status_code} - {body_preview(resp, 200)}")
             return None
-        data = resp.json()
-        if data.get("code") not in (0, "0", 200, "200", None) and not data.get("success", True):
+        data = parse_json(resp.content)
+        if data.get("code") not in _OK_CODES_OR_MISSING and not data.get("success", True):
             logger.error(f"CoinGlass API 返回錯誤 {path}: {data}")
             return None
+        _cg_cache_put(path, params, data)
         return data
     except Exception as e:
         logger.error(f"CoinGlass API 請求失敗 {path}: {str(e)}")
         return None
 
 
+# 山寨季指數可能使用的欄位名稱（依優先順序）
+_ALTSEASON_KEYS = (
+    "value", "index", "altcoinSeasonIndex", "altcoin_season_index",
+    "seasonIndex", "season_index", "altcoinIndex", "altcoin_index",
+    "score", "ratio", "percentage",
+)
+
+
+def _first_present(obj: Dict, keys: tuple) -> tuple:
+    """依序找出第一個值不為 None 的欄位，返回 (欄位名稱, 值)，找不到時返回 (None, None)"""
+    for key in keys:
+        val = obj.get(key)
+        if val is not None:
+            return key, val
+    return None, None
+
+
+def _find_index_value(obj: Any, max_depth: int = 3) -> Optional[float]:
+    """依文件順序深度優先找出第一個 0-100 的數值（不含布林值），最多往下 max_depth 層"""
+    stack = [(obj, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if isinstance(node, bool):
+            continue
+        if isinstance(node, (int, float)):
+            if 0 <= node <= 100:  # 山寨季指數應該在 0-100 之間
+                return node
+        elif depth < max_depth:
+            if isinstance(node, dict):
+                children = list(node.values())
+            elif isinstance(node, list):
+                children = node
+            else:
+                continue
+            # 反向壓入堆疊，彈出時維持原本的先後順序
+            stack.extend((child, depth + 1) for child in reversed(children))
+    return None
+
+
 def fetch_altseason_index() -> Optional[float]:
     """取得山寨季指數 (0-100)"""
     data = _coinglass_simple_get("/api/index/altcoin-season")
@@ -3212,69 +3568,38 @@ def fetch_altseason_index() -> Optional[float]:
         return None
 
     # 記錄原始數據結構以便調試
-    logger.debug(f"Altseason API 原始回傳: {json.dumps(data, ensure_ascii=False)[:500]}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Altseason API 原始回傳: %s", json_preview(data, 500))
 
     # 嘗試多種可能的數據結構
     val = None
     
     # 1) 如果 data 是 dict
     if isinstance(data.get("data"), dict):
-        inner = data["data"]
-        # 嘗試更多可能的欄位名稱
-        for key in ("value", "index", "altcoinSeasonIndex", "altcoin_season_index", 
-                    "seasonIndex", "season_index", "altcoinIndex", "altcoin_index",
-                    "score", "ratio", "percentage"):
-            if inner.get(key) is not None:
-                val = inner.get(key)
-                logger.debug(f"從 data[dict] 中找到欄位 {key}: {val}")
-                break
+        key, val = _first_present(data["data"], _ALTSEASON_KEYS)
+        if val is not None:
+            logger.debug("從 data[dict] 中找到欄位 %s: %s", key, val)
     
     # 2) 如果 data 是 list
     elif isinstance(data.get("data"), list) and data["data"]:
         # 取最後一筆（最新的）
         inner = data["data"][-1]
         if isinstance(inner, dict):
-            for key in ("value", "index", "altcoinSeasonIndex", "altcoin_season_index",
-                        "seasonIndex", "season_index", "altcoinIndex", "altcoin_index",
-                        "score", "ratio", "percentage"):
-                if inner.get(key) is not None:
-                    val = inner.get(key)
-                    logger.debug(f"從 data[list][-1] 中找到欄位 {key}: {val}")
-                    break
+            key, val = _first_present(inner, _ALTSEASON_KEYS)
+            if val is not None:
+                logger.debug("從 data[list][-1] 中找到欄位 %s: %s", key, val)
     
     # 3) 直接在頂層找
     if val is None:
-        for key in ("value", "index", "altcoinSeasonIndex", "altcoin_season_index",
-                    "seasonIndex", "season_index", "altcoinIndex", "altcoin_index",
-                    "score", "ratio", "percentage"):
-            if data.get(key) is not None:
-                val = data.get(key)
-                logger.debug(f"從頂層找到欄位 {key}: {val}")
-                break
+        key, val = _first_present(data, _ALTSEASON_KEYS)
+        if val is not None:
+            logger.debug("從頂層找到欄位 %s: %s", key, val)
     
     # 4) 如果還是找不到，嘗試遍歷所有數值欄位
     if val is None:
-        def find_numeric_value(obj, depth=0):
-            if depth > 3:  # 避免遞迴太深
-                return None
-            if isinstance(obj, (int, float)):
-                if 0 <= obj <= 100:  # 山寨季指數應該在 0-100 之間
-                    return obj
-            elif isinstance(obj, dict):
-                for v in obj.values():
-                    result = find_numeric_value(v, depth + 1)
-                    if result is not None:
-                        return result
-            elif isinstance(obj, list):
-                for item in obj:
-                    result = find_numeric_value(item, depth + 1)
-                    if result is not None:
-                        return result
-            return None
-        
-        val = find_numeric_value(data)
+        val = _find_index_value(data)
         if val is not None:
-            logger.debug(f"透過深度搜尋找到數值: {val}")
+            logger.debug("透過深度搜尋找到數值: %s", val)
 
     # 轉換為 float
     if val is not None:
@@ -3289,7 +3614,7 @@ def fetch_altseason_index() -> Optional[float]:
         except (TypeError, ValueError) as e:
             logger.warning(f"Altseason 指數轉換失敗: {val} - {str(e)}")
     
-    logger.warning(f"無法從 Altseason API 回傳中提取指數，原始數據: {json.dumps(data, ensure_ascii=False)[:500]}")
+    logger.warning(f"無法從 Altseason API 回傳中提取指數，原始數據: {json_preview(data, 500)}")
     return None
 
 
@@ -3303,6 +3628,20 @@ def describe_altseason(index_val: Optional[float]) -> str:
     return "⚖ 資金在比特幣與山寨之間相對均衡，領頭羊個別表現更重要。"
 
 
+@lru_cache(maxsize=256)
+def _rsi_field_role(key: str) -> tuple:
+    """判斷 RSI 列表欄位的角色，返回 (RSI 欄位名稱或 None, 是否為成交量欄位)"""
+    kl = key.lower()
+    rsi_field = None
+    if "rsi" in kl:
+        if "1h" in kl or "h1" in kl:
+            rsi_field = "rsi_1h"
+        elif "4h" in kl or "h4" in kl:
+            rsi_field = "rsi_4h"
+    is_volume = "volume" in kl or "turnover" in kl or "amount" in kl
+    return rsi_field, is_volume
+
+
 def fetch_rsi_list() -> List[Dict]:
     """取得 RSI 列表並轉成標準化的 dict list，不依賴 pandas"""
     data = _coinglass_simple_get("/api/futures/rsi/list")
@@ -3329,34 +3668,28 @@ def fetch_rsi_list() -> List[Dict]:
         if not symbol:
             continue
 
-        # 找 RSI 欄位
+        # 找 RSI 與成交量欄位（欄位角色依名稱判斷並快取，同一批資料的欄位名稱相同）
         rsi_1h = None
         rsi_4h = None
-        for key, val in item.items():
-            kl = key.lower()
-            if "rsi" in kl:
-                if "1h" in kl or "h1" in kl:
-                    try:
-                        rsi_1h = float(val) if val is not None else None
-                    except (TypeError, ValueError):
-                        pass
-                elif "4h" in kl or "h4" in kl:
-                    try:
-                        rsi_4h = float(val) if val is not None else None
-                    except (TypeError, ValueError):
-                        pass
-
-        # 找成交量欄位
         volume = None
         for key, val in item.items():
-            kl = key.lower()
-            if "volume" in kl or "turnover" in kl or "amount" in kl:
+            rsi_field, is_volume = _rsi_field_role(key)
+            if rsi_field is not None:
                 try:
-                    volume = float(val) if val is not None else None
+                    parsed = float(val) if val is not None else None
+                except (TypeError, ValueError):
+                    pass
+                else:
+                    if rsi_field == "rsi_1h":
+                        rsi_1h = parsed
+                    else:
+                        rsi_4h = parsed
+            # 成交量取第一個可解析的欄位
+            if is_volume and volume is None and val is not None:
+                try:
+                    volume = float(val)
                 except (TypeError, ValueError):
                     pass
-                if volume is not None:
-                    break
 
         result.append({
             "symbol": symbol,
@@ -3368,11 +3701,38 @@ def fetch_rsi_list() -> List[Dict]:
     return result
 
 
+# Buy Ratio 併發查詢：執行緒數與全域請求間隔（約每秒 8 次，避免觸發 CoinGlass 限流）
+BUY_RATIO_WORKERS = 8
+BUY_RATIO_MIN_INTERVAL = 0.125
+_BUY_RATIO_LOCK = threading.Lock()
+_buy_ratio_next_slot = 0.0
+
+
+def _wait_buy_ratio_slot() -> None:
+    """依序分配請求時段，多執行緒下整體速率不超過 1 / BUY_RATIO_MIN_INTERVAL"""
+    global _buy_ratio_next_slot
+    with _BUY_RATIO_LOCK:
+        now = time.monotonic()
+        slot = max(now, _buy_ratio_next_slot)
+        _buy_ratio_next_slot = slot + BUY_RATIO_MIN_INTERVAL
+    if slot > now:
+        time.sleep(slot - now)
+
+
+@lru_cache(maxsize=64)
+def _depth_side_keys(keys: tuple) -> tuple:
+    """從掛單深度欄位名稱中找出 (bids 欄位, asks 欄位)，找不到則為 None"""
+    bid_key = next((k for k in keys if "bid" in k.lower()), None)
+    ask_key = next((k for k in keys if "ask" in k.lower()), None)
+    return bid_key, ask_key
+
+
 def fetch_buy_ratio(symbol: str) -> Optional[float]:
     """
     近似計算某幣種的 Buy Ratio（由聚合掛單深度近似，bids / (bids + asks)）
     使用 /api/futures/orderbook/aggregated-ask-bids-history
     """
+    _wait_buy_ratio_slot()
     data = _coinglass_simple_get(
         "/api/futures/orderbook/aggregated-ask-bids-history",
         params={"exchange_list": "Binance", "symbol": symbol, "interval": "h1"},
@@ -3386,14 +3746,13 @@ def fetch_buy_ratio(symbol: str) -> Optional[float]:
 
     last = arr[-1]
     if isinstance(last, dict):
-        # 嘗試多種欄位名稱
-        bid_keys = [k for k in last.keys() if "bid" in k.lower()]
-        ask_keys = [k for k in last.keys() if "ask" in k.lower()]
-        bid_val = float(last.get(bid_keys[0]) or 0) if bid_keys else 0.0
-        ask_val = float(last.get(ask_keys[0]) or 0) if ask_keys else 0.0
+        # 嘗試多種欄位名稱（同一欄位組合只解析一次）
+        bid_key, ask_key = _depth_side_keys(tuple(last))
+        bid_val = float(last.get(bid_key) or 0) if bid_key is not None else 0.0
+        ask_val = float(last.get(ask_key) or 0) if ask_key is not None else 0.0
     elif isinstance(last, list):
         # 假設結構 [bids, asks, time] 或 [asks, bids, time]，儘量容錯
-        numeric = [x for x in last if isinstance(x, (int, float))]
+        numeric = list(islice((x for x in last if isinstance(x, (int, float))), 2))
         if len(numeric) >= 2:
             # 假設第一個是 bids，第二個是 asks
             bid_val, ask_val = float(numeric[0]), float(numeric[1])
@@ -3419,38 +3778,33 @@ def fetch_price_history(symbol: str, interval: str = "1h") -> Optional[List[Dict
         "symbol": symbol,
         "interval": interval
     }
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "accept": "application/json"
-    }
     
     try:
-        logger.debug(f"嘗試獲取價格歷史 {symbol}，使用 OI history 端點")
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        logger.debug("嘗試獲取價格歷史 %s，使用 OI history 端點", symbol)
+        response = CG_SESSION.get(url, params=params, timeout=10)
         if response.status_code == 200:
-            data = response.json()
-            if data.get('code') in ['0', 0, 200, '200']:
+            data = parse_json(response.content)
+            if data.get('code') in _OK_CODES:
                 data_list = data.get('data', [])
                 if isinstance(data_list, list) and len(data_list) > 0:
-                    # 檢查數據結構，看是否有價格字段
-                    sample = data_list[0]
-                    sample_keys = list(sample.keys()) if isinstance(sample, dict) else []
-                    logger.debug(f"價格歷史數據樣本 {symbol}: 字段 {sample_keys[:15]}")
-                    logger.debug(f"價格歷史數據樣本 {symbol}: 內容 {json.dumps(sample, ensure_ascii=False)[:200]}")
-                    
+                    # 檢查數據結構，看是否有價格字段（僅在 DEBUG 時整理樣本）
+                    if logger.isEnabledFor(logging.DEBUG):
+                        sample = data_list[0]
+                        sample_keys = list(sample.keys()) if isinstance(sample, dict) else []
+                        logger.debug("價格歷史數據樣本 %s: 字段 %s", symbol, sample_keys[:15])
+                        logger.debug("價格歷史數據樣本 %s: 內容 %s", symbol, json_preview(sample, 200))
+                        logger.debug("從 OI 端點獲取到數據 %s: %d 條", symbol, len(data_list))
+                        if isinstance(sample, dict):
+                            logger.debug("數據樣本字段: %s", sample_keys[:20])
+
                     # 返回數據列表（即使沒有標準價格字段也返回，讓後續邏輯處理）
-                    logger.debug(f"從 OI 端點獲取到數據 {symbol}: {len(data_list)} 條")
-                    # 輸出數據樣本以便調試
-                    if isinstance(sample, dict):
-                        logger.debug(f"數據樣本字段: {list(sample.keys())[:20]}")
                     return data_list
         
-        logger.debug(f"無法從 OI 端點獲取價格數據 for {symbol} (狀態碼: {response.status_code})")
+        logger.debug("無法從 OI 端點獲取價格數據 for %s (狀態碼: %s)", symbol, response.status_code)
         return None
     except Exception as e:
         logger.warning(f"獲取價格歷史失敗 {symbol}: {str(e)}")
-        import traceback
-        logger.debug(traceback.format_exc())
+        logger.debug("獲取價格歷史失敗詳情 %s", symbol, exc_info=True)
         return None
 
 
@@ -3462,43 +3816,94 @@ def fetch_aggregated_cvd_history(symbol: str, interval: str = "1h") -> Optional[
         "symbol": symbol,
         "interval": interval
     }
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "accept": "application/json"
-    }
     
     try:
-        logger.debug(f"嘗試獲取 CVD 歷史 {symbol}")
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        logger.debug("嘗試獲取 CVD 歷史 %s", symbol)
+        response = CG_SESSION.get(url, params=params, timeout=10)
         if response.status_code != 200:
-            logger.debug(f"聚合 CVD API 返回狀態碼: {response.status_code} for {symbol}")
+            logger.debug("聚合 CVD API 返回狀態碼: %s for %s", response.status_code, symbol)
             return None
         
-        data = response.json()
-        if data.get('code') not in ['0', 0, 200, '200']:
+        data = parse_json(response.content)
+        if data.get('code') not in _OK_CODES:
             error_msg = data.get('msg') or data.get('message') or '未知錯誤'
-            logger.debug(f"聚合 CVD API 返回錯誤: {error_msg} (code: {data.get('code')}) for {symbol}")
+            logger.debug("聚合 CVD API 返回錯誤: %s (code: %s) for %s", error_msg, data.get('code'), symbol)
             return None
         
         data_list = data.get('data', [])
         if isinstance(data_list, list) and len(data_list) > 0:
-            logger.debug(f"成功獲取 CVD 歷史 {symbol}: {len(data_list)} 條")
+            logger.debug("成功獲取 CVD 歷史 %s: %d 條", symbol, len(data_list))
             # 輸出數據樣本以便調試
-            if len(data_list) > 0:
-                sample = data_list[0]
-                logger.debug(f"CVD 數據樣本 {symbol}: 字段 {list(sample.keys())[:10]}")
+            logger.debug("CVD 數據樣本 %s: 字段 %s", symbol, list(data_list[0].keys())[:10])
             return data_list
         else:
-            logger.debug(f"聚合 CVD API 返回空數據 for {symbol}")
+            logger.debug("聚合 CVD API 返回空數據 for %s", symbol)
             return None
     except Exception as e:
-        logger.debug(f"獲取聚合 CVD 歷史失敗 {symbol}: {str(e)}")
-        import traceback
-        logger.debug(traceback.format_exc())
+        logger.debug("獲取聚合 CVD 歷史失敗 %s: %s", symbol, e, exc_info=True)
+        return None
+
+
+def fetch_symbol_market_pair(symbol: str, interval: str = "1h") -> tuple:
+    """同時抓取價格歷史與聚合 CVD 歷史，返回 (price_data, cvd_data)"""
+    base_symbol = symbol.replace("USDT", "")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        price_future = executor.submit(fetch_price_history, symbol + "USDT", interval)
+        cvd_future = executor.submit(fetch_aggregated_cvd_history, base_symbol, interval)
+        return price_future.result(), cvd_future.result()
+
+
+# CVD 背離檢測的欄位優先順序：價格取第一個正數，CVD 取第一個非零數值
+_CVD_HIGH_KEYS = ('high', 'markPrice', 'mark_price', 'close', 'price', 'value')
+_CVD_LOW_KEYS = ('low', 'markPrice', 'mark_price', 'close', 'price', 'value')
+# cum_vol_delta 為 CoinGlass 實際使用的累計成交量差值欄位
+_CVD_VALUE_KEYS = ('cum_vol_delta', 'cvd', 'value', 'close', 'cvdValue', 'cumulativeVolumeDelta',
+                   'volumeDelta', 'agg_taker_buy_vol', 'agg_taker_sell_vol')
+
+
+def _first_positive_price(item: Any, keys: tuple) -> Optional[float]:
+    """依序找出第一個正數價格欄位，找不到時返回 None"""
+    if not isinstance(item, dict):
         return None
+    for key in keys:
+        val = item.get(key)
+        if isinstance(val, (int, float)) and val > 0:
+            return float(val)
+    return None
+
+
+def _first_cvd_value(item: Dict) -> tuple:
+    """依序找出第一個非零的 CVD 欄位，返回 (欄位名稱, 值)，找不到時返回 (None, None)"""
+    for key in _CVD_VALUE_KEYS:
+        val = item.get(key)
+        if isinstance(val, (int, float)) and val != 0:
+            return key, float(val)
+    return None, None
+
+
+_CVD_DIV_CACHE: Dict[tuple, Optional[str]] = {}  # (symbol, 小時桶) -> 背離結果
+_CVD_DIV_LOCK = threading.Lock()
 
 
 def detect_cvd_divergence(symbol: str) -> Optional[str]:
+    """檢測 CVD 背離，同一幣種每個整點小時只實際計算一次（1h K 線在小時內不變）"""
+    bucket = int(time.time() // 3600)
+    key = (symbol, bucket)
+    with _CVD_DIV_LOCK:
+        if key in _CVD_DIV_CACHE:
+            return _CVD_DIV_CACHE[key]
+
+    result = _detect_cvd_divergence(symbol)
+
+    with _CVD_DIV_LOCK:
+        # 丟棄過去小時的結果，快取大小不超過當前小時檢測過的幣種數
+        for stale in [k for k in _CVD_DIV_CACHE if k[1] != bucket]:
+            del _CVD_DIV_CACHE[stale]
+        _CVD_DIV_CACHE[key] = result
+    return result
+
+
+def _detect_cvd_divergence(symbol: str) -> Optional[str]:
     """檢測 CVD 背離（看漲/看跌）
     返回: 'bullish' (看漲背離), 'bearish' (看跌背離), None (無背離)
     
@@ -3510,9 +3915,7 @@ def detect_cvd_divergence(symbol: str) -> Optional[str]:
     try:
         # 獲取最近 24 小時的 1h 數據
         logger.info(f"CVD 背離檢測 {symbol}: 開始檢測...")
-        price_data = fetch_price_history(symbol + "USDT", "1h")
-        base_symbol = symbol.replace("USDT", "")
-        cvd_data = fetch_aggregated_cvd_history(base_symbol, "1h")
+        price_data, cvd_data = fetch_symbol_market_pair(symbol, "1h")
         
         logger.info(f"CVD 背離檢測 {symbol}: 獲取到價格數據 {len(price_data) if price_data else 0} 條, CVD 數據 {len(cvd_data) if cvd_data else 0} 條")
         
@@ -3534,29 +3937,19 @@ def detect_cvd_divergence(symbol: str) -> Optional[str]:
                     return 0
             return int(time_val) if time_val else 0
         
-        # 確保數據按時間排序
-        price_sorted = sorted(price_data, key=get_sort_key)
-        cvd_sorted = sorted(cvd_data, key=get_sort_key)
-        
-        # 取最近 20 根 K 線
-        p_slice = price_sorted[-20:]
-        c_slice = cvd_sorted[-20:]
-        
-        # 提取價格的輔助函數（嘗試多種字段）
-        def extract_price(item: Dict, field: str) -> Optional[float]:
-            """從數據項中提取價格字段"""
-            if not isinstance(item, dict):
-                return None
-            if field in item:
-                val = item[field]
-                if isinstance(val, (int, float)) and val > 0:
-                    return float(val)
-            return None
+        # 取最近 20 根 K 線（按時間升序；只挑出最新 20 筆，不必排序整個列表）
+        def latest_rows(rows: List[Dict]) -> List[Dict]:
+            # 以 (時間, 原始位置) 為鍵，時間相同時與穩定排序取尾段的結果一致
+            top = heapq.nlargest(20, range(len(rows)), key=lambda i: (get_sort_key(rows[i]), i))
+            return [rows[i] for i in reversed(top)]
+
+        p_slice = latest_rows(price_data)
+        c_slice = latest_rows(cvd_data)
         
         # 提取當前 K 線的 high 和 low
         curr_item = p_slice[-1]
-        curr_p_high = extract_price(curr_item, 'high') or extract_price(curr_item, 'markPrice') or extract_price(curr_item, 'mark_price') or extract_price(curr_item, 'close') or extract_price(curr_item, 'price') or extract_price(curr_item, 'value')
-        curr_p_low = extract_price(curr_item, 'low') or extract_price(curr_item, 'markPrice') or extract_price(curr_item, 'mark_price') or extract_price(curr_item, 'close') or extract_price(curr_item, 'price') or extract_price(curr_item, 'value')
+        curr_p_high = _first_positive_price(curr_item, _CVD_HIGH_KEYS)
+        curr_p_low = _first_positive_price(curr_item, _CVD_LOW_KEYS)
         
         if not curr_p_high or not curr_p_low:
             logger.info(f"CVD 背離檢測 {symbol}: 無法提取當前價格（high: {curr_p_high}, low: {curr_p_low}），數據樣本字段: {list(curr_item.keys())[:10]}")
@@ -3564,15 +3957,9 @@ def detect_cvd_divergence(symbol: str) -> Optional[str]:
         
         # 提取當前 K 線的 CVD
         curr_cvd_item = c_slice[-1]
-        curr_cvd = None
-        # 添加實際的字段名稱：cum_vol_delta（累計成交量差值）
-        for key in ['cum_vol_delta', 'cvd', 'value', 'close', 'cvdValue', 'cumulativeVolumeDelta', 'volumeDelta', 'agg_taker_buy_vol', 'agg_taker_sell_vol']:
-            if key in curr_cvd_item:
-                val = curr_cvd_item[key]
-                if isinstance(val, (int, float)) and val != 0:
-                    curr_cvd = float(val)
-                    logger.debug(f"CVD 背離檢測 {symbol}: 從字段 '{key}' 提取到當前 CVD: {curr_cvd}")
-                    break
+        key, curr_cvd = _first_cvd_value(curr_cvd_item)
+        if curr_cvd is not None:
+            logger.debug("CVD 背離檢測 %s: 從字段 '%s' 提取到當前 CVD: %s", symbol, key, curr_cvd)
         
         if curr_cvd is None:
             logger.info(f"CVD 背離檢測 {symbol}: 無法提取當前 CVD 值，CVD 數據樣本字段: {list(curr_cvd_item.keys())[:10]}")
@@ -3581,6 +3968,9 @@ def detect_cvd_divergence(symbol: str) -> Optional[str]:
         # 找到過去 19 根 K 線的最高/最低價
         prev_prices_high = []
         prev_prices_low = []
+        # 每根 K 線按欄位優先順序取得的 high/low（找不到為 None），供之後對應索引時重用
+        chain_highs: List[Optional[float]] = []
+        chain_lows: List[Optional[float]] = []
         
         # 輸出第一個過去 K 線的字段以便調試
         if len(p_slice) > 1:
@@ -3589,19 +3979,15 @@ def detect_cvd_divergence(symbol: str) -> Optional[str]:
         
         for idx, item in enumerate(p_slice[:-1]):  # 過去 19 根
             if not isinstance(item, dict):
+                chain_highs.append(None)
+                chain_lows.append(None)
                 continue
                 
-            # 嘗試提取 high（優先使用 high，如果沒有則使用其他字段）
-            high = extract_price(item, 'high')
-            if not high:
-                # 如果沒有 high，嘗試使用其他價格字段
-                high = extract_price(item, 'markPrice') or extract_price(item, 'mark_price') or extract_price(item, 'close') or extract_price(item, 'price') or extract_price(item, 'value')
-            
-            # 嘗試提取 low（優先使用 low，如果沒有則使用其他字段）
-            low = extract_price(item, 'low')
-            if not low:
-                # 如果沒有 low，嘗試使用其他價格字段
-                low = extract_price(item, 'markPrice') or extract_price(item, 'mark_price') or extract_price(item, 'close') or extract_price(item, 'price') or extract_price(item, 'value')
+            # 優先使用 high／low，如果沒有則使用其他價格字段
+            high = _first_positive_price(item, _CVD_HIGH_KEYS)
+            low = _first_positive_price(item, _CVD_LOW_KEYS)
+            chain_highs.append(high)
+            chain_lows.append(low)
             
             # 如果還是沒有，嘗試所有數值字段
             if not high or not low:
@@ -3637,8 +4023,7 @@ def detect_cvd_divergence(symbol: str) -> Optional[str]:
         # 找到最高價對應的索引（使用更寬鬆的匹配，找到最接近的值）
         high_idx = None
         min_diff = float('inf')
-        for idx, item in enumerate(p_slice[:-1]):
-            high = extract_price(item, 'high') or extract_price(item, 'markPrice') or extract_price(item, 'mark_price') or extract_price(item, 'close') or extract_price(item, 'price') or extract_price(item, 'value')
+        for idx, high in enumerate(chain_highs):
             if high:
                 diff = abs(high - prev_p_high)
                 if diff < min_diff:
@@ -3650,8 +4035,7 @@ def detect_cvd_divergence(symbol: str) -> Optional[str]:
         # 找到最低價對應的索引（使用更寬鬆的匹配，找到最接近的值）
         low_idx = None
         min_diff = float('inf')
-        for idx, item in enumerate(p_slice[:-1]):
-            low = extract_price(item, 'low') or extract_price(item, 'markPrice') or extract_price(item, 'mark_price') or extract_price(item, 'close') or extract_price(item, 'price') or extract_price(item, 'value')
+        for idx, low in enumerate(chain_lows):
             if low:
                 diff = abs(low - prev_p_low)
                 if diff < min_diff:
@@ -3668,25 +4052,11 @@ def detect_cvd_divergence(symbol: str) -> Optional[str]:
         cvd_at_p_high = None
         cvd_at_p_low = None
         
-        if high_idx < len(c_slice[:-1]):
-            high_cvd_item = c_slice[high_idx]
-            # 添加實際的字段名稱：cum_vol_delta（累計成交量差值）
-            for key in ['cum_vol_delta', 'cvd', 'value', 'close', 'cvdValue', 'cumulativeVolumeDelta', 'volumeDelta', 'agg_taker_buy_vol', 'agg_taker_sell_vol']:
-                if key in high_cvd_item:
-                    val = high_cvd_item[key]
-                    if isinstance(val, (int, float)) and val != 0:
-                        cvd_at_p_high = float(val)
-                        break
+        if high_idx < len(c_slice) - 1:
+            cvd_at_p_high = _first_cvd_value(c_slice[high_idx])[1]
         
-        if low_idx < len(c_slice[:-1]):
-            low_cvd_item = c_slice[low_idx]
-            # 添加實際的字段名稱：cum_vol_delta（累計成交量差值）
-            for key in ['cum_vol_delta', 'cvd', 'value', 'close', 'cvdValue', 'cumulativeVolumeDelta', 'volumeDelta', 'agg_taker_buy_vol', 'agg_taker_sell_vol']:
-                if key in low_cvd_item:
-                    val = low_cvd_item[key]
-                    if isinstance(val, (int, float)) and val != 0:
-                        cvd_at_p_low = float(val)
-                        break
+        if low_idx < len(c_slice) - 1:
+            cvd_at_p_low = _first_cvd_value(c_slice[low_idx])[1]
         
         if cvd_at_p_high is None or cvd_at_p_low is None:
             logger.info(f"CVD 背離檢測 {symbol}: 無法提取對應的 CVD 值（high_idx: {high_idx}, low_idx: {low_idx}, cvd_at_p_high: {cvd_at_p_high}, cvd_at_p_low: {cvd_at_p_low}）")
@@ -3712,19 +4082,50 @@ def detect_cvd_divergence(symbol: str) -> Optional[str]:
         return None
 
 
+# 山寨爆發雷達訊息的固定文字
+_ALTSEASON_HEADER = ("🛰️ *【區塊鏈船長 - 山寨爆發雷達】*", "━━━━━━━━━━━━━━━━━━━━")
+_ALTSEASON_ROW_TEMPLATE = "{idx}. `{symbol}` - RSI: *{rsi:.1f}* ｜ 買入比: *{br:.1f}%*"
+_ALTSEASON_TIP_ALT = "山寨季指數正在抬升，資金開始加速流向小幣，建議重點關注領頭羊二測與放量突破。"
+_ALTSEASON_TIP_BTC = "目前仍偏向比特幣季，山寨波動相對受限，建議以主流幣與現貨為主，耐心等待資金輪動。"
+_ALTSEASON_TIP_NEUTRAL = "資金尚未明顯偏向任何一方，選擇山寨時更要搭配成交量與買入比率，避免追在假突破上。"
+
+
+def _append_altseason_section(lines: List[str], title: str, items: List[Dict], empty_text: str) -> None:
+    """加入一個山寨雷達候選區塊（標題、每個幣種一行，結尾空行）"""
+    lines.append(title)
+    if not items:
+        lines.append(empty_text)
+    for idx, item in enumerate(items, 1):
+        br_val = item.get("buy_ratio")
+        lines.append(_ALTSEASON_ROW_TEMPLATE.format(
+            idx=idx,
+            symbol=str(item.get("symbol", "")),
+            rsi=float(item.get("rsi_base", 0) or 0),
+            br=float(br_val) if br_val is not None else 0.0,
+        ))
+    lines.append("")
+
+
 def build_altseason_message() -> Optional[str]:
     """組合山寨爆發雷達訊息（不依賴 pandas，加入 CVD 背離判斷）"""
-    index_val = fetch_altseason_index()
-    rsi_list = fetch_rsi_list()
+    # 山寨季指數與 RSI 列表互不依賴，同時抓取
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        index_future = executor.submit(fetch_altseason_index)
+        rsi_future = executor.submit(fetch_rsi_list)
+        index_val = index_future.result()
+        rsi_list = rsi_future.result()
     if not rsi_list:
         logger.error("無法取得 RSI 列表，放棄推播")
         return None
 
     # 只看成交額前 50 大，避免垃圾幣
-    rsi_with_vol = [r for r in rsi_list if r.get("volume") is not None]
+    rsi_with_vol: List[Dict] = []
+    rsi_without_vol: List[Dict] = []
+    for r in rsi_list:
+        (rsi_without_vol if r.get("volume") is None else rsi_with_vol).append(r)
     if rsi_with_vol:
-        rsi_with_vol.sort(key=lambda x: x.get("volume") or 0, reverse=True)
-        rsi_list = rsi_with_vol[:50] + [r for r in rsi_list if r.get("volume") is None]
+        rsi_list = heapq.nlargest(50, rsi_with_vol, key=lambda x: x.get("volume") or 0)
+        rsi_list.extend(rsi_without_vol)
 
     # 標準化 RSI：優先使用 4h，沒有才用 1h
     for item in rsi_list:
@@ -3741,49 +4142,54 @@ def build_altseason_message() -> Optional[str]:
     # 超賣反彈（做多）：RSI <= 30
     oversold_list = [r for r in rsi_list if r.get("rsi_base", 100) <= 30]
     # 超買回調（做空）：RSI >= 70（與強勢突破相同，但買入比條件不同）
-    overbought_list = [r for r in rsi_list if r.get("rsi_base", 0) >= 70]
+    overbought_list = list(strong_list)
+
+    # 加入 Buy Ratio 過濾（同一幣種本輪只查一次；強勢突破與超買回調是同一批幣種）
+    ratio_by_symbol: Dict[str, Optional[float]] = {}
+
+    def fetch_ratio_for(sym: str) -> Optional[float]:
+        ratio = fetch_buy_ratio(sym.replace("USDT", ""))
+        if ratio is None:
+            ratio = fetch_buy_ratio(sym)
+        return ratio
 
-    # 加入 Buy Ratio 過濾
     def attach_buy_ratio(items: List[Dict]) -> List[Dict]:
+        pending = list(dict.fromkeys(
+            item.get("symbol", "") for item in items
+            if item.get("symbol", "") not in ratio_by_symbol
+        ))
+        if pending:
+            with ThreadPoolExecutor(max_workers=BUY_RATIO_WORKERS) as executor:
+                ratio_by_symbol.update(zip(pending, executor.map(fetch_ratio_for, pending)))
         result = []
         for item in items:
-            sym = item.get("symbol", "")
-            base = sym.replace("USDT", "")
-            ratio = fetch_buy_ratio(base)
-            if ratio is None:
-                ratio = fetch_buy_ratio(sym)
+            ratio = ratio_by_symbol[item.get("symbol", "")]
             item["buy_ratio"] = ratio
             if ratio is not None:
                 result.append(item)
-            time.sleep(0.8)
         return result
 
     # 強勢突破（做多）：買入比 >= 55%
     if strong_list:
         strong_list = attach_buy_ratio(strong_list)
         strong_list = [r for r in strong_list if r.get("buy_ratio", 0) >= 55.0]
-        strong_list.sort(key=lambda x: (x.get("rsi_base", 0), x.get("buy_ratio", 0)), reverse=True)
-        strong_list = strong_list[:5]
+        strong_list = heapq.nlargest(5, strong_list, key=lambda x: (x.get("rsi_base", 0), x.get("buy_ratio", 0)))
 
     # 超賣反彈（做多）：買入比 >= 52%
     if oversold_list:
         oversold_list = attach_buy_ratio(oversold_list)
         oversold_list = [r for r in oversold_list if r.get("buy_ratio", 0) >= 52.0]
-        oversold_list.sort(key=lambda x: (x.get("rsi_base", 100), -x.get("buy_ratio", 0)))
-        oversold_list = oversold_list[:5]
+        oversold_list = heapq.nsmallest(5, oversold_list, key=lambda x: (x.get("rsi_base", 100), -x.get("buy_ratio", 0)))
 
     # 超買回調（做空）：RSI >= 70 且買入比 < 45%（買盤力道不足，可能回調）
     if overbought_list:
         overbought_list = attach_buy_ratio(overbought_list)
         overbought_list = [r for r in overbought_list if r.get("buy_ratio") is not None and r.get("buy_ratio", 0) < 45.0]
-        overbought_list.sort(key=lambda x: (x.get("rsi_base", 0), x.get("buy_ratio", 0) or 0), reverse=True)
-        overbought_list = overbought_list[:5]
+        overbought_list = heapq.nlargest(5, overbought_list, key=lambda x: (x.get("rsi_base", 0), x.get("buy_ratio", 0) or 0))
 
     now_str = format_datetime(get_taipei_time())
 
-    lines: List[str] = []
-    lines.append("🛰️ *【區塊鏈船長 - 山寨爆發雷達】*")
-    lines.append("━━━━━━━━━━━━━━━━━━━━")
+    lines: List[str] = list(_ALTSEASON_HEADER)
 
     # 山寨季指數
     if index_val is not None:
@@ -3798,71 +4204,22 @@ def build_altseason_message() -> Optional[str]:
     lines.append(describe_altseason(index_val))
     lines.append("")
 
-    # 強勢突破區（做多）
-    lines.append("🔥 *潛力領頭羊（強勢突破 - 做多）*：")
-    if not strong_list:
-        lines.append("目前沒有符合條件的強勢突破山寨幣。")
-    else:
-        for idx, item in enumerate(strong_list, 1):
-            s = str(item.get("symbol", ""))
-            rsi_v = float(item.get("rsi_base", 0) or 0)
-            br_val = item.get("buy_ratio")
-            br = float(br_val) if br_val is not None else 0.0
-            
-            lines.append(f"{idx}. `{s}` - RSI: *{rsi_v:.1f}* ｜ 買入比: *{br:.1f}%*")
-            
-            # 避免請求過於頻繁
-            if idx < len(strong_list):
-                time.sleep(0.5)
-    lines.append("")
-    
-    # 超買回調區（做空）
-    lines.append("⚠️ *超買回調風險（做空參考）*：")
-    if not overbought_list:
-        lines.append("目前沒有明顯的超買回調候選。")
-    else:
-        for idx, item in enumerate(overbought_list, 1):
-            s = str(item.get("symbol", ""))
-            rsi_v = float(item.get("rsi_base", 0) or 0)
-            br_val = item.get("buy_ratio")
-            br = float(br_val) if br_val is not None else 0.0
-            
-            lines.append(f"{idx}. `{s}` - RSI: *{rsi_v:.1f}* ｜ 買入比: *{br:.1f}%*")
-            
-            # 避免請求過於頻繁
-            if idx < len(overbought_list):
-                time.sleep(0.5)
-    lines.append("")
-    
-    # 超賣反彈區（做多）
-    lines.append("💎 *超賣反彈機會（抄底參考 - 做多）*：")
-    if not oversold_list:
-        lines.append("目前沒有明顯的超賣反彈候選。")
-    else:
-        for idx, item in enumerate(oversold_list, 1):
-            s = str(item.get("symbol", ""))
-            rsi_v = float(item.get("rsi_base", 0) or 0)
-            br_val = item.get("buy_ratio")
-            br = float(br_val) if br_val is not None else 0.0
-            
-            lines.append(f"{idx}. `{s}` - RSI: *{rsi_v:.1f}* ｜ 買入比: *{br:.1f}%*")
-            
-            # 避免請求過於頻繁
-            if idx < len(oversold_list):
-                time.sleep(0.5)
-    lines.append("")
+    # 強勢突破區（做多）、超買回調區（做空）、超賣反彈區（做多）
+    _append_altseason_section(lines, "🔥 *潛力領頭羊（強勢突破 - 做多）*：",
+                              strong_list, "目前沒有符合條件的強勢突破山寨幣。")
+    _append_altseason_section(lines, "⚠️ *超買回調風險（做空參考）*：",
+                              overbought_list, "目前沒有明顯的超買回調候選。")
+    _append_altseason_section(lines, "💎 *超賣反彈機會（抄底參考 - 做多）*：",
+                              oversold_list, "目前沒有明顯的超賣反彈候選。")
 
     # 提示
-    lines.append("💡 *船長提示*：")
     if index_val is not None and index_val > 60:
-        lines.append("山寨季指數正在抬升，資金開始加速流向小幣，建議重點關注領頭羊二測與放量突破。")
+        tip = _ALTSEASON_TIP_ALT
     elif index_val is not None and index_val < 40:
-        lines.append("目前仍偏向比特幣季，山寨波動相對受限，建議以主流幣與現貨為主，耐心等待資金輪動。")
+        tip = _ALTSEASON_TIP_BTC
     else:
-        lines.append("資金尚未明顯偏向任何一方，選擇山寨時更要搭配成交量與買入比率，避免追在假突破上。")
-
-    lines.append("")
-    lines.append(f"⏰ 更新時間：{now_str}")
+        tip = _ALTSEASON_TIP_NEUTRAL
+    lines.extend(("💡 *船長提示*：", tip, "", f"⏰ 更新時間：{now_str}"))
 
     return "\n".join(lines)
 
@@ -3888,23 +4245,66 @@ WHALE_ALERT_THRESHOLD = 200_000  # $20萬 USD（放寬門檻，捕捉更多大
 SMART_MONEY_PNL_MIN = 50_000  # $50k USD（放寬）
 MONEY_PRINTER_PNL_MIN = 500_000  # $50萬 USD（放寬）
 
+# Hyperliquid 回傳欄位名稱不固定，以下為各欄位的候選名稱（依優先順序）
+_HL_SYMBOL_KEYS = ('symbol', 'coin', 'asset')
+_HL_SIDE_KEYS = ('side', 'direction', 'type')
+_HL_POSITION_VALUE_KEYS = (
+    'position_value', 'positionValue', 'value', 'notional_value', 'notionalValue',
+    'size_usd', 'sizeUSD', 'usd_value', 'usdValue',
+)
+_HL_ALERT_VALUE_KEYS = (
+    'position_value_usd', 'positionValueUsd', 'position_value', 'positionValue',
+    'notional_value', 'notionalValue', 'value',
+)
+_HL_SIZE_KEYS = ('size', 'position_size', 'positionSize')
+_HL_PRICE_KEYS = ('price', 'mark_price', 'markPrice')
+_HL_ALERT_TIME_KEYS = ('create_time', 'time', 'timestamp', 'open_time')
+
+
+# Whale Alert 金額欄位的優先順序（優先使用 position_value_usd，這是正確的USD價值）
+_WHALE_VALUE_KEYS = (
+    'position_value_usd', 'positionValueUsd', 'position_value', 'positionValue',  # 最優先：持倉USD價值
+    'notional_value', 'notionalValue', 'notional', 'notional_usd',
+    'value', 'value_usd', 'usd_value', 'usdValue',
+    'size_usd', 'sizeUSD', 'size',  # size 可能是數量，不是價值
+    'amount', 'amount_usd', 'amountUSD',
+    'volume', 'volume_usd', 'volumeUSD',
+    'trade_value', 'tradeValue', 'trade_value_usd',
+    'order_value', 'orderValue', 'order_value_usd',
+    'total_value', 'totalValue', 'total_value_usd',
+)
+# 遍歷其他數值欄位時，跳過明顯不是價值的欄位
+_WHALE_EXCLUDED_KEYS = frozenset((
+    'entry_price', 'liq_price', 'mark_price', 'leverage', 'position_size', 'create_time', 'update_time',
+))
+
+
+def _whale_alert_value(alert: Dict) -> tuple:
+    """找出 Whale Alert 的金額欄位，返回 (欄位名稱, 原始值)，找不到時返回 (None, None)"""
+    key, value = _first_present(alert, _WHALE_VALUE_KEYS)
+    if value is not None:
+        return key, value
+    # 如果還是找不到，嘗試遍歷所有數值字段（通常交易金額 >= 1000）
+    for key, val in alert.items():
+        if key.lower() in _WHALE_EXCLUDED_KEYS:
+            continue
+        if isinstance(val, (int, float)) and val >= 1000:
+            return key, val
+    return None, None
+
 
 def fetch_hyperliquid_whale_alert() -> List[Dict]:
     """獲取 Hyperliquid 鯨魚提醒（大額交易，改進版：降低門檻並添加調試）"""
     url = f"{CG_API_BASE}/api/hyperliquid/whale-alert"
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "accept": "application/json"
-    }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = CG_SESSION.get(url, timeout=10)
         if response.status_code != 200:
             logger.error(f"Hyperliquid Whale Alert API 錯誤: {response.status_code}")
             return []
         
-        result = response.json()
-        if result.get('code') not in ['0', 0, 200, '200']:
+        result = parse_json(response.content)
+        if result.get('code') not in _OK_CODES:
             logger.error(f"Hyperliquid Whale Alert API 返回錯誤: {result}")
             return []
         
@@ -3915,52 +4315,18 @@ def fetch_hyperliquid_whale_alert() -> List[Dict]:
         
         # 調試：記錄原始數據
         logger.info(f"Hyperliquid Whale Alert 原始數據: {len(data_list)} 條")
-        if data_list:
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if data_list and debug:
             sample = data_list[0]
-            logger.info(f"數據樣本欄位: {list(sample.keys())}")
-            logger.info(f"數據樣本完整內容: {json.dumps(sample, ensure_ascii=False, indent=2)}")
+            logger.debug("數據樣本欄位: %s", list(sample.keys()))
+            logger.debug("數據樣本完整內容: %s", dump_json(sample))
         
         # 篩選名目價值 >= 門檻的提醒（門檻已降低）
         filtered_alerts = []
-        value_stats = []  # 記錄所有數值用於調試
+        value_stats = []  # 記錄所有數值用於調試（僅 DEBUG）
         
         for idx, alert in enumerate(data_list):
-            # 嘗試多種可能的欄位名稱（擴展更多可能性）
-            value = None
-            value_key = None
-            
-            # 按優先順序嘗試各種字段名稱（優先使用 position_value_usd，這是正確的USD價值）
-            possible_keys = [
-                'position_value_usd', 'positionValueUsd', 'position_value', 'positionValue',  # 最優先：持倉USD價值
-                'notional_value', 'notionalValue', 'notional', 'notional_usd',
-                'value', 'value_usd', 'usd_value', 'usdValue',
-                'size_usd', 'sizeUSD', 'size',  # size 可能是數量，不是價值
-                'amount', 'amount_usd', 'amountUSD',
-                'volume', 'volume_usd', 'volumeUSD',
-                'trade_value', 'tradeValue', 'trade_value_usd',
-                'order_value', 'orderValue', 'order_value_usd',
-                'total_value', 'totalValue', 'total_value_usd'
-            ]
-            
-            for key in possible_keys:
-                if key in alert and alert[key] is not None:
-                    value = alert[key]
-                    value_key = key
-                    break
-            
-            # 如果還是找不到，嘗試遍歷所有數值字段（排除明顯不是價值的字段）
-            if value is None:
-                excluded_keys = ['entry_price', 'liq_price', 'mark_price', 'leverage', 'position_size', 'create_time', 'update_time']
-                for key, val in alert.items():
-                    if key.lower() in excluded_keys:
-                        continue  # 跳過明顯不是價值的字段
-                    if isinstance(val, (int, float)) and val > 0:
-                        # 可能是數值字段，但需要判斷是否合理（通常交易金額 > 1000）
-                        if val >= 1000:
-                            value = val
-                            value_key = key
-                            break
-            
+            value_key, value = _whale_alert_value(alert)
             if value is None:
                 logger.warning(f"Alert #{idx} 無法找到數值字段，所有字段: {list(alert.keys())}")
                 continue
@@ -3974,33 +4340,30 @@ def fetch_hyperliquid_whale_alert() -> List[Dict]:
                 else:
                     value_float = float(value)
                 
+                passed = value_float >= WHALE_ALERT_THRESHOLD
+                if passed:
+                    filtered_alerts.append(alert)
+                if not debug:
+                    continue
+
+                symbol = first_truthy(alert, _HL_SYMBOL_KEYS, '未知')
                 # 記錄統計信息（前10條）
                 if idx < 10:
-                    symbol = alert.get('symbol') or alert.get('coin') or alert.get('asset') or '未知'
-                    value_stats.append({
-                        'symbol': symbol,
-                        'key': value_key,
-                        'value': value_float,
-                        'formatted': f"${value_float/10000:.2f}萬"
-                    })
-                
-                if value_float >= WHALE_ALERT_THRESHOLD:
-                    filtered_alerts.append(alert)
-                    symbol = alert.get('symbol') or alert.get('coin') or alert.get('asset') or '未知'
-                    logger.info(f"✅ 符合門檻的 Alert: {symbol} - ${value_float/10000:.2f}萬 (字段: {value_key})")
-                else:
-                    if idx < 5:  # 只記錄前5條未達門檻的
-                        symbol = alert.get('symbol') or alert.get('coin') or alert.get('asset') or '未知'
-                        logger.info(f"❌ 未達門檻: {symbol} - ${value_float/10000:.2f}萬 < ${WHALE_ALERT_THRESHOLD/10000:.2f}萬 (字段: {value_key})")
+                    value_stats.append((symbol, value_float, value_key))
+                if passed:
+                    logger.debug("✅ 符合門檻的 Alert: %s - $%.2f萬 (字段: %s)", symbol, value_float / 10000, value_key)
+                elif idx < 5:  # 只記錄前5條未達門檻的
+                    logger.debug("❌ 未達門檻: %s - $%.2f萬 < $%.2f萬 (字段: %s)",
+                                 symbol, value_float / 10000, WHALE_ALERT_THRESHOLD / 10000, value_key)
             except (TypeError, ValueError) as e:
                 logger.warning(f"Alert #{idx} 數值解析失敗: 字段={value_key}, 值={value}, 錯誤: {str(e)}")
                 continue
         
         # 輸出統計信息
         if value_stats:
-            logger.info(f"前10條數據的數值統計:")
-            for stat in value_stats:
-                logger.info(f"  {stat['symbol']}: {stat['formatted']} (字段: {stat['key']})")
+            logger.debug("前10條數據的數值統計:")
+            for symbol, value_float, value_key in value_stats:
+                logger.debug("  %s: $%.2f萬 (字段: %s)", symbol, value_float / 10000, value_key)
         
         logger.info(f"符合門檻的 Whale Alert: {len(filtered_alerts)} 條（門檻: ${WHALE_ALERT_THRESHOLD/10000:.2f}萬）")
         return filtered_alerts
@@ -4012,19 +4375,15 @@ def fetch_hyperliquid_whale_alert() -> List[Dict]:
 def fetch_hyperliquid_pnl_distribution() -> Optional[Dict]:
     """獲取 Hyperliquid 錢包盈虧分佈"""
     url = f"{CG_API_BASE}/api/hyperliquid/wallet/pnl-distribution"
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "accept": "application/json"
-    }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = CG_SESSION.get(url, timeout=10)
         if response.status_code != 200:
             logger.error(f"Hyperliquid PNL Distribution API 錯誤: {response.status_code}")
             return None
         
-        result = response.json()
-        if result.get('code') not in ['0', 0, 200, '200']:
+        result = parse_json(response.content)
+        if result.get('code') not in _OK_CODES:
             logger.error(f"Hyperliquid PNL Distribution API 返回錯誤: {result}")
             return None
         
@@ -4037,19 +4396,15 @@ def fetch_hyperliquid_pnl_distribution() -> Optional[Dict]:
 def fetch_hyperliquid_whale_position() -> List[Dict]:
     """獲取 Hyperliquid 鯨魚持倉（價值 > $100k）"""
     url = f"{CG_API_BASE}/api/hyperliquid/whale-position"
-    headers = {
-        "CG-API-KEY": CG_API_KEY,
-        "accept": "application/json"
-    }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = CG_SESSION.get(url, timeout=10)
         if response.status_code != 200:
             logger.error(f"Hyperliquid Whale Position API 錯誤: {response.status_code}")
             return []
         
-        result = response.json()
-        if result.get('code') not in ['0', 0, 200, '200']:
+        result = parse_json(response.content)
+        if result.get('code') not in _OK_CODES:
             logger.error(f"Hyperliquid Whale Position API 返回錯誤: {result}")
             return []
         
@@ -4058,31 +4413,20 @@ def fetch_hyperliquid_whale_position() -> List[Dict]:
             return []
         
         # 記錄第一個位置的數據結構以便調試（只在有數據時）
-        if data_list:
+        if data_list and logger.isEnabledFor(logging.DEBUG):
             first_item = data_list[0]
-            logger.info(f"Hyperliquid Whale Position 數據結構示例（前 3 個欄位）: {list(first_item.keys())[:10]}")
-            logger.info(f"完整數據結構: {json.dumps(first_item, ensure_ascii=False, indent=2)[:1000]}")
+            logger.debug("Hyperliquid Whale Position 數據結構示例（前 3 個欄位）: %s", list(first_item.keys())[:10])
+            logger.debug("完整數據結構: %s", json_preview(first_item, 1000))
         
         # 嘗試提取持倉價值的多種可能欄位
         def get_position_value(item: Dict) -> float:
             # 嘗試直接的值欄位
-            value = (
-                item.get('position_value') or 
-                item.get('positionValue') or 
-                item.get('value') or 
-                item.get('notional_value') or
-                item.get('notionalValue') or
-                item.get('size_usd') or
-                item.get('sizeUSD') or
-                item.get('usd_value') or
-                item.get('usdValue') or
-                0
-            )
+            value = first_truthy(item, _HL_POSITION_VALUE_KEYS, 0)
             
             # 如果直接值不存在，嘗試用 size * price 計算
-            if value == 0 or (isinstance(value, (int, float)) and value == 0):
-                size = float(item.get('size') or item.get('position_size') or item.get('positionSize') or 0)
-                price = float(item.get('price') or item.get('mark_price') or item.get('markPrice') or 0)
+            if value == 0:
+                size = float(first_truthy(item, _HL_SIZE_KEYS, 0))
+                price = float(first_truthy(item, _HL_PRICE_KEYS, 0))
                 if size > 0 and price > 0:
                     value = abs(size * price)
             
@@ -4092,13 +4436,7 @@ def fetch_hyperliquid_whale_position() -> List[Dict]:
                 return 0.0
         
         # 排序並取前 5 名（按持倉價值）
-        sorted_positions = sorted(
-            data_list,
-            key=get_position_value,
-            reverse=True
-        )[:5]
-        
-        return sorted_positions
+        return heapq.nlargest(5, data_list, key=get_position_value)
     except Exception as e:
         logger.error(f"獲取 Hyperliquid Whale Position 失敗: {str(e)}")
         return []
@@ -4130,9 +4468,9 @@ def process_smart_money_pnl(pnl_data: Dict) -> Dict:
                 continue
             
             # 獲取 PNL 範圍
-            pnl_min = float(item.get('pnl_min') or item.get('pnlMin') or item.get('min_pnl') or 0)
-            pnl_max = float(item.get('pnl_max') or item.get('pnlMax') or item.get('max_pnl') or float('inf'))
-            address_count = int(item.get('address_count') or item.get('addressCount') or item.get('count') or 0)
+            pnl_min = float(first_truthy(item, ('pnl_min', 'pnlMin', 'min_pnl'), 0))
+            pnl_max = float(first_truthy(item, ('pnl_max', 'pnlMax', 'max_pnl'), float('inf')))
+            address_count = int(first_truthy(item, ('address_count', 'addressCount', 'count'), 0))
             
             # 判斷層級
             if pnl_min >= MONEY_PRINTER_PNL_MIN:
@@ -4150,11 +4488,11 @@ def process_smart_money_pnl(pnl_data: Dict) -> Dict:
     position_dist = pnl_data.get('position_distribution') or pnl_data.get('top_symbols') or {}
     if isinstance(position_dist, dict):
         # 排序並取前 3 個幣種
-        sorted_symbols = sorted(
+        sorted_symbols = heapq.nlargest(
+            3,
             position_dist.items(),
-            key=lambda x: float(x[1].get('value') or x[1].get('total_value') or 0) if isinstance(x[1], dict) else float(x[1] or 0),
-            reverse=True
-        )[:3]
+            key=lambda x: float(x[1].get('value') or x[1].get('total_value') or 0) if isinstance(x[1], dict) else float(x[1] or 0)
+        )
         
         for symbol, data in sorted_symbols:
             if isinstance(data, dict):
@@ -4169,13 +4507,8 @@ def process_smart_money_pnl(pnl_data: Dict) -> Dict:
 def format_alert_message(alert: Dict) -> str:
     """格式化單個 Whale Alert 訊息"""
     symbol = alert.get('symbol') or alert.get('coin') or '未知'
-    direction = alert.get('side') or alert.get('direction') or alert.get('type') or '未知'
-    value = float(
-        alert.get('notional_value') or 
-        alert.get('notionalValue') or 
-        alert.get('value') or 
-        0
-    )
+    direction = first_truthy(alert, _HL_SIDE_KEYS, '未知')
+    value = float(first_truthy(alert, ('notional_value', 'notionalValue', 'value'), 0))
     
     # 判斷方向 emoji
     direction_emoji = "🟢" if str(direction).lower() in ['long', 'buy', '多', 'long'] else "🔴"
@@ -4187,22 +4520,11 @@ def format_alert_message(alert: Dict) -> str:
 def format_whale_position_message(position: Dict, index: int) -> str:
     """格式化單個鯨魚持倉訊息"""
     address = position.get('address') or position.get('user') or position.get('user_address') or '未知'
-    symbol = position.get('symbol') or position.get('coin') or position.get('asset') or '未知'
-    side = position.get('side') or position.get('direction') or position.get('position_side') or '未知'
+    symbol = first_truthy(position, _HL_SYMBOL_KEYS, '未知')
+    side = first_truthy(position, ('side', 'direction', 'position_side'), '未知')
     
     # 嘗試多種方式獲取持倉價值
-    size = (
-        position.get('position_value') or 
-        position.get('positionValue') or 
-        position.get('value') or 
-        position.get('notional_value') or
-        position.get('notionalValue') or
-        position.get('size_usd') or
-        position.get('sizeUSD') or
-        position.get('usd_value') or
-        position.get('usdValue') or
-        0
-    )
+    size = first_truthy(position, _HL_POSITION_VALUE_KEYS, 0)
     
     # 如果直接值不存在，嘗試用 size * price 計算
     try:
@@ -4211,8 +4533,8 @@ def format_whale_position_message(position: Dict, index: int) -> str:
         size_float = 0.0
     
     if size_float == 0:
-        position_size = float(position.get('size') or position.get('position_size') or position.get('positionSize') or 0)
-        price = float(position.get('price') or position.get('mark_price') or position.get('markPrice') or 0)
+        position_size = float(first_truthy(position, _HL_SIZE_KEYS, 0))
+        price = float(first_truthy(position, _HL_PRICE_KEYS, 0))
         if position_size > 0 and price > 0:
             size_float = abs(position_size * price)
     
@@ -4245,7 +4567,7 @@ def build_hyperliquid_message() -> Optional[str]:
     logger.info(f"獲取到 {len(alerts)} 個 Whale Alert")
     
     # 檢查是否有新的 Alert（避免重複推播）
-    sent_alert_ids = load_json_file(HYPERLIQUID_SENT_ALERTS_FILE, [])
+    sent_alert_ids = sent_id_set(HYPERLIQUID_SENT_ALERTS_FILE)
     new_alerts = []
     new_alert_ids = []
     
@@ -4281,31 +4603,16 @@ def build_hyperliquid_message() -> Optional[str]:
         symbol = alert.get('symbol') or alert.get('coin') or '未知'
         
         # 獲取USD價值（優先使用 position_value_usd）
-        value = float(
-            alert.get('position_value_usd') or 
-            alert.get('positionValueUsd') or 
-            alert.get('position_value') or 
-            alert.get('positionValue') or 
-            alert.get('notional_value') or 
-            alert.get('notionalValue') or 
-            alert.get('value') or 
-            0
-        )
+        value = float(first_truthy(alert, _HL_ALERT_VALUE_KEYS, 0))
         
         # 獲取開倉時間（create_time 是毫秒時間戳）
-        alert_time = alert.get('create_time') or alert.get('time') or alert.get('timestamp') or alert.get('open_time')
+        alert_time = first_truthy(alert, _HL_ALERT_TIME_KEYS)
         time_str = "時間未知"
         if alert_time:
             try:
                 if isinstance(alert_time, (int, float)):
                     # create_time 是毫秒時間戳（例如 1768536078000）
-                    if alert_time > 1e12:
-                        dt = datetime.fromtimestamp(alert_time / 1000, tz=timezone.utc)
-                    else:
-                        dt = datetime.fromtimestamp(alert_time, tz=timezone.utc)
-                    # 轉換為台灣時間
-                    dt_taipei = get_taipei_time(dt)
-                    time_str = dt_taipei.strftime("%Y-%m-%d %H:%M")
+                    time_str = format_epoch_taipei(alert_time, "%Y-%m-%d %H:%M")
                 else:
                     time_str = str(alert_time)
             except Exception as e:
@@ -4315,7 +4622,7 @@ def build_hyperliquid_message() -> Optional[str]:
         # 判斷方向（根據 position_size 正負或 position_action）
         position_size = alert.get('position_size') or alert.get('positionSize') or 0
         position_action = alert.get('position_action') or alert.get('positionAction')
-        side = alert.get('side') or alert.get('direction') or alert.get('type')
+        side = first_truthy(alert, _HL_SIDE_KEYS)
         
         # 判斷方向邏輯：
         # 1. 如果有 side/direction/type 字段，直接使用
@@ -4353,12 +4660,8 @@ def build_hyperliquid_message() -> Optional[str]:
         lines.append(f"規模：{value_display} USD")
         lines.append("")
     
-    # 更新已發送 ID 列表
-    sent_alert_ids.extend(new_alert_ids)
-    # 只保留最近 500 條
-    if len(sent_alert_ids) > 500:
-        sent_alert_ids = sent_alert_ids[-500:]
-    save_json_file(HYPERLIQUID_SENT_ALERTS_FILE, sent_alert_ids)
+    # 更新已發送 ID 記錄（只保留最近 SENT_IDS_LIMIT 條）
+    record_sent_ids(HYPERLIQUID_SENT_ALERTS_FILE, new_alert_ids)
     
     # 聰明錢 PNL 分佈部分（補充資訊）
     has_smart_money_data = (